@@ -1,16 +1,34 @@
 # -*- mode: python ; coding: utf-8 -*-
+# Startup-optimised build: a onedir bundle starts without unpacking
+# paramiko, cryptography, pynacl and bcrypt to a temp folder on every
+# launch, and the excludes keep unused stdlib and optional modules out.
+import os
 
+# Never imported by the monitor (invoke, gssapi and sspi are optional
+# paramiko extras)
+EXCLUDES = [
+    'doctest', 'pdb', 'pydoc', 'lib2to3', 'distutils', 'setuptools', 'pip',
+    'test', 'tkinter.test', 'idlelib', 'turtle', 'turtledemo', 'curses',
+    'invoke', 'gssapi', 'sspi', 'sspicon', 'win32security',
+    'numpy', 'matplotlib', 'PIL', 'IPython',
+]
+
+# Paths are relative to this file, not to the directory the build runs from
+icon = os.path.join(SPECPATH, 'minecraft_monitor.ico')
+if not os.path.exists(icon):
+    icon = None
 
 a = Analysis(
-    ['main.py'],
+    [os.path.join(SPECPATH, 'main.py')],
     pathex=[],
     binaries=[],
     datas=[],
-    hiddenimports=[],
+    # Imported inside functions so the window paints first
+    hiddenimports=['paramiko', 'mcstatus', 'keyring'],
     hookspath=[],
     hooksconfig={},
     runtime_hooks=[],
-    excludes=[],
+    excludes=EXCLUDES,
     noarchive=False,
     optimize=0,
 )
@@ -19,20 +37,29 @@ pyz = PYZ(a.pure)
 exe = EXE(
     pyz,
     a.scripts,
-    a.binaries,
-    a.datas,
     [],
+    exclude_binaries=True,
     name='MinecraftMonitor',
     debug=False,
     bootloader_ignore_signals=False,
     strip=False,
+    # UPX-packed libraries are decompressed on every start
     upx=False,
-    upx_exclude=[],
-    runtime_tmpdir=None,
     console=False,
     disable_windowed_traceback=False,
     argv_emulation=False,
     target_arch=None,
     codesign_identity=None,
     entitlements_file=None,
+    icon=icon,
+    version=os.path.join(SPECPATH, 'version_info.txt'),
+)
+coll = COLLECT(
+    exe,
+    a.binaries,
+    a.datas,
+    strip=False,
+    upx=False,
+    upx_exclude=[],
+    name='MinecraftMonitor',
 )
@@ -0,0 +1,145 @@
+# bench/fake_minecraft.py
+import json
+import socketserver
+import threading
+import time
+
+
+def read_varint(stream):
+    """Read a protocol VarInt from a socket file"""
+    result = 0
+    for shift in range(0, 35, 7):
+        byte = stream.read(1)
+        if not byte:
+            raise EOFError("connection closed")
+        result |= (byte[0] & 0x7F) << shift
+        if not byte[0] & 0x80:
+            return result
+    raise ValueError("VarInt too long")
+
+
+def varint(value):
+    """Encode a protocol VarInt"""
+    data = b""
+    while True:
+        byte = value & 0x7F
+        value >>= 7
+        if value:
+            data += bytes([byte | 0x80])
+        else:
+            return data + bytes([byte])
+
+
+def packet(packet_id, payload):
+    body = varint(packet_id) + payload
+    return varint(len(body)) + body
+
+
+class FakeMinecraftServer:
+    """Server List Ping (TCP) and Query (UDP) responder on one port.
+
+    Answers only while ``host.running`` is true, like a real server that
+    has finished booting. ``delay`` seconds are added to every reply.
+    """
+
+    def __init__(self, host, delay=0.0, players=("Alex", "Steve"), max_players=20):
+        self.host = host
+        self.delay = delay
+        self.players = list(players)
+        self.max_players = max_players
+        self.requests = 0
+        self._tcp = None
+        self._udp = None
+
+    @property
+    def port(self):
+        return self._tcp.server_address[1]
+
+    def start(self):
+        """Listen on a free local port for both protocols"""
+        fake = self
+
+        class StatusHandler(socketserver.StreamRequestHandler):
+            def handle(self):
+                fake.handle_status(self.connection, self.rfile)
+
+        class QueryHandler(socketserver.BaseRequestHandler):
+            def handle(self):
+                data, sock = self.request
+                reply = fake.handle_query(data)
+                if reply:
+                    sock.sendto(reply, self.client_address)
+
+        self._tcp = socketserver.ThreadingTCPServer(("127.0.0.1", 0), StatusHandler)
+        self._tcp.daemon_threads = True
+        self._udp = socketserver.ThreadingUDPServer(("127.0.0.1", self.port), QueryHandler)
+        self._udp.daemon_threads = True
+        for server in (self._tcp, self._udp):
+            threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    def stop(self):
+        for server in (self._tcp, self._udp):
+            if server:
+                server.shutdown()
+                server.server_close()
+
+    def status_json(self):
+        return json.dumps({
+            "version": {"name": "Paper 1.21.1", "protocol": 767},
+            "players": {
+                "max": self.max_players,
+                "online": len(self.players),
+                "sample": [
+                    {"name": name, "id": f"00000000-0000-0000-0000-{index + 1:012d}"}
+                    for index, name in enumerate(self.players[:12])
+                ],
+            },
+            "description": {"text": "Benchmark server"},
+        })
+
+    def handle_status(self, connection, stream):
+        if not self.host.running:
+            return
+        try:
+            while True:
+                body = stream.read(read_varint(stream))
+                packet_id, payload = body[0], body[1:]
+                if packet_id == 0x00 and payload:
+                    continue  # Handshake
+                time.sleep(self.delay)
+                if packet_id == 0x00:
+                    self.requests += 1
+                    data = self.status_json().encode()
+                    connection.sendall(packet(0x00, varint(len(data)) + data))
+                elif packet_id == 0x01:
+                    connection.sendall(packet(0x01, payload))
+                    return
+                else:
+                    return
+        except (EOFError, OSError, ValueError, IndexError):
+            return
+
+    def handle_query(self, data):
+        if not self.host.running or len(data) < 7 or data[:2] != b"\xfe\xfd":
+            return None
+        packet_type, session = data[2], data[3:7]
+        time.sleep(self.delay)
+        if packet_type == 9:
+            return b"\x09" + session + b"9513307\x00"
+        self.requests += 1
+        values = {
+            "hostname": "Benchmark server",
+            "gametype": "SMP",
+            "game_id": "MINECRAFT",
+            "version": "1.21.1",
+            "plugins": "",
+            "map": "world",
+            "numplayers": str(len(self.players)),
+            "maxplayers": str(self.max_players),
+            "hostport": str(self.port),
+            "hostip": "127.0.0.1",
+        }
+        body = b"".join(f"{key}\x00{value}\x00".encode() for key, value in values.items())
+        names = b"".join(name.encode() + b"\x00" for name in self.players)
+        return (b"\x00" + session + b"splitnum\x00\x80\x00" + body
+                + b"\x00\x01player_\x00\x00" + names + b"\x00")
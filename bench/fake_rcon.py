@@ -0,0 +1,127 @@
+# bench/fake_rcon.py
+import socketserver
+import struct
+import threading
+import time
+
+SERVERDATA_AUTH = 3
+SERVERDATA_AUTH_RESPONSE = 2
+SERVERDATA_EXECCOMMAND = 2
+SERVERDATA_RESPONSE_VALUE = 0
+
+# Like the real server, responses are split into bodies of this many bytes
+MAX_BODY = 4096
+
+
+def packet(request_id, packet_type, body):
+    payload = struct.pack("<ii", request_id, packet_type) + body + b"\x00\x00"
+    return struct.pack("<i", len(payload)) + payload
+
+
+def read_packet(stream):
+    """Read one packet from a socket file; returns (id, type, body) or None at EOF"""
+    header = stream.read(4)
+    if len(header) < 4:
+        return None
+    (length,) = struct.unpack("<i", header)
+    payload = stream.read(length)
+    if len(payload) < length:
+        return None
+    request_id, packet_type = struct.unpack("<ii", payload[:8])
+    return request_id, packet_type, payload[8:-2]
+
+
+class FakeRconServer:
+    """Local RCON server with scripted command responses.
+
+    ``responses`` maps a command to its reply; other commands get an
+    empty reply. Replies longer than MAX_BODY are split over several
+    packets, and an empty RESPONSE_VALUE packet is echoed back the way
+    the client expects for its end-of-response marker. Every executed
+    command is appended to ``commands``.
+
+    ``drop_after`` names a command that closes the connection once it
+    has run, before any reply is sent. ``drop_connections()`` closes
+    every open connection, like a server restart.
+    """
+
+    def __init__(self, password="secret", responses=None, delay=0.0, drop_after=None):
+        self.password = password
+        self.responses = dict(responses or {})
+        self.delay = delay
+        self.drop_after = drop_after
+        self.commands = []
+        self.connections = 0
+        self._open = set()
+        self._lock = threading.Lock()
+        self._server = None
+
+    @property
+    def port(self):
+        return self._server.server_address[1]
+
+    def start(self):
+        """Listen on a free local port"""
+        fake = self
+
+        class RconHandler(socketserver.StreamRequestHandler):
+            def handle(self):
+                fake.handle_connection(self.connection, self.rfile)
+
+        self._server = socketserver.ThreadingTCPServer(("127.0.0.1", 0), RconHandler)
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+
+    def stop(self):
+        self.drop_connections()
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+
+    def drop_connections(self):
+        """Close every open client connection"""
+        with self._lock:
+            connections = list(self._open)
+        for connection in connections:
+            try:
+                connection.shutdown(2)
+            except OSError:
+                pass
+
+    def handle_connection(self, connection, stream):
+        with self._lock:
+            self.connections += 1
+            self._open.add(connection)
+        try:
+            authenticated = False
+            while True:
+                request = read_packet(stream)
+                if request is None:
+                    return
+                request_id, packet_type, body = request
+                if packet_type == SERVERDATA_AUTH:
+                    authenticated = body.decode("utf-8") == self.password
+                    connection.sendall(packet(
+                        request_id if authenticated else -1, SERVERDATA_AUTH_RESPONSE, b""))
+                    if not authenticated:
+                        return
+                elif not authenticated:
+                    return
+                elif packet_type == SERVERDATA_EXECCOMMAND:
+                    command = body.decode("utf-8")
+                    with self._lock:
+                        self.commands.append(command)
+                    time.sleep(self.delay)
+                    if command == self.drop_after:
+                        return
+                    reply = self.responses.get(command, "").encode("utf-8")
+                    chunks = [reply[i:i + MAX_BODY] for i in range(0, len(reply), MAX_BODY)]
+                    for chunk in chunks or [b""]:
+                        connection.sendall(packet(request_id, SERVERDATA_RESPONSE_VALUE, chunk))
+                else:
+                    connection.sendall(packet(request_id, SERVERDATA_RESPONSE_VALUE, b""))
+        except OSError:
+            return
+        finally:
+            with self._lock:
+                self._open.discard(connection)
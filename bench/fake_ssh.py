@@ -0,0 +1,145 @@
+# bench/fake_ssh.py
+import socket
+import threading
+import time
+import paramiko
+from src.config import SERVER_DIR
+
+
+class FakeHost:
+    """State of a pretend Minecraft host and the shell commands it answers.
+
+    Understands the commands ServerManager sends when the remote agent is
+    unavailable: the Java process scan, resolving the server directory,
+    the ``screen`` start command, console commands stuffed into screen,
+    and ``kill``. Every command waits ``command_delay`` seconds first,
+    like a round trip to a real host. Starting takes ``start_delay``
+    seconds and a console ``stop`` takes ``stop_delay``.
+    """
+
+    PID = 4242
+
+    def __init__(self, command_delay=0.02, start_delay=1.0, stop_delay=1.0, running=False):
+        self.command_delay = command_delay
+        self.start_delay = start_delay
+        self.stop_delay = stop_delay
+        self.running = running
+        self.commands = []
+        self._lock = threading.Lock()
+
+    @property
+    def command_count(self):
+        with self._lock:
+            return len(self.commands)
+
+    def handle(self, command):
+        """Return (stdout, stderr, exit status) for one command"""
+        with self._lock:
+            self.commands.append(command)
+        time.sleep(self.command_delay)
+
+        if command.startswith("python3 "):
+            # No remote agent: the monitor falls back to plain commands
+            return "", "python3: command not found\n", 127
+        if "pgrep -x java" in command:
+            if self.running:
+                args = "\x1f".join(["java", "-Xms4G", "-Xmx4G", "-jar", "paper.jar", "--nogui"])
+                return f"{self.PID}\t{SERVER_DIR}\t25565\t\t{args}\x1f\n", "", 0
+            return "", "", 0
+        if command.startswith("readlink -f "):
+            return f"{SERVER_DIR}\n", "", 0
+        if "screen -dmS" in command:
+            self._set_running_later(True, self.start_delay)
+        elif "-X stuff" in command and "'stop" in command:
+            self._set_running_later(False, self.stop_delay)
+        elif command.startswith("kill "):
+            self.running = False
+        return "", "", 0
+
+    def _set_running_later(self, running, delay):
+        timer = threading.Timer(delay, setattr, args=(self, "running", running))
+        timer.daemon = True
+        timer.start()
+
+
+class _Interface(paramiko.ServerInterface):
+    def __init__(self, server):
+        self.server = server
+
+    def get_allowed_auths(self, username):
+        return "password"
+
+    def check_auth_password(self, username, password):
+        if password == self.server.password:
+            return paramiko.AUTH_SUCCESSFUL
+        return paramiko.AUTH_FAILED
+
+    def check_channel_request(self, kind, chanid):
+        if kind == "session":
+            return paramiko.OPEN_SUCCEEDED
+        return paramiko.OPEN_FAILED_ADMINISTRATIVELY_PROHIBITED
+
+    def check_channel_exec_request(self, channel, command):
+        threading.Thread(
+            target=self.server.run,
+            args=(channel, command.decode()),
+            daemon=True
+        ).start()
+        return True
+
+
+class FakeSSHServer:
+    """Local paramiko SSH server whose exec requests go to a FakeHost"""
+
+    def __init__(self, host, password="bench"):
+        self.host = host
+        self.password = password
+        self.key = paramiko.RSAKey.generate(2048)
+        self._sock = None
+        self._transports = []
+
+    @property
+    def port(self):
+        return self._sock.getsockname()[1]
+
+    def start(self):
+        """Listen on a free local port"""
+        self._sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self._sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self._sock.bind(("127.0.0.1", 0))
+        self._sock.listen(16)
+        threading.Thread(target=self._accept_loop, daemon=True).start()
+
+    def stop(self):
+        for transport in self._transports:
+            transport.close()
+        if self._sock:
+            self._sock.close()
+
+    def run(self, channel, command):
+        try:
+            stdout, stderr, status = self.host.handle(command)
+            if stdout:
+                channel.sendall(stdout.encode())
+            if stderr:
+                channel.sendall_stderr(stderr.encode())
+            channel.send_exit_status(status)
+        except OSError:
+            # The client gave up on the command (execute_many timeouts)
+            pass
+        finally:
+            channel.close()
+
+    def _accept_loop(self):
+        while True:
+            try:
+                client, _ = self._sock.accept()
+            except OSError:
+                return
+            # sshd writes each reply in one go; paramiko sends every packet
+            # separately, and Nagle would stall the ones after the first
+            client.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            transport = paramiko.Transport(client)
+            transport.add_server_key(self.key)
+            transport.start_server(server=_Interface(self))
+            self._transports.append(transport)
@@ -0,0 +1,218 @@
+# bench/run.py
+"""Benchmark the monitor against local fake servers.
+
+Starts a paramiko SSH server standing in for the Minecraft host (see
+fake_ssh.FakeHost for the commands it understands) and a Server List
+Ping/Query responder, then measures:
+
+- status tick latency (p50/p95/p99) with the server running and stopped
+- remote commands and pings per tick
+- start_server/stop_server wall time
+- a batch of commands run one by one and with execute_many
+- with --gui, how long each GUI handler blocks the Tk thread
+- the monitor's own timing spans and retry/failure counters
+
+Run from the repository root:
+
+    python -m bench.run --ticks 200 --delay 0.02 --gui
+
+The fake host has no python3, so the monitor uses its plain exec_command
+path; every remote command costs one SSH round trip of --delay seconds.
+"""
+import argparse
+import functools
+import os
+import statistics
+import tempfile
+import time
+from collections import defaultdict
+from bench.fake_minecraft import FakeMinecraftServer
+from bench.fake_ssh import FakeHost, FakeSSHServer
+from src.server.manager import ServerManager
+from src.server.stats import ServerStats
+from src.server.poller import StatusPoller
+from src.telemetry import telemetry
+
+
+def summarize(samples):
+    """Return p50/p95/p99/max of a list of numbers"""
+    if len(samples) < 2:
+        value = samples[0] if samples else 0.0
+        return {"p50": value, "p95": value, "p99": value, "max": value}
+    cuts = statistics.quantiles(samples, n=100, method="inclusive")
+    return {"p50": cuts[49], "p95": cuts[94], "p99": cuts[98], "max": max(samples)}
+
+
+def report(name, samples, unit="ms"):
+    stats = summarize(samples)
+    print(f"  {name:<28} n={len(samples):<5} " + "  ".join(
+        f"{key}={value:8.2f}{unit}" for key, value in stats.items()
+    ))
+
+
+def bench_ticks(poller, host, minecraft, ticks, running):
+    """Time poll_once() with the server running or stopped"""
+    host.running = running
+    latencies, commands, pings = [], [], []
+    for _ in range(ticks):
+        # Real ticks are further apart than the cache TTLs
+        poller.invalidate()
+        command_count, ping_count = host.command_count, minecraft.requests
+        started = time.perf_counter()
+        poller.poll_once()
+        latencies.append((time.perf_counter() - started) * 1000)
+        commands.append(host.command_count - command_count)
+        pings.append(minecraft.requests - ping_count)
+    return latencies, commands, pings
+
+
+def bench_lifecycle(manager, host, rounds):
+    """Time full start and stop actions"""
+    starts, stops = [], []
+    for _ in range(rounds):
+        host.running = False
+        manager.invalidate_cache()
+        started = time.perf_counter()
+        _, stderr = manager.start_server()
+        starts.append(time.perf_counter() - started)
+        if stderr:
+            print(f"  start failed: {stderr}")
+
+        started = time.perf_counter()
+        _, stderr = manager.stop_server()
+        stops.append(time.perf_counter() - started)
+        if stderr:
+            print(f"  stop failed: {stderr}")
+    return starts, stops
+
+
+def bench_batch(manager, size, rounds):
+    """Time size commands run one by one and as one execute_many batch"""
+    commands = [f"echo batch {index}" for index in range(size)]
+    serial, batched = [], []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        for command in commands:
+            manager.execute_command(command)
+        serial.append((time.perf_counter() - started) * 1000)
+
+        started = time.perf_counter()
+        manager.execute_many(commands)
+        batched.append((time.perf_counter() - started) * 1000)
+    return serial, batched
+
+
+def bench_gui(ssh, minecraft, host, seconds, workdir):
+    """Drive MainWindow against the fakes and time its Tk-thread handlers"""
+    import tkinter as tk
+    try:
+        root = tk.Tk()
+    except tk.TclError as e:
+        print(f"  skipped: no display ({str(e)})")
+        return None
+
+    import src.gui.main_window as main_window
+    from src.gui.viewmodel import ViewModel
+
+    timings = defaultdict(list)
+
+    def timed(name, func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                timings[name].append((time.perf_counter() - started) * 1000)
+        return wrapper
+
+    window_class = main_window.MainWindow
+    for name in ("check_status", "update_server_stats", "start_server", "stop_server"):
+        setattr(window_class, name, timed(name, getattr(window_class, name)))
+    ViewModel.flush = timed("ViewModel.flush", ViewModel.flush)
+
+    # Point the window at the fakes and answer its dialogs
+    main_window.ServerManager = lambda *args, **kwargs: ServerManager(
+        "127.0.0.1", "bench", ssh_port=ssh.port, server_port=minecraft.port)
+    main_window.ServerStats = lambda *args, **kwargs: ServerStats("127.0.0.1", minecraft.port)
+    main_window.get_password = lambda *args: ssh.password
+    main_window.save_password = lambda *args: False
+    main_window.METRICS_DB = os.path.join(workdir, "gui.db")
+    main_window.messagebox.showinfo = lambda *args, **kwargs: None
+    main_window.messagebox.showerror = lambda title, message, **kwargs: print(f"  {message}")
+    main_window.messagebox.askyesno = lambda *args, **kwargs: True
+
+    host.running = False
+    window = window_class(root)
+    window.poller.interval = 0.5
+    root.after(int(seconds * 1000 / 3), window.start_server)
+    root.after(int(seconds * 2000 / 3), window.stop_server)
+    root.after(int(seconds * 1000), root.quit)
+    root.mainloop()
+    window.on_close()
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the monitor against local fake servers")
+    parser.add_argument("--ticks", type=int, default=100, help="status ticks per scenario")
+    parser.add_argument("--delay", type=float, default=0.02, help="seconds per remote command")
+    parser.add_argument("--ping-delay", type=float, default=0.005, help="seconds per status ping")
+    parser.add_argument("--rounds", type=int, default=3, help="start/stop cycles")
+    parser.add_argument("--batch", type=int, default=8, help="commands per execute_many batch")
+    parser.add_argument("--gui", action="store_true", help="also time the Tk handlers")
+    parser.add_argument("--gui-seconds", type=float, default=15, help="length of the GUI run")
+    args = parser.parse_args()
+
+    host = FakeHost(command_delay=args.delay)
+    ssh = FakeSSHServer(host)
+    minecraft = FakeMinecraftServer(host, delay=args.ping_delay)
+    ssh.start()
+    minecraft.start()
+    workdir = tempfile.mkdtemp(prefix="minecraft_monitor_bench_")
+
+    manager = ServerManager("127.0.0.1", "bench", ssh_port=ssh.port, server_port=minecraft.port)
+    stats = ServerStats("127.0.0.1", minecraft.port)
+    if not manager.connect(ssh.password):
+        raise SystemExit("Could not connect to the fake SSH server")
+    poller = StatusPoller(manager, stats, resource_interval=0)
+
+    print(f"Remote command delay {args.delay * 1000:.0f}ms, ping delay {args.ping_delay * 1000:.0f}ms")
+    for running in (True, False):
+        latencies, commands, pings = bench_ticks(poller, host, minecraft, args.ticks, running)
+        print(f"Status tick, server {'running' if running else 'stopped'}:")
+        report("latency", latencies)
+        report("remote commands per tick", commands, unit="")
+        report("pings per tick", pings, unit="")
+
+    starts, stops = bench_lifecycle(manager, host, args.rounds)
+    print("Lifecycle actions (fake boot and shutdown take 1s each):")
+    report("start_server", starts, unit="s")
+    report("stop_server", stops, unit="s")
+
+    serial, batched = bench_batch(manager, args.batch, args.rounds * 5)
+    print(f"{args.batch} independent commands:")
+    report("execute_command in turn", serial)
+    report("execute_many", batched)
+
+    if args.gui:
+        print("GUI thread blocking:")
+        timings = bench_gui(ssh, minecraft, host, args.gui_seconds, workdir)
+        for name, samples in sorted((timings or {}).items()):
+            report(name, samples)
+
+    snapshot = telemetry.snapshot()
+    print("Monitor spans:")
+    for name, span in snapshot["spans"].items():
+        print(f"  {name:<28} n={span['count']:<5} p50={span['p50_ms']:8.2f}ms  "
+              f"p95={span['p95_ms']:8.2f}ms  max={span['max_ms']:8.2f}ms  errors={span['errors']}")
+    for name, value in snapshot["counters"].items():
+        print(f"  {name:<28} {value}")
+
+    manager.close()
+    ssh.stop()
+    minecraft.stop()
+
+
+if __name__ == "__main__":
+    main()
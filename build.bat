@@ -1,4 +1,5 @@
 @echo off
 python -m pip install -r requirements.txt
 python build.py
+rem Time to first paint: python build.py --no-build --benchmark 5
 pause
@@ -1,29 +1,84 @@
 # build.py
-import PyInstaller.__main__
+import argparse
 import os
+import statistics
+import subprocess
 import sys
+import tempfile
+import time
+from src.config import STARTUP_PROBE_ENV
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 
 def build():
-    # Get the directory containing the script
-    script_dir = os.path.dirname(os.path.abspath(__file__))
-    
-    # Define icon path (create an .ico file and put it in the project root)
-    icon_path = os.path.join(script_dir, 'minecraft_monitor.ico')
-    
+    """Build the onedir bundle described in MinecraftMonitor.spec"""
+    import PyInstaller.__main__
     PyInstaller.__main__.run([
-        'main.py',  # Your main script
-        '--name=MinecraftMonitor',  # Name of the executable
-        '--onefile',  # Create a single executable file
-        '--windowed',  # Don't show console window
-        f'--icon={icon_path}',  # Application icon
-        '--add-data=src;src',  # Include the src directory
+        os.path.join(SCRIPT_DIR, 'MinecraftMonitor.spec'),
+        # Keep dist/ where bundle_command() looks, whatever the working directory
+        '--distpath', os.path.join(SCRIPT_DIR, 'dist'),
+        '--workpath', os.path.join(SCRIPT_DIR, 'build'),
         '--clean',  # Clean cache
-        '--noconfirm',  # Replace existing spec/build
-        # Add required hidden imports
-        '--hidden-import=paramiko',
-        '--hidden-import=mcstatus',
-        '--hidden-import=cryptography'
+        '--noconfirm',  # Replace existing build
     ])
 
+def bundle_command():
+    """Command line of the built executable"""
+    name = 'MinecraftMonitor.exe' if sys.platform == 'win32' else 'MinecraftMonitor'
+    return [os.path.join(SCRIPT_DIR, 'dist', 'MinecraftMonitor', name)]
+
+def source_command():
+    """Command line of the unfrozen app"""
+    return [sys.executable, os.path.join(SCRIPT_DIR, 'main.py')]
+
+def time_to_first_paint(command, timeout=60):
+    """Launch the GUI once and return seconds from launch to its first paint"""
+    fd, probe = tempfile.mkstemp(prefix='minecraft_monitor_startup_')
+    os.close(fd)
+    os.remove(probe)
+    env = dict(os.environ, **{STARTUP_PROBE_ENV: probe})
+    try:
+        launched = time.time()
+        subprocess.run(command, env=env, cwd=SCRIPT_DIR, timeout=timeout,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        if not os.path.exists(probe):
+            raise RuntimeError(f"{command[0]} exited without painting a window")
+        with open(probe) as result:
+            return float(result.read()) - launched
+    finally:
+        if os.path.exists(probe):
+            os.remove(probe)
+
+def benchmark(name, command, runs):
+    """Print cold (first launch) and warm (median of the rest) time to first paint
+
+    "Cold" is only truly cold right after a build or a reboot, while the
+    OS has none of the bundle's files cached.
+    """
+    if not os.path.exists(command[0]):
+        print(f"{name:<8} skipped: {command[0]} not found (run without --no-build first)")
+        return
+    samples = [time_to_first_paint(command) for _ in range(runs)]
+    warm = samples[1:] or samples
+    print(f"{name:<8} cold {samples[0] * 1000:7.0f}ms   warm median {statistics.median(warm) * 1000:7.0f}ms"
+          f"   min {min(warm) * 1000:7.0f}ms   ({runs} launches)")
+
+def main():
+    parser = argparse.ArgumentParser(description="Build MinecraftMonitor and measure its startup")
+    parser.add_argument('--benchmark', type=int, metavar='RUNS', default=0,
+                        help="launch the GUI RUNS times and report time to first paint")
+    parser.add_argument('--no-build', action='store_true', help="benchmark the existing build")
+    parser.add_argument('--source', action='store_true',
+                        help="also benchmark python main.py for comparison")
+    args = parser.parse_args()
+
+    if not args.no_build:
+        build()
+    if args.benchmark:
+        print("Time to first paint:")
+        benchmark('bundle', bundle_command(), args.benchmark)
+        if args.source:
+            benchmark('source', source_command(), args.benchmark)
+
 if __name__ == "__main__":
-    build()
+    main()
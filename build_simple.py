@@ -1,6 +1,8 @@
 # build_simple.py
+# One-file build: a single exe to hand around, but it unpacks itself to a
+# temp folder on every launch. build.py makes the faster-starting onedir
+# bundle.
 import PyInstaller.__main__
-import os
 
 PyInstaller.__main__.run([
     'main.py',
@@ -9,11 +11,20 @@ PyInstaller.__main__.run([
     '--windowed',
     '--clean',
     '--noconfirm',
-    '--add-data=src;src',
+    # Imported inside functions so the window paints first
     '--hidden-import=paramiko',
     '--hidden-import=mcstatus',
-    '--hidden-import=cryptography',
-    '--hidden-import=bcrypt',
-    '--hidden-import=nacl',
-    '--hidden-import=tkinter'
+    '--hidden-import=keyring',
+    # Never imported by the monitor
+    '--exclude-module=doctest',
+    '--exclude-module=pdb',
+    '--exclude-module=pydoc',
+    '--exclude-module=lib2to3',
+    '--exclude-module=distutils',
+    '--exclude-module=setuptools',
+    '--exclude-module=test',
+    '--exclude-module=tkinter.test',
+    '--exclude-module=idlelib',
+    '--exclude-module=invoke',
+    '--exclude-module=gssapi',
 ])
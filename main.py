@@ -1,8 +1,11 @@
 # main.py
+import argparse
 import os
 import sys
-import tkinter as tk
-from src.gui.main_window import MainWindow
+import time
+from src.config import (HEADLESS_BIND, HEADLESS_PORT, LOG_LEVEL, LOG_FILE, LOG_FILE_MAX_BYTES,
+                        LOG_FILE_BACKUPS, TRACE_FILE, PROFILE_INTERVAL, STARTUP_PROBE_ENV)
+from src.telemetry import SamplingProfiler, setup_logging
 
 def resource_path(relative_path):
     """Get absolute path to resource, works for dev and for PyInstaller"""
@@ -14,14 +17,95 @@ def resource_path(relative_path):
     
     return os.path.join(base_path, relative_path)
 
+def parse_args():
+    parser = argparse.ArgumentParser(description="Minecraft Server Monitor")
+    parser.add_argument(
+        "--dashboard",
+        action="store_true",
+        help="monitor every server listed in SERVERS in src/config.py"
+    )
+    parser.add_argument(
+        "--headless",
+        action="store_true",
+        help="run without a GUI and serve status and metrics over HTTP"
+    )
+    parser.add_argument(
+        "--bind",
+        default=HEADLESS_BIND,
+        help=f"address for the headless HTTP endpoint (default {HEADLESS_BIND})"
+    )
+    parser.add_argument(
+        "--port",
+        type=int,
+        default=HEADLESS_PORT,
+        help=f"port for the headless HTTP endpoint (default {HEADLESS_PORT})"
+    )
+    parser.add_argument(
+        "--log-level",
+        default=LOG_LEVEL,
+        choices=("DEBUG", "INFO", "WARNING", "ERROR"),
+        help=f"console and log file verbosity (default {LOG_LEVEL})"
+    )
+    parser.add_argument(
+        "--trace",
+        metavar="FILE",
+        default=TRACE_FILE,
+        help="export every timing span as a JSON line to FILE"
+    )
+    parser.add_argument(
+        "--profile",
+        metavar="FILE",
+        help="sample all thread stacks and write folded stacks to FILE on exit"
+    )
+    return parser.parse_args()
+
 def main():
+    args = parse_args()
+    setup_logging(args.log_level, LOG_FILE, args.trace, LOG_FILE_MAX_BYTES, LOG_FILE_BACKUPS)
+
+    profiler = None
+    if args.profile:
+        profiler = SamplingProfiler(args.profile, PROFILE_INTERVAL)
+        profiler.start()
+    try:
+        run_app(args)
+    finally:
+        if profiler:
+            profiler.stop()
+
+def run_app(args):
+    """Run the GUI, the dashboard or the headless daemon"""
     # Set up any environment variables or configurations
     os.environ['PYTHONPATH'] = resource_path('src')
     
-    # Create and run the application
+    if args.headless:
+        # Headless hosts may not have Tk at all, so only import it below
+        from src.headless.daemon import run
+        sys.exit(run(bind=args.bind, http_port=args.port))
+
+    # paramiko, mcstatus and keyring load on first use, off the Tk
+    # thread, so only the window that is shown gets imported here
+    import tkinter as tk
     root = tk.Tk()
-    app = MainWindow(root)
+    # The startup benchmark only times the first paint; never connect
+    probe = os.environ.get(STARTUP_PROBE_ENV)
+    if args.dashboard:
+        from src.gui.dashboard import DashboardWindow
+        app = DashboardWindow(root, connect=not probe)
+    else:
+        from src.gui.main_window import MainWindow
+        app = MainWindow(root, connect=not probe)
+
+    if probe:
+        root.after_idle(report_first_paint, root, app, probe)
     root.mainloop()
 
+def report_first_paint(root, app, path):
+    """Write the time of the first paint to path and close (startup benchmark)"""
+    root.update_idletasks()
+    with open(path, "w") as output:
+        output.write(repr(time.time()))
+    app.on_close()
+
 if __name__ == "__main__":
     main()
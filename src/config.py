@@ -1,4 +1,140 @@
-# src/config.py
+import os
+
 SERVER_HOST = "192.168.86.56"  # Your Minecraft server IP
 SERVER_USER = "minecraft"      # Your SSH username
 SERVER_PORT = 25565           # Minecraft server port
+SSH_PORT = 22                 # SSH port on the server host
+SSH_CONNECT_TIMEOUT = 10      # Seconds to wait for the SSH handshake
+SSH_KEEPALIVE_INTERVAL = 15   # Seconds between SSH keepalive packets
+HEALTH_CHECK_INTERVAL = 5     # Seconds between connection probes
+RECONNECT_MAX_DELAY = 60      # Longest wait between reconnect attempts
+USE_CONTROL_MASTER = True     # Reuse an open OpenSSH ControlMaster connection if there is one
+SSH_CONTROL_PATH = None       # ControlPath socket; None uses the one in ~/.ssh/config
+EXEC_TIMEOUT = 10             # Seconds a remote command may run
+EXEC_MAX_CHANNELS = 8         # Commands run at once by execute_many; OpenSSH allows 10 sessions per connection
+SAVE_PASSWORDS = True         # Remember working passwords in the OS keyring (needs keyring)
+SERVER_DIR = "/home/minecraft/minecraft"      # Server directory on the host
+SCREEN_NAME = "minecraft"     # screen session running the server console
+SERVER_JAR = "paper.jar"      # Server jar in SERVER_DIR
+SERVER_HEAP = "4G"            # -Xms and -Xmx of the server JVM; None leaves them to JVM_PROFILE
+JVM_PROFILE = "plain"         # Flags from JVM_PROFILES added to the java command line
+JAVA = "java"                 # Java executable on the host
+RCON_PORT = 25575             # rcon.port in server.properties
+RCON_PASSWORD = None          # rcon.password; None sends commands through screen instead
+EVENT_FALLBACK_INTERVAL = 60  # Seconds between safety-net process scans when events stream
+RESOURCE_INTERVAL = 15        # Seconds between host/JVM resource samples
+INSTANCE_INTERVAL = 60        # Seconds between host-wide instance listings (headless)
+COLLECT_TPS = True            # Sample TPS/MSPT by sending tps/mspt to the console
+PROCESS_CACHE_TTL = 2         # Seconds a server process scan is reused
+STATUS_CACHE_TTL = 1          # Seconds a server list ping is reused
+
+# JVM flag sets that server instances pick with "profile". Add your own.
+JVM_PROFILES = {
+    "plain": [],
+    # Aikar's G1 flags (https://docs.papermc.io/paper/aikars-flags), for heaps up to 12G
+    "aikar": [
+        "-XX:+UseG1GC", "-XX:+ParallelRefProcEnabled", "-XX:MaxGCPauseMillis=200",
+        "-XX:+UnlockExperimentalVMOptions", "-XX:+DisableExplicitGC", "-XX:+AlwaysPreTouch",
+        "-XX:G1NewSizePercent=30", "-XX:G1MaxNewSizePercent=40", "-XX:G1HeapRegionSize=8M",
+        "-XX:G1ReservePercent=20", "-XX:G1HeapWastePercent=5", "-XX:G1MixedGCCountTarget=4",
+        "-XX:InitiatingHeapOccupancyPercent=15", "-XX:G1MixedGCLiveThresholdPercent=90",
+        "-XX:G1RSetUpdatingPauseTimePercent=5", "-XX:SurvivorRatio=32", "-XX:+PerfDisableSharedMem",
+        "-XX:MaxTenuringThreshold=1", "-Dusing.aikars.flags=https://mcflags.emc.gs",
+        "-Daikars.new.flags=true",
+    ],
+    # The same for heaps above 12G
+    "aikar-large": [
+        "-XX:+UseG1GC", "-XX:+ParallelRefProcEnabled", "-XX:MaxGCPauseMillis=200",
+        "-XX:+UnlockExperimentalVMOptions", "-XX:+DisableExplicitGC", "-XX:+AlwaysPreTouch",
+        "-XX:G1NewSizePercent=40", "-XX:G1MaxNewSizePercent=50", "-XX:G1HeapRegionSize=16M",
+        "-XX:G1ReservePercent=15", "-XX:G1HeapWastePercent=5", "-XX:G1MixedGCCountTarget=4",
+        "-XX:InitiatingHeapOccupancyPercent=20", "-XX:G1MixedGCLiveThresholdPercent=90",
+        "-XX:G1RSetUpdatingPauseTimePercent=5", "-XX:SurvivorRatio=32", "-XX:+PerfDisableSharedMem",
+        "-XX:MaxTenuringThreshold=1", "-Dusing.aikars.flags=https://mcflags.emc.gs",
+        "-Daikars.new.flags=true",
+    ],
+}
+
+# Console log pane
+LOG_BACKLOG = 200             # Lines shown from before the monitor connected
+LOG_SCROLLBACK = 2000         # Lines kept in the console pane
+LOG_REDRAW_INTERVAL = 250     # Milliseconds between console pane redraws
+
+# Servers shown in dashboard mode (main.py --dashboard). Keys left out of
+# an entry fall back to the settings above. Hosts are first tried with
+# keys, the SSH agent and the keyring; a password is asked once per SSH
+# host only when that fails. Add "password" to an entry to skip it all.
+# To run several servers on one host, give each entry its own "directory",
+# "screen" and "port"; they share one SSH connection. "jar", "heap",
+# "profile", "jvm_args" and "java" set how each one is started.
+SERVERS = [
+    {
+        "name": "Main",
+        "host": SERVER_HOST,
+        "user": SERVER_USER,
+        "port": SERVER_PORT,
+        "ssh_port": SSH_PORT,
+    },
+]
+DASHBOARD_WORKERS = 8         # Servers polled at the same time
+DASHBOARD_INTERVAL = 5        # Seconds between dashboard refreshes
+
+# Poll history kept in memory (one slot per sample) and appended to disk
+METRICS_DB = os.path.join(os.path.expanduser("~"), ".minecraft_monitor", "metrics.db")
+METRICS_CAPACITY = 86400      # 24h at one sample per second
+METRICS_FLUSH_INTERVAL = 60   # Seconds between writes to METRICS_DB
+
+# Player sessions, stored in METRICS_DB next to the poll history
+PLAYER_LIST_INTERVAL = 30     # Seconds between full player lists (RCON or Query)
+USE_QUERY = False             # Ask the Query port for player lists (enable-query in server.properties)
+
+# World backups (see src/server/backup.py). Each backup stages the worlds
+# on the host with rsync, so the server stops saving only for the final
+# catch-up copy, then streams the changed files here as a .tar.gz.
+BACKUP_DIR = os.path.join(os.path.expanduser("~"), ".minecraft_monitor", "backups")
+BACKUP_PATHS = ["world", "world_nether", "world_the_end"]  # Relative to the server directory
+BACKUP_STAGING = ".backup-staging"  # In the server directory; kept between backups, needs room for one world copy
+BACKUP_INTERVAL = None        # Seconds between scheduled backups; None backs up only on request
+BACKUP_FULL_EVERY = 7         # Every Nth backup is full, the others only hold changed files
+BACKUP_KEEP_FULL = 4          # Full backups kept, each with the incrementals built on it
+BACKUP_COMPRESS_LEVEL = 3     # gzip level; region files are already compressed
+STREAM_CHUNK_SIZE = 256 * 1024  # Bytes read from the SSH channel at a time
+
+# Alert rules, checked against every poll. "type" is threshold, rate or
+# absence; see src/server/alerts.py for the options of each. "for" is how
+# long a condition must hold before the alert fires, and "clear" is the
+# value a firing threshold alert must get back past before it resolves.
+ALERT_RULES = [
+    {"type": "threshold", "name": "High latency", "metric": "latency_ms", "aggregate": "p95",
+     "window": 60, "op": ">", "threshold": 200, "clear": 150, "min_samples": 5},
+    # Not while the monitor stops or starts the server, or after it stopped it
+    {"type": "threshold", "name": "Server down", "metric": "running", "op": "<", "threshold": 1,
+     "for": 30, "severity": "critical",
+     "quiet_during": ["SAVING", "STOPPING", "TERMINATING", "KILLING", "STOPPED", "STARTING"]},
+    {"type": "threshold", "name": "Server full", "metric": "players_online", "op": ">=",
+     "threshold": "players_max"},
+    {"type": "rate", "name": "GC pressure", "metric": "gc_time_s", "window": 120, "op": ">",
+     "threshold": 0.1},
+    {"type": "absence", "name": "Server state unknown", "metric": "running", "timeout": 60,
+     "severity": "critical"},
+]
+ALERT_DESKTOP = False         # Desktop notifications; needs plyer on Windows (or notify-send/osascript)
+ALERT_WEBHOOK_URL = None      # POST every alert as JSON to this URL
+ALERT_FILE = None             # Append every alert as a JSON line to this file
+
+# Diagnostics. DEBUG also logs every remote command with its output.
+LOG_LEVEL = "INFO"
+LOG_FILE = os.path.join(os.path.expanduser("~"), ".minecraft_monitor", "monitor.log")
+LOG_FILE_MAX_BYTES = 1_000_000  # Size at which LOG_FILE and TRACE_FILE rotate
+LOG_FILE_BACKUPS = 3          # Rotated files kept
+TRACE_FILE = None             # Set a path to export every timing span as a JSON line
+PROFILE_INTERVAL = 0.01       # Seconds between stack samples with main.py --profile
+
+# Headless mode (main.py --headless): cached status served over local HTTP
+HEADLESS_BIND = "127.0.0.1"   # Address the HTTP endpoint listens on
+HEADLESS_PORT = 9225          # /status (JSON), /metrics (Prometheus), /history
+SSH_PASSWORD_ENV = "MINECRAFT_MONITOR_SSH_PASSWORD"  # Read before prompting on the terminal
+
+# Set by build.py --benchmark: the GUI writes the time of its first paint
+# to the file named here and exits
+STARTUP_PROBE_ENV = "MINECRAFT_MONITOR_STARTUP_PROBE"
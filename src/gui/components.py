@@ -1,7 +1,11 @@
 # src/gui/components.py
+import re
 import tkinter as tk
+from collections import deque
 from tkinter import ttk
 
+BACKUP_LABEL = "Back Up Worlds"
+
 class StatusFrame:
     def __init__(self, parent):
         self.frame = tk.Frame(parent)
@@ -42,8 +46,16 @@ class StatsFrame:
         self.latency_label = tk.Label(self.frame, text="Latency: --")
         self.latency_label.pack(anchor="w", padx=5)
 
+        # Host/JVM resource labels
+        self.cpu_label = tk.Label(self.frame, text="CPU: --")
+        self.cpu_label.pack(anchor="w", padx=5)
+        self.memory_label = tk.Label(self.frame, text="Memory: --")
+        self.memory_label.pack(anchor="w", padx=5)
+        self.tps_label = tk.Label(self.frame, text="TPS: --")
+        self.tps_label.pack(anchor="w", padx=5)
+
 class ControlFrame:
-    def __init__(self, parent, start_command, stop_command):
+    def __init__(self, parent, start_command, stop_command, backup_command=None):
         self.frame = tk.Frame(parent)
         self.frame.pack(pady=10)
         
@@ -66,3 +78,98 @@ class ControlFrame:
             state=tk.DISABLED
         )
         self.stop_button.pack(pady=5)
+
+        # Backup button, enabled while connected
+        self.backup_button = None
+        if backup_command:
+            self.backup_button = tk.Button(
+                self.frame,
+                text=BACKUP_LABEL,
+                command=backup_command,
+                width=15,
+                state=tk.DISABLED
+            )
+            self.backup_button.pack(pady=5)
+
+class LogFrame:
+    def __init__(self, parent, scrollback=2000):
+        self.frame = tk.LabelFrame(parent, text="Server Console")
+        self.frame.pack(pady=10, padx=10, fill="both", expand=True)
+
+        # Recent lines, kept so the filter can be changed after the fact
+        self.history = deque(maxlen=scrollback)
+        self.scrollback = scrollback
+        self.pattern = None
+        self.line_count = 0
+        self.dropped = 0
+
+        # Filter row
+        filter_row = tk.Frame(self.frame)
+        filter_row.pack(fill="x", padx=5, pady=(5, 0))
+        tk.Label(filter_row, text="Filter (regex):").pack(side="left")
+        self.filter_entry = tk.Entry(filter_row)
+        self.filter_entry.pack(side="left", fill="x", expand=True, padx=5)
+        self.filter_entry.bind("<Return>", lambda event: self.apply_filter())
+        self.dropped_label = tk.Label(filter_row, text="")
+        self.dropped_label.pack(side="right")
+
+        # Console text
+        self.text = tk.Text(
+            self.frame,
+            height=12,
+            width=60,
+            wrap="none",
+            state="disabled"
+        )
+        scrollbar = tk.Scrollbar(self.frame, command=self.text.yview)
+        self.text.config(yscrollcommand=scrollbar.set)
+        scrollbar.pack(side="right", fill="y", pady=5)
+        self.text.pack(fill="both", expand=True, padx=5, pady=5)
+
+    def append(self, lines, dropped=0):
+        """Add a batch of lines with one insert, trimming old ones"""
+        self.history.extend(lines)
+        if dropped:
+            self.dropped += dropped
+            self.dropped_label.config(text=f"{self.dropped} lines skipped")
+
+        visible = self._filtered(lines)[-self.scrollback:]
+        if not visible:
+            return
+
+        # Only follow new output if the view is already at the bottom
+        at_bottom = self.text.yview()[1] >= 0.999
+        self.text.config(state="normal")
+        self.text.insert(tk.END, "\n".join(visible) + "\n")
+        self.line_count += len(visible)
+        excess = self.line_count - self.scrollback
+        if excess > 0:
+            self.text.delete("1.0", f"{excess + 1}.0")
+            self.line_count -= excess
+        self.text.config(state="disabled")
+        if at_bottom:
+            self.text.see(tk.END)
+
+    def apply_filter(self):
+        """Re-render the kept lines with the filter from the entry box"""
+        text = self.filter_entry.get()
+        try:
+            self.pattern = re.compile(text) if text else None
+        except re.error:
+            self.filter_entry.config(bg="#ffcccc")
+            return
+        self.filter_entry.config(bg="white")
+
+        visible = self._filtered(self.history)
+        self.text.config(state="normal")
+        self.text.delete("1.0", tk.END)
+        if visible:
+            self.text.insert(tk.END, "\n".join(visible) + "\n")
+        self.line_count = len(visible)
+        self.text.config(state="disabled")
+        self.text.see(tk.END)
+
+    def _filtered(self, lines):
+        if self.pattern is None:
+            return list(lines)
+        return [line for line in lines if self.pattern.search(line)]
@@ -0,0 +1,180 @@
+# src/gui/dashboard.py
+import logging
+import queue
+import tkinter as tk
+from tkinter import ttk, messagebox, simpledialog
+from src.server.fleet import FleetPoller
+from src.server.metrics import MetricsStore
+from src.server.credentials import save_password
+from src.telemetry import span
+from src.config import (SERVERS, DASHBOARD_WORKERS, DASHBOARD_INTERVAL, SAVE_PASSWORDS,
+                        METRICS_DB, METRICS_CAPACITY, METRICS_FLUSH_INTERVAL)
+
+logger = logging.getLogger(__name__)
+
+class DashboardWindow:
+    """Overview of every server in the registry"""
+
+    COLUMNS = ("status", "players", "latency", "version")
+
+    def __init__(self, root, entries=SERVERS, connect=True):
+        self.root = root
+        self.root.title("Minecraft Server Dashboard")
+        self.root.geometry("640x360")
+
+        self.metrics = MetricsStore(METRICS_DB, METRICS_CAPACITY, METRICS_FLUSH_INTERVAL)
+        self.fleet = FleetPoller(entries, max_workers=DASHBOARD_WORKERS,
+                                 interval=DASHBOARD_INTERVAL, metrics=self.metrics)
+
+        # Passwords typed in, by SSH key, until their connection succeeds
+        self.passwords = {}
+        self.prompted = set()
+
+        self.setup_gui()
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+        self.fleet.start()
+        self.process_results()
+        # Let the window paint before connecting
+        if connect:
+            self.root.after_idle(self.fleet.connect_all)
+
+    def setup_gui(self):
+        """Set up the GUI components"""
+        self.tree = ttk.Treeview(self.root, columns=self.COLUMNS, height=10)
+        self.tree.heading("#0", text="Server")
+        self.tree.heading("status", text="Status")
+        self.tree.heading("players", text="Players")
+        self.tree.heading("latency", text="Latency")
+        self.tree.heading("version", text="Version")
+        self.tree.column("#0", width=150)
+        for column in self.COLUMNS:
+            self.tree.column(column, width=110)
+        self.tree.pack(fill="both", expand=True, padx=10, pady=10)
+
+        for server in self.fleet.servers:
+            self.tree.insert("", tk.END, iid=server.name, text=server.name,
+                             values=("CONNECTING...", "--/--", "--", "--"))
+
+        controls = tk.Frame(self.root)
+        controls.pack(fill="x", padx=10, pady=(0, 10))
+        tk.Button(controls, text="Start Selected", width=15,
+                  command=self.start_selected).pack(side="left")
+        tk.Button(controls, text="Stop Selected", width=15,
+                  command=self.stop_selected).pack(side="left", padx=5)
+        self.refresh_label = tk.Label(controls, text="Last refresh: --")
+        self.refresh_label.pack(side="right")
+
+    def on_connected(self, name, ok):
+        """Save a typed password that worked, or ask for one once per SSH host"""
+        server = self.fleet.get(name)
+        key = server.ssh_key
+        if ok:
+            password = self.passwords.pop(key, None)
+            if password and SAVE_PASSWORDS:
+                host, user, ssh_port = key
+                self.fleet.submit(save_password, host, user, password, ssh_port)
+            return
+
+        self.set_row(name, "CONNECTION FAILED", "--/--", "--", "--")
+        if key in self.prompted or server.password:
+            return
+        self.prompted.add(key)
+        host, user, _ = key
+        password = simpledialog.askstring(
+            "Password Required",
+            f"Enter password for {user}@{host}:",
+            show="*"
+        )
+        if not password:
+            return
+        self.passwords[key] = password
+        for other in self.fleet.servers:
+            if other.ssh_key == key and not other.connected:
+                self.set_row(other.name, "CONNECTING...", "--/--", "--", "--")
+                self.fleet.connect(other, password)
+
+    def process_results(self):
+        """Drain results posted by the fleet poller"""
+        while True:
+            try:
+                item = self.fleet.results.get_nowait()
+            except queue.Empty:
+                break
+
+            kind = item[0]
+            try:
+                with span(f"dashboard.{kind}"):
+                    if kind == "status":
+                        self.update_row(item[1], item[2])
+                    elif kind == "connected":
+                        self.on_connected(item[1], item[2])
+                    elif kind == "refresh":
+                        self.refresh_label.config(text=f"Last refresh: {item[1]:.2f}s")
+                    elif kind == "action":
+                        _, callback, result, error = item
+                        callback(result, error)
+            except Exception as e:
+                logger.warning("Failed to process fleet result: %s", e)
+
+        self.root.after(100, self.process_results)
+
+    def update_row(self, name, snapshot):
+        """Show one server's latest snapshot"""
+        if snapshot is None:
+            self.set_row(name, "ERROR", "--/--", "--", "--")
+        elif snapshot["running"] is None:
+            self.set_row(name, "UNKNOWN", "--/--", "--", "--")
+        elif not snapshot["running"]:
+            self.set_row(name, "STOPPED", "--/--", "--", "--")
+        elif snapshot["status"] is None:
+            self.set_row(name, "NO RESPONSE", "--/--", "--", "--")
+        else:
+            status = snapshot["status"]
+            self.set_row(
+                name,
+                "RUNNING",
+                f"{status.players.online}/{status.players.max}",
+                f"{round(status.latency, 1)}ms",
+                status.version.name
+            )
+
+    def set_row(self, name, *values):
+        """Replace a row's values if they changed"""
+        if tuple(self.tree.item(name, "values")) != values:
+            self.tree.item(name, values=values)
+
+    def selected_server(self):
+        """Return the selected FleetServer, or None"""
+        selection = self.tree.selection()
+        if not selection:
+            messagebox.showinfo("Info", "Select a server first")
+            return None
+        return self.fleet.get(selection[0])
+
+    def start_selected(self):
+        """Start the selected server in the background"""
+        server = self.selected_server()
+        if server:
+            self.set_row(server.name, "STARTING...", "--/--", "--", "--")
+            self.fleet.submit_long(server.manager.start_server,
+                                   callback=lambda result, error: self.on_action_result(server, "start", result, error))
+
+    def stop_selected(self):
+        """Stop the selected server in the background"""
+        server = self.selected_server()
+        if server and messagebox.askyesno("Confirm", f"Are you sure you want to stop {server.name}?"):
+            self.set_row(server.name, "STOPPING...", "--/--", "--", "--")
+            self.fleet.submit_long(server.manager.stop_server,
+                                   callback=lambda result, error: self.on_action_result(server, "stop", result, error))
+
+    def on_action_result(self, server, action, result, error):
+        """Report a finished start/stop request"""
+        stderr = str(error) if error else (result[1] if result else "")
+        if stderr and stderr.strip():
+            messagebox.showerror("Error", f"Failed to {action} {server.name}: {stderr}")
+        self.fleet.request_refresh()
+
+    def on_close(self):
+        """Stop polling and close the window"""
+        self.fleet.stop()
+        self.root.destroy()
@@ -1,24 +1,93 @@
 # src/gui/main_window.py
+import logging
+import queue
+import time
 import tkinter as tk
 from tkinter import messagebox, simpledialog
-from src.gui.components import StatusFrame, StatsFrame, ControlFrame
+from src.gui.components import StatusFrame, StatsFrame, ControlFrame, LogFrame, BACKUP_LABEL
+from src.gui.viewmodel import ViewModel
 from src.server.manager import ServerManager
 from src.server.stats import ServerStats
-from src.config import SERVER_HOST, SERVER_USER, SERVER_PORT
+from src.server.poller import StatusPoller
+from src.server.metrics import MetricsStore
+from src.server.players import PlayerTracker
+from src.server.logs import LogStream
+from src.server.credentials import connect_saved, save_password
+from src.server.supervisor import ConnectionSupervisor, DISCONNECTED
+from src.server.alerts import AlertEngine, CallbackNotifier, build_notifiers, build_rules
+from src.server.backup import BackupScheduler
+from src.telemetry import span, timed
+from src.config import (SERVER_HOST, SERVER_USER, SERVER_PORT, EVENT_FALLBACK_INTERVAL,
+                        RESOURCE_INTERVAL, COLLECT_TPS, SAVE_PASSWORDS,
+                        HEALTH_CHECK_INTERVAL, RECONNECT_MAX_DELAY,
+                        METRICS_DB, METRICS_CAPACITY, METRICS_FLUSH_INTERVAL,
+                        PLAYER_LIST_INTERVAL, USE_QUERY,
+                        ALERT_RULES, ALERT_DESKTOP, ALERT_WEBHOOK_URL, ALERT_FILE, BACKUP_INTERVAL,
+                        LOG_BACKLOG, LOG_SCROLLBACK, LOG_REDRAW_INTERVAL)
+
+logger = logging.getLogger(__name__)
 
 class MainWindow:
-    def __init__(self, root):
+    def __init__(self, root, connect=True):
         self.root = root
         self.root.title("Minecraft Server Manager")
-        self.root.geometry("400x400")
+        self.root.geometry("600x800")
+        self.view = ViewModel(self.root)
 
         self.server_manager = ServerManager(SERVER_HOST, SERVER_USER)
         self.server_stats = ServerStats(SERVER_HOST, SERVER_PORT)
+        self.metrics = MetricsStore(METRICS_DB, METRICS_CAPACITY, METRICS_FLUSH_INTERVAL)
+        self.players = PlayerTracker(METRICS_DB, METRICS_FLUSH_INTERVAL)
+        self.alerts = AlertEngine(
+            build_rules(ALERT_RULES),
+            build_notifiers(ALERT_DESKTOP, ALERT_WEBHOOK_URL, ALERT_FILE) + [
+                CallbackNotifier(lambda alert: self.poller.results.put(("alert", alert)))
+            ]
+        )
+        self.poller = StatusPoller(
+            self.server_manager,
+            self.server_stats,
+            metrics=self.metrics,
+            fallback_interval=EVENT_FALLBACK_INTERVAL,
+            resource_interval=RESOURCE_INTERVAL,
+            collect_tps=COLLECT_TPS,
+            players=self.players,
+            player_list_interval=PLAYER_LIST_INTERVAL,
+            use_query=USE_QUERY,
+            alerts=self.alerts
+        )
+        self.log_stream = LogStream(self.server_manager, backlog=LOG_BACKLOG)
+        self.supervisor = ConnectionSupervisor(
+            self.server_manager,
+            check_interval=HEALTH_CHECK_INTERVAL,
+            max_delay=RECONNECT_MAX_DELAY,
+            on_state=lambda state: self.poller.results.put(("connection", state))
+        )
+        self.backup_scheduler = None
+        if BACKUP_INTERVAL:
+            self.backup_scheduler = BackupScheduler(
+                self.server_manager.backups,
+                BACKUP_INTERVAL,
+                on_result=lambda result: self.poller.results.put(
+                    ("action", self.on_backup_result, result, None))
+            )
+        self.connection_state = None
         self.last_status = None
+        self.starting = False
+        self.phase = None
+        self.lifecycle_state = None
+        self.server_manager.lifecycle.on_state = (
+            lambda state: self.poller.results.put(("lifecycle", state))
+        )
         
         self.setup_gui()
-        self.connect_to_server()
-        self.check_status()
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+        self.poller.start()
+        self.process_results()
+        self.flush_log()
+        # Let the window paint before connecting
+        if connect:
+            self.root.after_idle(self.connect_to_server)
 
     def setup_gui(self):
         """Set up the GUI components"""
@@ -34,32 +103,70 @@ class MainWindow:
         self.control_frame = ControlFrame(
             self.root,
             start_command=self.start_server,
-            stop_command=self.stop_server
+            stop_command=self.stop_server,
+            backup_command=self.backup_worlds
         )
         self.control_frame.frame.pack(fill='x')
 
-    def connect_to_server(self):
-        """Connect to the server with retry option"""
+        # Console Frame
+        self.log_frame = LogFrame(self.root, scrollback=LOG_SCROLLBACK)
+        self.log_frame.frame.pack(fill='both', expand=True, pady=10, padx=10)
+
+    def connect_to_server(self, retry_count=0):
+        """Connect on the poller thread, prompting for a password only if needed
+
+        The first attempt needs no prompt: it uses an OpenSSH master
+        connection, the SSH agent, keys in ~/.ssh or a password saved in
+        the keyring. Only when that fails is the user asked.
+        """
         max_retries = 3
-        retry_count = 0
-        
-        while retry_count < max_retries:
+
+        if retry_count > max_retries:
+            messagebox.showerror("Error", "Maximum connection attempts reached!")
+            self.root.quit()
+            return
+
+        manager = self.server_manager
+        if retry_count == 0:
+            password = None
+            connect = lambda: connect_saved(manager)
+        else:
             password = simpledialog.askstring(
                 "Password Required", 
                 f"Enter password for {SERVER_USER}@{SERVER_HOST}:", 
                 show="*"
             )
-            
+
             if not password:
                 messagebox.showerror("Error", "Password is required!")
                 self.root.quit()
                 return
 
-            print(f"Attempting connection (try {retry_count + 1}/{max_retries})...")
-            if self.server_manager.connect(password):
-                messagebox.showinfo("Success", "Connected to server!")
-                return
-            
+            logger.info("Attempting connection (try %s/%s)...", retry_count, max_retries)
+            connect = lambda: manager.connect(password)
+
+        self.view.set(self.status_frame.status_label, text="Connecting...", fg="black")
+        self.poller.submit(
+            connect,
+            callback=lambda connected, error: self.on_connect_result(connected, retry_count, password)
+        )
+
+    def on_connect_result(self, connected, retry_count, password=None):
+        """Handle the outcome of a background connection attempt"""
+        if connected:
+            if password and SAVE_PASSWORDS:
+                manager = self.server_manager
+                self.poller.submit(save_password, manager.host, manager.user, password, manager.ssh_port)
+            self.view.set(self.status_frame.status_label, text="Connected", fg="black")
+            self.poller.enable_polling()
+            self.poller.submit(self.log_stream.start, callback=self.on_log_started)
+            self.supervisor.start()
+            self.view.set(self.control_frame.backup_button, state=tk.NORMAL)
+            if self.backup_scheduler:
+                self.backup_scheduler.start()
+            return
+
+        if retry_count > 0:
             retry = messagebox.askretrycancel(
                 "Connection Failed",
                 "Failed to connect to server. Would you like to try again?"
@@ -67,76 +174,226 @@ class MainWindow:
             if not retry:
                 self.root.quit()
                 return
-                
-            retry_count += 1
-        
-        messagebox.showerror("Error", "Maximum connection attempts reached!")
-        self.root.quit()
 
-    def check_status(self):
-        """Check server status and update GUI"""
+        self.connect_to_server(retry_count + 1)
+
+    def process_results(self):
+        """Drain results posted by the background poller"""
+        while True:
+            try:
+                item = self.poller.results.get_nowait()
+            except queue.Empty:
+                break
+
+            kind = item[0]
+            try:
+                with span(f"gui.{kind}"):
+                    self.handle_result(item)
+            except Exception as e:
+                logger.warning("Failed to process poller result: %s", e)
+
+        self.root.after(100, self.process_results)
+
+    def handle_result(self, item):
+        """Apply one poller result on the Tk thread"""
+        kind = item[0]
+        if kind == "status":
+            self.check_status(item[1])
+        elif kind == "event":
+            self.on_server_event(item[2])
+        elif kind == "lifecycle":
+            self.on_lifecycle_state(item[1])
+        elif kind == "connection":
+            self.on_connection_state(item[1])
+        elif kind == "action":
+            _, callback, result, error = item
+            callback(result, error)
+        elif kind == "error":
+            self.show_status_error(item[1])
+        elif kind == "alert":
+            self.on_alert(item[1])
+
+    def on_log_started(self, started, error):
+        """Report when the console log cannot be streamed"""
+        if not started:
+            self.log_frame.append(["Console streaming unavailable (the server needs python3)"])
+
+    @timed("gui.flush_log")
+    def flush_log(self):
+        """Move buffered console lines into the log pane at a fixed rate"""
         try:
-            running = self.server_manager.is_server_running()
+            lines, dropped = self.log_stream.drain()
+            if lines or dropped:
+                self.log_frame.append(lines, dropped)
+        except Exception as e:
+            logger.warning("Failed to update console: %s", e)
+        self.root.after(LOG_REDRAW_INTERVAL, self.flush_log)
+
+    def on_close(self):
+        """Stop the poller thread and close the window"""
+        self.supervisor.stop()
+        if self.backup_scheduler:
+            self.backup_scheduler.stop()
+        self.poller.stop()
+        self.alerts.close()
+        self.metrics.flush()
+        self.players.flush()
+        self.root.destroy()
+
+    def on_alert(self, alert):
+        """Show an alert that fired or resolved in the console pane"""
+        stamp = time.strftime("%H:%M:%S", time.localtime(alert.time))
+        self.log_frame.append([f"[{stamp}] [ALERT {alert.state}] {alert.message}"])
+
+    def on_server_event(self, phase):
+        """React to a lifecycle event streamed from the server"""
+        self.phase = phase
+        if phase == "STARTING":
+            self.set_starting(True)
+            self.show_starting()
+        elif phase == "STOPPING":
+            self.view.set(
+                self.status_frame.status_label,
+                text="Server Status: STOPPING",
+                fg="orange"
+            )
+            self.view.set(self.control_frame.start_button, state=tk.DISABLED)
+            self.view.set(self.control_frame.stop_button, state=tk.DISABLED)
+        # RUNNING and STOPPED are applied by the status check that follows
+
+    def on_lifecycle_state(self, state):
+        """Show progress of a start or graceful stop started from this window"""
+        if state == "STARTING":
+            # Ping with the longer startup deadline while the server loads
+            self.lifecycle_state = None
+            self.set_starting(True)
+            self.show_starting()
+        elif state in ("SAVING", "STOPPING", "TERMINATING", "KILLING"):
+            self.lifecycle_state = state
+            self.view.set(
+                self.status_frame.status_label,
+                text=f"Server Status: {state}",
+                fg="orange"
+            )
+            self.view.set(self.control_frame.start_button, state=tk.DISABLED)
+            self.view.set(self.control_frame.stop_button, state=tk.DISABLED)
+        else:
+            self.lifecycle_state = None
+
+    def on_connection_state(self, state):
+        """Show a lost connection as UNKNOWN, and resume once it is back"""
+        self.connection_state = state
+        if state == DISCONNECTED:
+            self.show_unknown()
+            self.log_frame.append(["Connection to the server lost, reconnecting..."])
+        else:
+            self.log_frame.append(["Reconnected to the server"])
+            self.poller.resume()
+            self.poller.submit(self.log_stream.start, callback=self.on_log_started)
+
+    def show_unknown(self):
+        """Show that the server state cannot be seen right now"""
+        self.view.set(
+            self.status_frame.status_label,
+            text="Server Status: UNKNOWN (disconnected)",
+            fg="gray"
+        )
+        # Starting a server we cannot see could launch a second copy
+        self.view.set(self.control_frame.start_button, state=tk.DISABLED)
+        self.view.set(self.control_frame.stop_button, state=tk.DISABLED)
+
+    def check_status(self, snapshot):
+        """Update GUI from a status snapshot produced by the poller"""
+        try:
+            running = snapshot["running"]
+            if running is None:
+                # Unreachable: keep the last known state, but act on nothing
+                self.show_unknown()
+                return
+            self.phase = snapshot.get("phase")
+            if self.phase == "STARTING" and not self.starting:
+                # Started outside this window
+                self.set_starting(True)
             
-            # Only update GUI if status changed
-            if running != self.last_status:
-                self.last_status = running
-                if running:
-                    self.status_frame.status_label.config(
+            # The view model skips widgets whose state is unchanged
+            stopped_now = not running and self.last_status is not False
+            self.last_status = running
+            if running:
+                if self.starting:
+                    self.show_starting()
+                else:
+                    self.view.set(
+                        self.status_frame.status_label,
                         text="Server Status: RUNNING",
                         fg="green"
                     )
-                    self.control_frame.start_button.config(state=tk.DISABLED)
-                    self.control_frame.stop_button.config(state=tk.NORMAL)
-                    self.update_server_stats()
-                else:
-                    self.status_frame.status_label.config(
-                        text="Server Status: STOPPED",
-                        fg="red"
-                    )
-                    self.control_frame.start_button.config(state=tk.NORMAL)
-                    self.control_frame.stop_button.config(state=tk.DISABLED)
-                    self.clear_stats()
+                self.view.set(self.control_frame.start_button, state=tk.DISABLED)
+                self.view.set(self.control_frame.stop_button, state=tk.NORMAL)
+            else:
+                if stopped_now:
+                    self.set_starting(False)
+                self.view.set(
+                    self.status_frame.status_label,
+                    text="Server Status: STOPPED",
+                    fg="red"
+                )
+                self.view.set(self.control_frame.start_button, state=tk.NORMAL)
+                self.view.set(self.control_frame.stop_button, state=tk.DISABLED)
+                self.clear_stats()
+
+            if running:
+                self.update_server_stats(snapshot["status"])
+                if snapshot.get("resources"):
+                    self.update_resources(snapshot["resources"])
                 
         except Exception as e:
-            print(f"Status check error: {str(e)}")
-            self.status_frame.status_label.config(
-                text="Status: ERROR",
-                fg="red"
-            )
+            self.show_status_error(e)
 
-        # Schedule next check
-        self.root.after(5000, self.check_status)
+    def show_status_error(self, error):
+        """Show a failed status check"""
+        logger.warning("Status check error: %s", error)
+        self.view.set(
+            self.status_frame.status_label,
+            text="Status: ERROR",
+            fg="red"
+        )
+
+    def set_starting(self, starting):
+        """Track whether the server is booting after a start request"""
+        self.starting = starting
+        self.poller.set_startup_mode(starting)
 
    # src/gui/main_window.py
-    def update_server_stats(self):
-        """Update server statistics display"""
+    def update_server_stats(self, status):
+        """Update server statistics display from a polled status"""
+        startup_mode = self.starting
         try:
-            if not self.server_manager.is_server_running():
-                self.clear_stats()
-                return
-
-            # Check if we're in startup mode (server is running but stats show starting)
-            startup_mode = (self.status_frame.status_label.cget("text") == "Server Status: STARTING")
-            
-            # Try to get status with appropriate retry mode
-            status = self.server_stats.get_status(startup_mode=startup_mode)
-            
             if status:
                 # Server is responding, update all stats
-                self.status_frame.status_label.config(
-                    text="Server Status: RUNNING",
-                    fg="green"
-                )
+                self.set_starting(False)
+                if self.lifecycle_state or self.phase == "STOPPING":
+                    self.view.set(
+                        self.status_frame.status_label,
+                        text=f"Server Status: {self.lifecycle_state or 'STOPPING'}",
+                        fg="orange"
+                    )
+                else:
+                    self.view.set(
+                        self.status_frame.status_label,
+                        text="Server Status: RUNNING",
+                        fg="green"
+                    )
                 
                 # Update version info
-                self.stats_frame.version_label.config(
+                self.view.set(
+                    self.stats_frame.version_label,
                     text=f"Version: {status.version.name}",
                     fg="green"
                 )
                 
                 # Update player count
-                self.stats_frame.players_label.config(
+                self.view.set(
+                    self.stats_frame.players_label,
                     text=f"Players: {status.players.online}/{status.players.max}",
                     fg="green" if status.players.online < status.players.max else "orange"
                 )
@@ -144,112 +401,175 @@ class MainWindow:
                 # Update latency
                 latency = round(status.latency, 1)
                 color = "green" if latency < 100 else "orange" if latency < 200 else "red"
-                self.stats_frame.latency_label.config(
+                self.view.set(
+                    self.stats_frame.latency_label,
                     text=f"Latency: {latency}ms",
                     fg=color
                 )
 
-                # Update player list
-                self.stats_frame.player_list.delete(1.0, tk.END)
+                # Update player list; sorted so joins/leaves diff to single lines
                 if status.players.online > 0:
                     if hasattr(status.players, 'sample') and status.players.sample:
-                        player_names = [p.name for p in status.players.sample]
-                        self.stats_frame.player_list.insert(tk.END, "\n".join(player_names))
+                        player_names = sorted(p.name for p in status.players.sample)
+                        self.set_player_list(*player_names)
                     else:
-                        self.stats_frame.player_list.insert(tk.END, f"{status.players.online} player(s) online")
+                        self.set_player_list(f"{status.players.online} player(s) online")
                 else:
-                    self.stats_frame.player_list.insert(tk.END, "No players online")
+                    self.set_player_list("No players online")
             else:
                 # Server is running but not responding yet
                 if startup_mode:
                     # Still in startup mode, show starting messages
-                    self.status_frame.status_label.config(
-                        text="Server Status: STARTING",
-                        fg="orange"
-                    )
-                    self.stats_frame.version_label.config(text="Version: Starting...", fg="orange")
-                    self.stats_frame.players_label.config(text="Players: Starting...", fg="orange")
-                    self.stats_frame.latency_label.config(text="Latency: Starting...", fg="orange")
-                    self.stats_frame.player_list.delete(1.0, tk.END)
-                    self.stats_frame.player_list.insert(tk.END, "Server is starting...\nThis may take a few minutes...")
+                    self.show_starting()
                 else:
                     # Not in startup mode but server isn't responding
-                    self.stats_frame.version_label.config(text="Version: No Response", fg="red")
-                    self.stats_frame.players_label.config(text="Players: No Response", fg="red")
-                    self.stats_frame.latency_label.config(text="Latency: No Response", fg="red")
-                    self.stats_frame.player_list.delete(1.0, tk.END)
-                    self.stats_frame.player_list.insert(tk.END, "Waiting for server response...")
+                    self.view.set(self.stats_frame.version_label, text="Version: No Response", fg="red")
+                    self.view.set(self.stats_frame.players_label, text="Players: No Response", fg="red")
+                    self.view.set(self.stats_frame.latency_label, text="Latency: No Response", fg="red")
+                    self.set_player_list("Waiting for server response...")
 
         except Exception as e:
-            print(f"Failed to update stats: {str(e)}")
+            logger.warning("Failed to update stats: %s", e)
             # Don't clear stats immediately if there's an error
             if startup_mode:
                 # Still in startup mode
-                self.stats_frame.player_list.delete(1.0, tk.END)
-                self.stats_frame.player_list.insert(tk.END, "Server is starting...\nThis may take a few minutes...")
+                self.set_player_list("Server is starting...\nThis may take a few minutes...")
             else:
-                self.stats_frame.player_list.delete(1.0, tk.END)
-                self.stats_frame.player_list.insert(tk.END, "Checking server status...")
+                self.set_player_list("Checking server status...")
+
+    def update_resources(self, resources):
+        """Show host, JVM and TPS stats"""
+        host = resources.get("host") or {}
+        process = resources.get("process") or {}
+        jvm = resources.get("jvm") or {}
+        tps = resources.get("tps") or {}
+
+        cpu = process.get("cpu_percent")
+        load = host.get("load") or ["--"]
+        cpus = host.get("cpus") or 1
+        if cpu is not None:
+            color = "green" if cpu < 70 * cpus else "orange" if cpu < 90 * cpus else "red"
+            self.view.set(self.stats_frame.cpu_label, text=f"CPU: {cpu}% (load {load[0]})", fg=color)
+        else:
+            self.view.set(self.stats_frame.cpu_label, text=f"CPU: -- (load {load[0]})", fg="black")
+
+        memory = []
+        if process.get("rss_kb") is not None:
+            memory.append(f"RSS {process['rss_kb'] // 1024}MB")
+        if jvm.get("heap_capacity_kb"):
+            heap_used = jvm["heap_used_kb"] / 1024
+            heap_capacity = jvm["heap_capacity_kb"] / 1024
+            memory.append(f"heap {heap_used:.0f}/{heap_capacity:.0f}MB, GC {jvm.get('gc_time_s') or 0:.1f}s")
+        self.view.set(self.stats_frame.memory_label, text=f"Memory: {', '.join(memory) or '--'}")
+
+        if tps.get("tps_1m") is not None:
+            tps_1m = tps["tps_1m"]
+            color = "green" if tps_1m >= 19 else "orange" if tps_1m >= 15 else "red"
+            mspt = f", {tps['mspt']}ms/tick" if tps.get("mspt") is not None else ""
+            self.view.set(self.stats_frame.tps_label, text=f"TPS: {tps_1m}{mspt}", fg=color)
+
+    def set_player_list(self, *lines):
+        """Show lines in the player list (a single line may contain newlines)"""
+        self.view.set_lines(self.stats_frame.player_list, "\n".join(lines).split("\n"))
+
+    def show_starting(self, message="Server is starting...\nThis may take a few minutes..."):
+        """Show the starting state in all status widgets"""
+        self.view.set(
+            self.status_frame.status_label,
+            text="Server Status: STARTING",
+            fg="orange"
+        )
+        self.view.set(self.stats_frame.version_label, text="Version: Starting...", fg="orange")
+        self.view.set(self.stats_frame.players_label, text="Players: Starting...", fg="orange")
+        self.view.set(self.stats_frame.latency_label, text="Latency: Starting...", fg="orange")
+        self.set_player_list(message)
 
     def start_server(self):
         """Handle server start button click"""
+        if self.connection_state == DISCONNECTED:
+            messagebox.showinfo("Info", "Not connected to the server")
+            return
+        if self.last_status:
+            messagebox.showinfo("Info", "Server is already running!")
+            return
+
+        self.view.set(self.status_frame.status_label, text="Starting server...")
+        self.view.set(self.control_frame.start_button, state=tk.DISABLED)
+        self.poller.submit_long(self.server_manager.start_server, callback=self.on_start_result)
+
+    def on_start_result(self, result, error):
+        """Handle the outcome of a background start request"""
         try:
-            if self.server_manager.is_server_running():
-                messagebox.showinfo("Info", "Server is already running!")
-                return
+            if error:
+                raise error
 
-            self.status_frame.status_label.config(text="Starting server...")
-            self.control_frame.start_button.config(state=tk.DISABLED)
-            
-            stdout, stderr = self.server_manager.start_server()
+            stdout, stderr = result
             
             if stderr and stderr.strip():
                 raise Exception(f"Start error: {stderr}")
                 
-            messagebox.showinfo("Success", "Server start command sent!")
+            messagebox.showinfo("Success", stdout or "Server start command sent!")
             
-            # Update GUI to show starting state
-            self.status_frame.status_label.config(text="Server Status: STARTING", fg="orange")
-            self.stats_frame.version_label.config(text="Version: Starting...", fg="orange")
-            self.stats_frame.players_label.config(text="Players: Starting...", fg="orange")
-            self.stats_frame.latency_label.config(text="Latency: Starting...", fg="orange")
-            self.stats_frame.player_list.delete(1.0, tk.END)
-            self.stats_frame.player_list.insert(tk.END, "Server is starting...")
-            
-            # Force immediate status check
-            self.last_status = None
-            self.check_status()
+            # Update GUI to show starting state until the status check answers
+            self.set_starting(True)
+            self.show_starting("Server is starting...")
             
         except Exception as e:
             messagebox.showerror("Error", f"Failed to start server: {str(e)}")
-            self.check_status()
+
+        # Force immediate status check
+        self.last_status = None
+        self.poller.request_check(fresh=True)
 
     def stop_server(self):
         """Handle server stop button click"""
         if messagebox.askyesno("Confirm", "Are you sure you want to stop the server?"):
-            try:
-                self.status_frame.status_label.config(text="Stopping server...")
-                self.control_frame.stop_button.config(state=tk.DISABLED)
-                
-                stdout, stderr = self.server_manager.stop_server()
-                
-                if stderr and stderr.strip():
-                    raise Exception(f"Stop error: {stderr}")
-                
-                messagebox.showinfo("Success", "Server stop command sent!")
-                
-                # Force immediate status check
-                self.last_status = None
-                self.check_status()
-                
-            except Exception as e:
-                messagebox.showerror("Error", f"Failed to stop server: {str(e)}")
-                self.check_status()
+            self.view.set(self.status_frame.status_label, text="Stopping server...")
+            self.view.set(self.control_frame.stop_button, state=tk.DISABLED)
+            self.poller.submit_long(self.server_manager.stop_server, callback=self.on_stop_result)
+
+    def on_stop_result(self, result, error):
+        """Handle the outcome of a background stop request"""
+        try:
+            if error:
+                raise error
+
+            stdout, stderr = result
+            
+            if stderr and stderr.strip():
+                raise Exception(f"Stop error: {stderr}")
+            
+            messagebox.showinfo("Success", stdout or "Server stopped")
+            
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to stop server: {str(e)}")
+
+        self.lifecycle_state = None
+
+        # Force immediate status check
+        self.last_status = None
+        self.poller.request_check(fresh=True)
+
+    def backup_worlds(self):
+        """Handle backup button click"""
+        self.view.set(self.control_frame.backup_button, state=tk.DISABLED, text="Backing up...")
+        self.poller.submit_long(self.server_manager.backup, callback=self.on_backup_result)
+
+    def on_backup_result(self, result, error):
+        """Report a finished backup, from the button or the schedule"""
+        self.view.set(self.control_frame.backup_button, state=tk.NORMAL, text=BACKUP_LABEL)
+        stdout, stderr = result if result else ("", str(error))
+        if error or (stderr and stderr.strip()):
+            messagebox.showerror("Error", stderr or str(error))
+            return
+        self.log_frame.append([f"[{time.strftime('%H:%M:%S')}] {stdout}"])
 
     def clear_stats(self):
         """Clear all statistics displays"""
-        self.stats_frame.version_label.config(text="Version: --")
-        self.stats_frame.players_label.config(text="Players: --/--")
-        self.stats_frame.latency_label.config(text="Latency: --")
-        self.stats_frame.player_list.delete(1.0, tk.END)
-        self.stats_frame.player_list.insert(tk.END, "Server offline")
+        self.view.set(self.stats_frame.version_label, text="Version: --")
+        self.view.set(self.stats_frame.players_label, text="Players: --/--")
+        self.view.set(self.stats_frame.latency_label, text="Latency: --")
+        self.view.set(self.stats_frame.cpu_label, text="CPU: --", fg="black")
+        self.view.set(self.stats_frame.memory_label, text="Memory: --")
+        self.view.set(self.stats_frame.tps_label, text="TPS: --", fg="black")
+        self.set_player_list("Server offline")
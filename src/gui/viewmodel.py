@@ -0,0 +1,73 @@
+# src/gui/viewmodel.py
+import difflib
+import tkinter as tk
+from src.telemetry import timed
+
+class ViewModel:
+    """Desired widget state, applied as a minimal diff in one idle pass.
+
+    Callers say what a widget should show with set() or set_lines(). The
+    view model remembers what it last rendered for each widget, so
+    repeated refreshes that change nothing never touch Tk. Real changes
+    are batched and applied together from a single ``after_idle``
+    callback.
+    """
+
+    def __init__(self, root):
+        self.root = root
+        self._rendered = {}
+        self._desired = {}
+        self._rendered_lines = {}
+        self._desired_lines = {}
+        self._scheduled = False
+
+    def set(self, widget, **options):
+        """Request widget options such as text, fg or state"""
+        self._desired.setdefault(widget, {}).update(options)
+        self._schedule()
+
+    def set_lines(self, text_widget, lines):
+        """Request the lines shown in a Text widget"""
+        self._desired_lines[text_widget] = list(lines)
+        self._schedule()
+
+    @timed("gui.view_flush")
+    def flush(self):
+        """Apply pending changes now"""
+        self._scheduled = False
+        desired, self._desired = self._desired, {}
+        desired_lines, self._desired_lines = self._desired_lines, {}
+
+        for widget, options in desired.items():
+            rendered = self._rendered.setdefault(widget, {})
+            changes = {key: value for key, value in options.items() if rendered.get(key) != value}
+            if changes:
+                widget.config(**changes)
+                rendered.update(changes)
+
+        for widget, lines in desired_lines.items():
+            self._apply_lines(widget, lines)
+
+    def _schedule(self):
+        if not self._scheduled:
+            self._scheduled = True
+            self.root.after_idle(self.flush)
+
+    def _apply_lines(self, widget, lines):
+        old = self._rendered_lines.get(widget)
+        if old == lines:
+            return
+
+        if old is None:
+            # Unknown content: replace it once, then diff from here on
+            widget.delete("1.0", tk.END)
+            widget.insert("1.0", "".join(line + "\n" for line in lines))
+        else:
+            # Apply edits bottom-up so earlier line numbers stay valid
+            matcher = difflib.SequenceMatcher(None, old, lines, autojunk=False)
+            for tag, i1, i2, j1, j2 in reversed(matcher.get_opcodes()):
+                if tag in ("replace", "delete"):
+                    widget.delete(f"{i1 + 1}.0", f"{i2 + 1}.0")
+                if tag in ("replace", "insert"):
+                    widget.insert(f"{i1 + 1}.0", "".join(line + "\n" for line in lines[j1:j2]))
+        self._rendered_lines[widget] = lines
@@ -0,0 +1,243 @@
+# src/headless/daemon.py
+import getpass
+import logging
+import os
+import queue
+import signal
+import threading
+from src.server.manager import ServerManager
+from src.server.stats import ServerStats
+from src.server.poller import StatusPoller
+from src.server.metrics import MetricsStore, snapshot_values, resource_values
+from src.server.players import PlayerTracker
+from src.server.credentials import connect_saved, save_password
+from src.server.supervisor import ConnectionSupervisor, CONNECTED
+from src.server.alerts import AlertEngine, build_notifiers, build_rules
+from src.server.backup import BackupScheduler
+from src.headless.http_api import StatusHTTPServer
+from src.config import (SERVER_HOST, SERVER_USER, SERVER_PORT, EVENT_FALLBACK_INTERVAL,
+                        RESOURCE_INTERVAL, INSTANCE_INTERVAL, COLLECT_TPS,
+                        METRICS_DB, METRICS_CAPACITY, METRICS_FLUSH_INTERVAL,
+                        PLAYER_LIST_INTERVAL, USE_QUERY,
+                        ALERT_RULES, ALERT_WEBHOOK_URL, ALERT_FILE, BACKUP_INTERVAL,
+                        HEADLESS_BIND, HEADLESS_PORT, SSH_PASSWORD_ENV, SAVE_PASSWORDS,
+                        HEALTH_CHECK_INTERVAL, RECONNECT_MAX_DELAY)
+
+logger = logging.getLogger(__name__)
+
+class MonitorDaemon:
+    """Monitor one server without a GUI and serve the results over HTTP.
+
+    The StatusPoller does the SSH and ping work exactly as in the GUI.
+    This class drains its results into one cached view that every HTTP
+    client reads, so any number of scrapers cost no extra SSH traffic.
+    """
+
+    def __init__(self, host=SERVER_HOST, user=SERVER_USER, port=SERVER_PORT,
+                 bind=HEADLESS_BIND, http_port=HEADLESS_PORT):
+        self.host = host
+        self.user = user
+        self.port = port
+        self.server_manager = ServerManager(host, user, server_port=port)
+        self.server_stats = ServerStats(host, port)
+        self.metrics = MetricsStore(METRICS_DB, METRICS_CAPACITY, METRICS_FLUSH_INTERVAL)
+        self.players = PlayerTracker(METRICS_DB, METRICS_FLUSH_INTERVAL)
+        # No desktop to notify on a headless host
+        self.alerts = AlertEngine(
+            build_rules(ALERT_RULES),
+            build_notifiers(webhook_url=ALERT_WEBHOOK_URL, file_path=ALERT_FILE)
+        )
+        self.poller = StatusPoller(
+            self.server_manager,
+            self.server_stats,
+            metrics=self.metrics,
+            fallback_interval=EVENT_FALLBACK_INTERVAL,
+            resource_interval=RESOURCE_INTERVAL,
+            collect_tps=COLLECT_TPS,
+            players=self.players,
+            player_list_interval=PLAYER_LIST_INTERVAL,
+            use_query=USE_QUERY,
+            alerts=self.alerts,
+            instance_interval=INSTANCE_INTERVAL
+        )
+        self.server_manager.lifecycle.on_state = (
+            lambda state: self.poller.results.put(("lifecycle", state))
+        )
+        self.supervisor = ConnectionSupervisor(
+            self.server_manager,
+            check_interval=HEALTH_CHECK_INTERVAL,
+            max_delay=RECONNECT_MAX_DELAY,
+            on_state=lambda state: self.poller.results.put(("connection", state))
+        )
+        self.backup_scheduler = None
+        if BACKUP_INTERVAL:
+            self.backup_scheduler = BackupScheduler(self.server_manager.backups, BACKUP_INTERVAL)
+        self.http = StatusHTTPServer(self, bind, http_port)
+
+        self.connected = False
+        self.snapshot = None
+        self.resources = None
+        self.instances = None
+        self.phase = None
+        self.lifecycle_state = None
+        self.error = None
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+
+    def connect(self, retries=3):
+        """Connect, prompting on the terminal only if needed; returns success
+
+        Keys, the SSH agent, an OpenSSH master connection, SSH_PASSWORD_ENV
+        and a password saved in the keyring are tried before prompting.
+        """
+        manager = self.server_manager
+        password = os.environ.get(SSH_PASSWORD_ENV)
+        if password:
+            if manager.connect(password):
+                return True
+            logger.error("Connection with the password from %s failed", SSH_PASSWORD_ENV)
+            return False
+        if connect_saved(manager):
+            return True
+
+        for attempt in range(retries):
+            password = getpass.getpass(f"Password for {self.user}@{self.host}: ")
+            if not password:
+                logger.error("Password is required")
+                return False
+
+            logger.info("Attempting connection (try %d/%d)", attempt + 1, retries)
+            if manager.connect(password):
+                if SAVE_PASSWORDS:
+                    save_password(self.host, self.user, password, manager.ssh_port)
+                return True
+        logger.error("Maximum connection attempts reached")
+        return False
+
+    def run(self):
+        """Connect, then poll and serve HTTP until interrupted"""
+        if not self.connect():
+            return 1
+        self.connected = True
+
+        signal.signal(signal.SIGTERM, lambda signum, frame: self.stop())
+        self.poller.start()
+        self.poller.enable_polling()
+        self.supervisor.start()
+        if self.backup_scheduler:
+            self.backup_scheduler.start()
+        self.http.start()
+        logger.info("Serving status on http://%s:%s/", self.http.address, self.http.port)
+
+        try:
+            while not self._stopped.is_set():
+                try:
+                    item = self.poller.results.get(timeout=1)
+                except queue.Empty:
+                    continue
+                try:
+                    self.process_result(item)
+                except Exception as e:
+                    logger.warning("Failed to process poller result: %s", e)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.shutdown()
+        return 0
+
+    def stop(self):
+        """Ask run() to return"""
+        self._stopped.set()
+
+    def shutdown(self):
+        """Stop polling and serving, and save pending metrics"""
+        self.http.stop()
+        self.supervisor.stop()
+        if self.backup_scheduler:
+            self.backup_scheduler.stop()
+        self.poller.stop()
+        self.alerts.close()
+        self.metrics.flush()
+        self.players.flush()
+
+    def process_result(self, item):
+        """Fold one poller result into the cached view"""
+        kind = item[0]
+        with self._lock:
+            if kind == "status":
+                snapshot = item[1]
+                self.snapshot = snapshot
+                self.phase = snapshot.get("phase")
+                self.error = None
+                if not snapshot["running"]:
+                    self.resources = None
+                elif snapshot.get("resources"):
+                    self.resources = snapshot["resources"]
+                if snapshot.get("instances") is not None:
+                    self.instances = snapshot["instances"]
+            elif kind == "event":
+                self.phase = item[2]
+            elif kind == "lifecycle":
+                state = item[1]
+                self.lifecycle_state = (
+                    state if state in ("SAVING", "STOPPING", "TERMINATING", "KILLING") else None
+                )
+            elif kind == "error":
+                self.error = str(item[1])
+            elif kind == "connection":
+                self.connected = item[1] == CONNECTED
+                if self.connected:
+                    self.poller.resume()
+
+    def status(self):
+        """Return the cached view as a JSON-ready dict"""
+        with self._lock:
+            snapshot = self.snapshot
+            view = {
+                "server": {"host": self.host, "port": self.port},
+                "connected": self.connected,
+                "updated": snapshot["time"] if snapshot else None,
+                "running": snapshot["running"] if snapshot else None,
+                "phase": self.phase,
+                "lifecycle": self.lifecycle_state,
+                "status": None,
+                "resources": self.resources,
+                "error": self.error,
+                "alerts": self.alerts.active(),
+            }
+        if snapshot and snapshot["status"] is not None:
+            view["status"] = describe_status(snapshot["status"])
+        return view
+
+    def current_values(self):
+        """Return (metric, value) pairs for the latest snapshot"""
+        with self._lock:
+            snapshot, resources = self.snapshot, self.resources
+        if snapshot is None:
+            return []
+        values = list(snapshot_values(dict(snapshot, resources=None)))
+        if resources:
+            values.extend(resource_values(resources))
+        return [(name, value) for name, value in values if value is not None]
+
+
+def describe_status(status):
+    """Convert an mcstatus status response to plain data"""
+    motd = status.motd.to_plain() if hasattr(status, "motd") else status.description
+    sample = getattr(status.players, "sample", None) or []
+    return {
+        "version": status.version.name,
+        "protocol": status.version.protocol,
+        "players": {
+            "online": status.players.online,
+            "max": status.players.max,
+            "sample": sorted(player.name for player in sample),
+        },
+        "latency_ms": round(status.latency, 1),
+        "motd": motd if isinstance(motd, str) else str(motd),
+    }
+
+
+def run(bind=HEADLESS_BIND, http_port=HEADLESS_PORT):
+    """Entry point for main.py --headless"""
+    return MonitorDaemon(bind=bind, http_port=http_port).run()
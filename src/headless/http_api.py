@@ -0,0 +1,192 @@
+# src/headless/http_api.py
+import json
+import logging
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+from src.telemetry import telemetry
+
+logger = logging.getLogger(__name__)
+
+METRIC_PREFIX = "minecraft_"
+
+# HELP text for the gauges exposed on /metrics
+METRIC_HELP = {
+    "running": "1 if the server process is running",
+    "latency_ms": "Server list ping latency in milliseconds",
+    "players_online": "Players currently online",
+    "players_max": "Player slots",
+    "host_load1": "One-minute load average of the host",
+    "process_cpu_percent": "CPU used by the server process, percent of one core",
+    "process_rss_mb": "Resident memory of the server process in MiB",
+    "heap_used_mb": "JVM heap in use in MiB",
+    "gc_time_s": "Total JVM garbage collection time in seconds",
+    "tps_1m": "Ticks per second over the last minute",
+    "mspt": "Average milliseconds per tick",
+}
+
+
+def format_prometheus(values, labels, updated=None):
+    """Render (metric, value) pairs in the Prometheus text exposition format"""
+    label_text = ",".join(
+        f'{key}="{_escape_label(str(value))}"' for key, value in sorted(labels.items())
+    )
+    lines = []
+    for name, value in values:
+        metric = METRIC_PREFIX + name
+        lines.append(f"# HELP {metric} {METRIC_HELP.get(name, name)}")
+        lines.append(f"# TYPE {metric} gauge")
+        lines.append(f"{metric}{{{label_text}}} {float(value)!r}")
+    if updated is not None:
+        metric = METRIC_PREFIX + "last_poll_timestamp_seconds"
+        lines.append(f"# HELP {metric} Time of the last completed status poll")
+        lines.append(f"# TYPE {metric} gauge")
+        lines.append(f"{metric}{{{label_text}}} {float(updated)!r}")
+    return "\n".join(lines) + "\n"
+
+
+def _escape_label(value):
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class StatusHandler(BaseHTTPRequestHandler):
+    """Read-only endpoints over the daemon's cached view.
+
+    /status   latest status, phase and resources as JSON
+    /metrics  latest values in the Prometheus text format
+    /history  in-memory samples of ?metric=NAME, optionally &since=UNIX_TIME
+    /players  who is online, top players and peak concurrency, optionally
+              &since=UNIX_TIME; ?player=NAME adds that player's playtime and
+              sessions, and &heatmap=1 adds average players by weekday/hour
+    /alerts   alert rules that are firing now
+    /backups  completed world backups, oldest first
+    /instances  every Java server on the host (pid, cwd, jar, port, heap)
+    /telemetry  span timings and retry/failure counters of the monitor itself
+    /healthz  200 while connected, 503 otherwise
+    """
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        daemon = self.server.monitor
+        try:
+            if url.path in ("/", "/status"):
+                self.send_json(daemon.status())
+            elif url.path == "/metrics":
+                status = daemon.status()
+                body = format_prometheus(
+                    daemon.current_values(),
+                    {"server": f"{daemon.host}:{daemon.port}"},
+                    status["updated"]
+                )
+                self.send_body(200, body, "text/plain; version=0.0.4; charset=utf-8")
+            elif url.path == "/history":
+                self.send_history(daemon, parse_qs(url.query))
+            elif url.path == "/players":
+                self.send_players(daemon.players, parse_qs(url.query))
+            elif url.path == "/alerts":
+                self.send_json({"alerts": daemon.alerts.active()})
+            elif url.path == "/backups":
+                self.send_json({"backups": [
+                    {key: value for key, value in manifest.items() if key != "files"}
+                    for manifest in daemon.server_manager.backups.history()
+                ]})
+            elif url.path == "/instances":
+                # Listed by the poller; null until the first scan finished
+                self.send_json({"instances": daemon.instances})
+            elif url.path == "/telemetry":
+                self.send_json(telemetry.snapshot())
+            elif url.path == "/healthz":
+                ok = daemon.connected
+                self.send_json({"ok": ok}, 200 if ok else 503)
+            else:
+                self.send_json({"error": "not found"}, 404)
+        except Exception as e:
+            logger.warning("HTTP request failed: %s", e)
+            self.send_json({"error": str(e)}, 500)
+
+    def send_history(self, daemon, query):
+        """Send the in-memory samples of one metric"""
+        metric = query.get("metric", [None])[0]
+        if metric is None:
+            self.send_json({"metrics": daemon.metrics.names()})
+            return
+        try:
+            since = float(query["since"][0]) if "since" in query else None
+        except ValueError:
+            self.send_json({"error": "since must be a UNIX timestamp"}, 400)
+            return
+        samples = daemon.metrics.samples(metric, since)
+        self.send_json({"metric": metric, "samples": samples})
+
+    def send_players(self, players, query):
+        """Send player analytics"""
+        try:
+            since = float(query["since"][0]) if "since" in query else None
+        except ValueError:
+            self.send_json({"error": "since must be a UNIX timestamp"}, 400)
+            return
+        peak = players.peak_concurrency(since)
+        data = {
+            "online": players.online(),
+            "top": [
+                {"player": name, "seconds": seconds, "sessions": sessions}
+                for name, seconds, sessions in players.top_players()
+            ],
+            "peak": {"players": peak[0], "hour": peak[1]} if peak else None,
+        }
+        player = query.get("player", [None])[0]
+        if player:
+            data["player"] = {
+                "name": player,
+                "seconds": players.playtime(player, since),
+                "sessions": players.sessions(player, since),
+            }
+        if query.get("heatmap", ["0"])[0] not in ("", "0"):
+            data["heatmap"] = players.heatmap(since)
+        self.send_json(data)
+
+    def send_json(self, data, code=200):
+        self.send_body(code, json.dumps(data), "application/json")
+
+    def send_body(self, code, body, content_type):
+        data = body.encode("utf-8")
+        self.send_response(code)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        # Scrapers poll every few seconds; keep the console for real events
+        pass
+
+
+class StatusHTTPServer:
+    """Serve a MonitorDaemon's cached view on a background thread"""
+
+    def __init__(self, monitor, address="127.0.0.1", port=9225):
+        self.monitor = monitor
+        self.address = address
+        self.port = port
+        self._httpd = None
+        self._thread = None
+
+    def start(self):
+        """Bind the socket and start serving"""
+        self._httpd = ThreadingHTTPServer((self.address, self.port), StatusHandler)
+        self._httpd.daemon_threads = True
+        self._httpd.monitor = self.monitor
+        self.port = self._httpd.server_address[1]
+        self._thread = threading.Thread(
+            target=self._httpd.serve_forever,
+            name="StatusHTTPServer",
+            daemon=True
+        )
+        self._thread.start()
+
+    def stop(self):
+        """Stop serving and close the socket"""
+        if self._httpd:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+            self._httpd = None
@@ -0,0 +1,648 @@
+import json
+import logging
+import shlex
+import threading
+import time
+from src.server.instances import OWNS_PROCESS_SOURCE
+from src.telemetry import count, span
+
+logger = logging.getLogger(__name__)
+
+# Helper run on the Minecraft host. It reads one JSON request per line
+# from stdin and writes one JSON response per line to stdout, tagged
+# with the request id. Each request runs on its own thread so a slow
+# command does not hold up the others sharing the channel. Streaming
+# ops (such as "watch") send any number of messages marked "stream"
+# before their final response, until cancelled. owns_process() is the
+# same matcher Instance.owns uses.
+AGENT_SCRIPT = OWNS_PROCESS_SOURCE + r'''
+import json, os, re, signal, socket, subprocess, sys, threading, time
+try:
+    from shlex import quote as shlex_quote
+except ImportError:
+    from pipes import quote as shlex_quote
+
+write_lock = threading.Lock()
+streams = {}
+
+def reply(message):
+    data = json.dumps(message) + "\n"
+    with write_lock:
+        sys.stdout.write(data)
+        sys.stdout.flush()
+
+def run_command(cmd, timeout=None):
+    # Own process group, so a timeout also kills what the shell started
+    proc = subprocess.Popen(cmd, shell=True, stdin=subprocess.DEVNULL,
+                            stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                            start_new_session=True)
+    timed_out = False
+    try:
+        out, err = proc.communicate(timeout=timeout)
+    except subprocess.TimeoutExpired:
+        os.killpg(proc.pid, signal.SIGKILL)
+        out, err = proc.communicate()
+        err += ("\nTimed out after %ss" % timeout).encode()
+        timed_out = True
+    return {
+        "rc": proc.returncode,
+        "timed_out": timed_out,
+        "stdout": out.decode("utf-8", "replace"),
+        "stderr": err.decode("utf-8", "replace"),
+    }
+
+def proc_cwd(pid):
+    try:
+        return os.readlink("/proc/%s/cwd" % pid)
+    except OSError:
+        return None
+
+def properties_port(cwd):
+    try:
+        with open(os.path.join(cwd, "server.properties")) as f:
+            for line in f:
+                if line.startswith("server-port="):
+                    return line.split("=", 1)[1].strip()
+    except (IOError, OSError):
+        pass
+    return None
+
+def java_procs():
+    """Every Java process with its working directory and arguments"""
+    found = []
+    for name in os.listdir("/proc"):
+        if not name.isdigit():
+            continue
+        try:
+            with open("/proc/%s/cmdline" % name, "rb") as f:
+                args = f.read().rstrip(b"\0").decode("utf-8", "replace").split("\0")
+        except (IOError, OSError):
+            continue
+        if os.path.basename(args[0]) != "java":
+            continue
+        cwd = proc_cwd(name)
+        found.append({
+            "pid": int(name),
+            "cwd": cwd,
+            "args": args,
+            "jar_dir": jar_dir(jar_of(args)),
+            "properties_port": properties_port(cwd) if cwd else None,
+        })
+    return found
+
+def jar_of(args):
+    if "-jar" in args[:-1]:
+        return args[args.index("-jar") + 1]
+    return None
+
+def jar_dir(path):
+    """Resolved directory of an absolute jar path, else None"""
+    if path and os.path.isabs(path):
+        return os.path.realpath(os.path.dirname(path))
+    return None
+
+def find_procs(directory, jar):
+    """Java processes of the server in directory running jar"""
+    directory = os.path.realpath(directory)
+    return [
+        proc for proc in java_procs()
+        if owns_process(directory, jar, jar_of(proc["args"]), proc["jar_dir"], proc["cwd"])
+    ]
+
+class LogFollower(object):
+    """Return lines appended to a file, following rotation"""
+
+    def __init__(self, path, from_start=False, offset=None):
+        self.path = path
+        self.inode = None
+        self.position = 0
+        self.partial = b""
+        self.from_start = from_start
+        self.offset = offset
+        self.checked = False
+
+    def read_lines(self):
+        # Only a file that already existed at the first check has old
+        # content to skip; one created later is read from the start
+        first_open = not self.checked
+        self.checked = True
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return []
+        if st.st_ino != self.inode or st.st_size < self.position:
+            # New or truncated file; skip existing content on first open
+            # unless asked to start at the beginning or a known offset
+            self.inode = st.st_ino
+            if first_open and self.offset is not None:
+                # An offset past the end belongs to a log rotated since
+                self.position = self.offset if self.offset <= st.st_size else 0
+            elif first_open and not self.from_start:
+                self.position = st.st_size
+            else:
+                self.position = 0
+            self.partial = b""
+        if st.st_size <= self.position:
+            return []
+        with open(self.path, "rb") as f:
+            f.seek(self.position)
+            data = f.read()
+        self.position += len(data)
+        lines = (self.partial + data).split(b"\n")
+        self.partial = lines.pop()
+        return [line.decode("utf-8", "replace").rstrip("\r") for line in lines]
+
+READY_RE = re.compile(r"Done \(([\d.]+)s\)!")
+
+def watch(request, cancel):
+    directory, jar = request["directory"], request["jar"]
+    interval = request.get("interval", 0.5)
+    scan_interval = request.get("scan_interval", 2.0)
+    log = LogFollower(request["log"]) if request.get("log") else None
+
+    def emit(event, **fields):
+        fields.update(id=request["id"], ok=True, stream=True, event=event)
+        reply(fields)
+
+    found = find_procs(directory, jar)
+    pid = found[0]["pid"] if found else None
+    last_scan = time.time()
+    emit("state", running=pid is not None, pid=pid)
+
+    while not cancel.wait(interval):
+        if pid is not None:
+            # Checking one /proc entry is far cheaper than a full scan
+            if not os.path.exists("/proc/%d" % pid):
+                emit("exited", pid=pid)
+                pid = None
+        elif time.time() - last_scan >= scan_interval:
+            last_scan = time.time()
+            found = find_procs(directory, jar)
+            if found:
+                pid = found[0]["pid"]
+                emit("launched", pid=pid)
+
+        for line in log.read_lines() if log else []:
+            match = READY_RE.search(line)
+            if match:
+                emit("ready", seconds=float(match.group(1)))
+            elif "Stopping server" in line:
+                emit("stopping")
+
+def last_lines(path, count, end, chunk=65536):
+    if count <= 0 or end <= 0:
+        return []
+    with open(path, "rb") as f:
+        start = max(0, end - chunk)
+        f.seek(start)
+        data = f.read(end - start)
+    lines = data.split(b"\n")
+    if start > 0:
+        lines = lines[1:]  # First line is probably partial
+    if lines and not lines[-1]:
+        lines.pop()
+    return [line.decode("utf-8", "replace").rstrip("\r") for line in lines[-count:]]
+
+def tail(request, cancel):
+    interval = request.get("interval", 0.2)
+    max_batch = request.get("max_batch", 1000)
+    log = LogFollower(request["log"])
+
+    def emit(lines, dropped=0):
+        reply({"id": request["id"], "ok": True, "stream": True, "lines": lines, "dropped": dropped})
+
+    log.read_lines()  # Positions the follower at the end of the file
+    try:
+        backlog = last_lines(log.path, request.get("backlog", 0), log.position)
+    except (IOError, OSError):
+        backlog = []
+    if backlog:
+        emit(backlog)
+
+    while not cancel.wait(interval):
+        lines = log.read_lines()
+        if not lines:
+            continue
+        # Keep each message bounded; the client only shows the newest lines
+        dropped = max(0, len(lines) - max_batch)
+        emit(lines[dropped:], dropped)
+
+cpu_samples = {}
+console_logs = {}
+TPS_RE = re.compile(r"TPS from last 1m, 5m, 15m: (.*)")
+MSPT_RE = re.compile(r"([\d.]+)/([\d.]+)/([\d.]+)")
+
+def host_stats():
+    with open("/proc/loadavg") as f:
+        load = [float(value) for value in f.read().split()[:3]]
+    memory = {}
+    with open("/proc/meminfo") as f:
+        for line in f:
+            key, _, value = line.partition(":")
+            if key in ("MemTotal", "MemAvailable"):
+                memory[key] = int(value.split()[0])
+    return {
+        "load": load,
+        "cpus": os.cpu_count(),
+        "mem_total_kb": memory.get("MemTotal"),
+        "mem_available_kb": memory.get("MemAvailable"),
+    }
+
+def process_stats(pid):
+    with open("/proc/%d/stat" % pid) as f:
+        # Skip "pid (comm)"; comm may contain spaces
+        fields = f.read().rsplit(")", 1)[1].split()
+    ticks = int(fields[11]) + int(fields[12])  # utime + stime
+    now = time.time()
+    cpu_percent = None
+    previous = cpu_samples.get(pid)
+    if previous and now > previous[1]:
+        seconds = (ticks - previous[0]) / float(os.sysconf("SC_CLK_TCK"))
+        cpu_percent = round(100.0 * seconds / (now - previous[1]), 1)
+    cpu_samples.clear()
+    cpu_samples[pid] = (ticks, now)
+
+    rss_kb = None
+    with open("/proc/%d/status" % pid) as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                rss_kb = int(line.split()[1])
+                break
+    return {"pid": pid, "cpu_percent": cpu_percent, "rss_kb": rss_kb, "threads": int(fields[17])}
+
+def jvm_stats(pid):
+    result = run_command("jstat -gc %d" % pid, timeout=5)
+    lines = result["stdout"].strip().split("\n")
+    if result["rc"] != 0 or len(lines) < 2:
+        raise ValueError(result["stderr"].strip() or "jstat returned no data")
+    gc = dict(zip(lines[0].split(), [float(value) for value in lines[1].split()]))
+    return {
+        "heap_used_kb": sum(gc.get(key, 0) for key in ("S0U", "S1U", "EU", "OU")),
+        "heap_capacity_kb": sum(gc.get(key, 0) for key in ("S0C", "S1C", "EC", "OC")),
+        "young_gc_count": int(gc.get("YGC", 0)),
+        "full_gc_count": int(gc.get("FGC", 0)),
+        "gc_time_s": gc.get("GCT"),
+    }
+
+def console_stats(screen, log_path, wait=1.5):
+    follower = console_logs.get(log_path)
+    if follower is None:
+        follower = console_logs[log_path] = LogFollower(log_path)
+    follower.read_lines()  # Skip output from before the request
+    run_command("screen -S %s -X stuff %s" % (shlex_quote(screen), shlex_quote("tps\nmspt\n")), timeout=5)
+
+    result = {}
+    expect_mspt = False
+    deadline = time.time() + wait
+    while time.time() < deadline and not ("tps_1m" in result and "mspt" in result):
+        time.sleep(0.1)
+        for line in follower.read_lines():
+            match = TPS_RE.search(line)
+            if match:
+                values = [float(v) for v in re.findall(r"\d+(?:\.\d+)?", match.group(1))]
+                result.update(zip(("tps_1m", "tps_5m", "tps_15m"), values))
+            elif "Server tick times" in line:
+                expect_mspt = True
+            elif expect_mspt:
+                match = MSPT_RE.search(line)
+                if match:
+                    result["mspt"] = float(match.group(1))
+                expect_mspt = False
+    return result or None
+
+def resources(request):
+    result = {"host": host_stats(), "process": None, "jvm": None, "tps": None, "errors": {}}
+    found = find_procs(request["directory"], request["jar"])
+    if not found:
+        return result
+    pid = found[0]["pid"]
+
+    def collect(key, func, *args):
+        try:
+            result[key] = func(*args)
+        except Exception as e:
+            result["errors"][key] = str(e)
+
+    # jstat starts a JVM, so run it while waiting on the console
+    jstat = threading.Thread(target=collect, args=("jvm", jvm_stats, pid))
+    jstat.start()
+    collect("process", process_stats, pid)
+    if request.get("screen") and request.get("log"):
+        collect("tps", console_stats, request["screen"], request["log"])
+    jstat.join()
+    return result
+
+def port_open(port):
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.settimeout(0.5)
+    try:
+        return sock.connect_ex(("127.0.0.1", port)) == 0
+    finally:
+        sock.close()
+
+def log_size(path):
+    try:
+        return os.stat(path).st_size
+    except OSError:
+        return 0
+
+def wait_for(request):
+    """Block until the process exits, a log line matches or the port closes"""
+    deadline = time.time() + request.get("wait", 30)
+    pid = request.get("pid")
+    port_closed = request.get("port_closed")
+    log = regex = None
+    if request.get("log") and request.get("log_pattern"):
+        log = LogFollower(request["log"], offset=request.get("log_offset"))
+        regex = re.compile(request["log_pattern"])
+
+    while True:
+        if pid is not None and not os.path.exists("/proc/%d" % pid):
+            return {"met": "exit"}
+        for line in log.read_lines() if log else []:
+            if regex.search(line):
+                return {"met": "log", "line": line}
+        if port_closed and not port_open(port_closed):
+            return {"met": "port_closed"}
+        if time.time() >= deadline:
+            return {"met": None}
+        time.sleep(0.2)
+
+STREAM_OPS = {"watch": watch, "tail": tail}
+
+def handle(request):
+    op = request.get("op")
+    try:
+        if op == "ping":
+            response = {}
+        elif op == "exec":
+            response = run_command(request["cmd"], request.get("timeout"))
+        elif op == "procs":
+            response = {"procs": find_procs(request["directory"], request["jar"])}
+        elif op == "java":
+            response = {"procs": java_procs()}
+        elif op == "resources":
+            response = resources(request)
+        elif op == "wait":
+            response = wait_for(request)
+        elif op == "logpos":
+            response = {"size": log_size(request["log"])}
+        elif op == "cancel":
+            cancel = streams.get(request["target"])
+            if cancel:
+                cancel.set()
+            response = {}
+        elif op in STREAM_OPS:
+            cancel = threading.Event()
+            streams[request.get("id")] = cancel
+            try:
+                STREAM_OPS[op](request, cancel)
+            finally:
+                streams.pop(request.get("id"), None)
+            response = {}
+        else:
+            raise ValueError("unknown op %r" % op)
+        response["ok"] = True
+    except Exception as e:
+        response = {"ok": False, "error": str(e)}
+    response["id"] = request.get("id")
+    reply(response)
+
+while True:
+    line = sys.stdin.readline()
+    if not line:
+        break
+    line = line.strip()
+    if not line:
+        continue
+    try:
+        request = json.loads(line)
+    except ValueError:
+        reply({"id": None, "ok": False, "error": "malformed request"})
+        continue
+    thread = threading.Thread(target=handle, args=(request,))
+    thread.daemon = True
+    thread.start()
+'''
+
+
+class AgentError(Exception):
+    """Raised when the remote agent is unavailable or a request fails"""
+
+
+class RemoteAgent:
+    """Long-lived helper process on the server, driven over one SSH channel.
+
+    Requests are newline-delimited JSON objects tagged with an id. The
+    agent answers each with a single JSON line carrying the same id, so
+    several callers can share the channel at once. Streaming requests
+    made with subscribe() deliver their messages to a callback instead.
+
+    The channel is normally opened on the paramiko transport of ``ssh``.
+    start() also accepts a ready channel-like object, such as an ``ssh``
+    subprocess running over an OpenSSH master connection.
+    """
+
+    def __init__(self, ssh=None, python="python3"):
+        self.ssh = ssh
+        self.python = python
+        self.channel = None
+        self._next_id = 1
+        self._pending = {}
+        self._streams = {}
+        self._lock = threading.Lock()
+        self._send_lock = threading.Lock()
+        self._reader = None
+
+    def command(self):
+        """Remote shell command that runs the agent"""
+        return f"{self.python} -u -c {shlex.quote(AGENT_SCRIPT)}"
+
+    def start(self, timeout=10, channel=None):
+        """Launch the agent on the server and wait for it to answer
+
+        channel: already running agent channel to use instead of opening
+        one on the SSH transport
+        """
+        if channel is None:
+            transport = self.ssh.get_transport() if self.ssh else None
+            if not transport or not transport.is_active():
+                raise AgentError("SSH transport is not active")
+            channel = transport.open_session()
+            channel.exec_command(self.command())
+        self.channel = channel
+
+        self._reader = threading.Thread(
+            target=self._read_loop,
+            name="RemoteAgentReader",
+            daemon=True
+        )
+        self._reader.start()
+        self.call("ping", timeout=timeout)
+
+    @property
+    def alive(self):
+        """True while the agent channel is open"""
+        return (
+            self.channel is not None
+            and not self.channel.closed
+            and not self.channel.exit_status_ready()
+        )
+
+    def call(self, op, timeout=10, **params):
+        """Send one request and wait for its response"""
+        if not self.alive:
+            raise AgentError("Remote agent is not running")
+
+        slot = {"done": threading.Event(), "response": None}
+        with self._lock:
+            request_id = self._new_id()
+            self._pending[request_id] = slot
+
+        try:
+            with span("agent.call", op=op):
+                self._send(request_id, op, params)
+                slot["done"].wait(timeout)
+                return self._response(op, slot)
+        finally:
+            with self._lock:
+                self._pending.pop(request_id, None)
+
+    def call_many(self, requests, timeout=10):
+        """Send several requests at once and wait for all of them.
+
+        requests is a list of (op, params) pairs. The agent handles each
+        on its own thread, so the batch takes as long as its slowest
+        request and timeout applies to the whole batch. Returns the
+        responses in order, with an AgentError in place of any request
+        that failed or timed out.
+        """
+        if not self.alive:
+            raise AgentError("Remote agent is not running")
+
+        slots = []
+        with self._lock:
+            for _ in requests:
+                request_id = self._new_id()
+                slot = {"done": threading.Event(), "response": None}
+                self._pending[request_id] = slot
+                slots.append((request_id, slot))
+
+        try:
+            with span("agent.call_many", requests=len(requests)):
+                for (request_id, _), (op, params) in zip(slots, requests):
+                    self._send(request_id, op, dict(params))
+                deadline = time.monotonic() + timeout
+                for _, slot in slots:
+                    slot["done"].wait(max(0, deadline - time.monotonic()))
+        finally:
+            with self._lock:
+                for request_id, _ in slots:
+                    self._pending.pop(request_id, None)
+
+        responses = []
+        for (op, _), (_, slot) in zip(requests, slots):
+            try:
+                responses.append(self._response(op, slot))
+            except AgentError as e:
+                responses.append(e)
+        return responses
+
+    def subscribe(self, op, callback, **params):
+        """Start a streaming request and return its id.
+
+        callback receives every message the agent streams for it, and
+        None if the channel closes. It runs on the reader thread, so it
+        must not block.
+        """
+        if not self.alive:
+            raise AgentError("Remote agent is not running")
+
+        with self._lock:
+            request_id = self._new_id()
+            self._streams[request_id] = callback
+        try:
+            self._send(request_id, op, params)
+        except Exception:
+            with self._lock:
+                self._streams.pop(request_id, None)
+            raise
+        return request_id
+
+    def unsubscribe(self, request_id):
+        """Cancel a streaming request"""
+        with self._lock:
+            callback = self._streams.pop(request_id, None)
+        if callback and self.alive:
+            self.call("cancel", target=request_id)
+
+    def close(self):
+        """Close the agent channel, which ends the remote process"""
+        if self.channel:
+            self.channel.close()
+
+    def _response(self, op, slot):
+        if not slot["done"].is_set():
+            count("agent.timeouts")
+            raise AgentError(f"Remote agent timed out on {op!r}")
+        response = slot["response"]
+        if response is None:
+            raise AgentError("Remote agent channel closed")
+        if not response.get("ok"):
+            raise AgentError(response.get("error", "Unknown agent error"))
+        return response
+
+    def _new_id(self):
+        # Callers hold self._lock
+        request_id = self._next_id
+        self._next_id += 1
+        return request_id
+
+    def _send(self, request_id, op, params):
+        params.update(id=request_id, op=op)
+        data = (json.dumps(params) + "\n").encode()
+        with self._send_lock:
+            self.channel.sendall(data)
+
+    def _read_loop(self):
+        try:
+            for line in self.channel.makefile("rb"):
+                self._dispatch(line)
+        except Exception as e:
+            logger.warning("Remote agent read error: %s", e)
+        finally:
+            # Wake any callers still waiting; they will see no response
+            with self._lock:
+                pending = list(self._pending.values())
+                streams = list(self._streams.values())
+                self._streams.clear()
+            for slot in pending:
+                slot["done"].set()
+            for callback in streams:
+                self._notify(callback, None)
+
+    def _dispatch(self, line):
+        try:
+            message = json.loads(line)
+        except ValueError:
+            logger.warning("Remote agent sent malformed data: %r", line[:200])
+            return
+
+        request_id = message.get("id")
+        with self._lock:
+            slot = self._pending.get(request_id)
+            callback = self._streams.get(request_id)
+            if callback and not message.get("stream"):
+                # Final response: the stream has ended
+                self._streams.pop(request_id, None)
+        if slot:
+            slot["response"] = message
+            slot["done"].set()
+        elif callback:
+            self._notify(callback, message)
+
+    def _notify(self, callback, message):
+        try:
+            callback(message)
+        except Exception as e:
+            logger.warning("Remote agent stream callback error: %s", e)
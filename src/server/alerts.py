@@ -0,0 +1,538 @@
+import bisect
+import importlib.util
+import json
+import logging
+import math
+import operator
+import os
+import queue
+import shutil
+import subprocess
+import sys
+import threading
+import time
+from collections import Counter, deque
+from src.server.metrics import snapshot_values
+
+logger = logging.getLogger(__name__)
+
+FIRING = "FIRING"
+RESOLVED = "RESOLVED"
+
+OPERATORS = {">": operator.gt, ">=": operator.ge, "<": operator.lt, "<=": operator.le}
+
+# Percentile buckets grow by 5%, so a percentile is off by at most ~2.5%
+BUCKET_GROWTH = 1.05
+_LOG_GROWTH = math.log(BUCKET_GROWTH)
+
+
+class SlidingWindow:
+    """Aggregates over the samples of the last ``seconds`` seconds.
+
+    Every sample is added and evicted once, and the aggregates are kept
+    up to date as that happens: a running sum for the mean, monotonic
+    deques for min and max, and a log-bucket histogram for percentiles
+    whose occupied buckets are kept in sorted order. Nothing ever
+    rescans the window.
+    """
+
+    def __init__(self, seconds):
+        self.seconds = seconds
+        self.samples = deque()
+        self.total = 0.0
+        self._maxima = deque()
+        self._minima = deque()
+        self._buckets = Counter()
+        self._keys = []
+
+    def __len__(self):
+        return len(self.samples)
+
+    def add(self, timestamp, value):
+        """Add a sample and drop those that fell out of the window"""
+        self.samples.append((timestamp, value))
+        self.total += value
+        bucket = self._bucket(value)
+        if not self._buckets[bucket]:
+            bisect.insort(self._keys, bucket)
+        self._buckets[bucket] += 1
+        while self._maxima and self._maxima[-1] < value:
+            self._maxima.pop()
+        self._maxima.append(value)
+        while self._minima and self._minima[-1] > value:
+            self._minima.pop()
+        self._minima.append(value)
+        self.expire(timestamp)
+
+    def expire(self, now):
+        """Drop samples older than the window
+
+        A zero-second window keeps only the newest sample added.
+        """
+        while self.samples and self.samples[0][0] < now - self.seconds:
+            _, value = self.samples.popleft()
+            self.total -= value
+            bucket = self._bucket(value)
+            self._buckets[bucket] -= 1
+            if not self._buckets[bucket]:
+                del self._buckets[bucket]
+                del self._keys[bisect.bisect_left(self._keys, bucket)]
+            if self._maxima[0] == value:
+                self._maxima.popleft()
+            if self._minima[0] == value:
+                self._minima.popleft()
+
+    def clear(self):
+        """Drop every sample"""
+        self.samples.clear()
+        self.total = 0.0
+        self._maxima.clear()
+        self._minima.clear()
+        self._buckets.clear()
+        self._keys.clear()
+
+    def last(self):
+        return self.samples[-1][1]
+
+    def mean(self):
+        return self.total / len(self.samples)
+
+    def max(self):
+        return self._maxima[0]
+
+    def min(self):
+        return self._minima[0]
+
+    def rate(self):
+        """Change per second between the oldest and newest sample, or None"""
+        (first_time, first), (last_time, last) = self.samples[0], self.samples[-1]
+        if last_time <= first_time:
+            return None
+        return (last - first) / (last_time - first_time)
+
+    def percentile(self, fraction):
+        """Approximate percentile; values at or below zero share one bucket
+
+        Costs one pass over the occupied buckets, which is bounded by the
+        spread of the values and not by the number of samples.
+        """
+        rank = fraction * (len(self.samples) - 1)
+        seen = 0
+        for bucket in self._keys:
+            seen += self._buckets[bucket]
+            if seen > rank:
+                return 0.0 if bucket == -math.inf else BUCKET_GROWTH ** (bucket + 0.5)
+        return self.max()
+
+    def aggregate(self, name):
+        """Return "last", "mean", "min", "max", "rate" or "pNN" (such as "p95")"""
+        if name.startswith("p") and name[1:].isdigit():
+            return self.percentile(int(name[1:]) / 100)
+        return getattr(self, name)()
+
+    @staticmethod
+    def _bucket(value):
+        # Values <= 0 share a bucket that sorts before every other
+        if value <= 0:
+            return -math.inf
+        return math.floor(math.log(value) / _LOG_GROWTH)
+
+
+class Rule:
+    """Base class for alert rules.
+
+    ``for_seconds``: the condition must hold this long before the alert fires.
+    ``repeat``: seconds between repeated notifications while firing, or None.
+    ``quiet_during``: LifecycleController states in which the condition is
+    ignored, such as while the monitor itself stops the server.
+    """
+
+    kind = None
+
+    def __init__(self, name, metric, for_seconds=0, severity="warning", repeat=None,
+                 quiet_during=()):
+        self.name = name
+        self.metric = metric
+        self.for_seconds = for_seconds
+        self.severity = severity
+        self.repeat = repeat
+        self.quiet_during = frozenset(quiet_during)
+
+    def observe(self, timestamp, value):
+        """Feed one sample of ``metric``"""
+
+    def expire(self, now):
+        """Forget samples too old to describe the present"""
+
+    def condition(self, now, latest, firing):
+        """Return (breached, value): True, False or None when unknown
+
+        latest: {metric: (timestamp, value)} for comparisons with other metrics
+        firing: whether the alert is firing, for hysteresis
+        """
+        raise NotImplementedError
+
+    def describe(self, value):
+        return f"{self.name}: {self.metric} = {_format(value)}"
+
+
+class ThresholdRule(Rule):
+    """Fires when an aggregate of the window crosses a threshold.
+
+    threshold: a number, or the name of another metric to compare with
+    (such as players_max)
+    clear: once firing, the alert resolves only when the aggregate no
+    longer crosses this value; defaults to the threshold
+    stale_after: with no window, seconds after which the last sample no
+    longer counts. Once every sample has expired, a firing alert resolves.
+    """
+
+    kind = "threshold"
+
+    def __init__(self, name, metric, op, threshold, window=0, aggregate="last",
+                 clear=None, min_samples=1, stale_after=60, **options):
+        super().__init__(name, metric, **options)
+        self.op = op
+        self.compare = OPERATORS[op]
+        self.threshold = threshold
+        self.clear = threshold if clear is None else clear
+        self.aggregate = aggregate
+        self.min_samples = min_samples
+        self.stale_after = stale_after
+        self.window = SlidingWindow(window)
+
+    def observe(self, timestamp, value):
+        self.window.add(timestamp, value)
+
+    def expire(self, now):
+        if self.window.seconds:
+            self.window.expire(now)
+        elif self.window and self.window.samples[-1][0] < now - self.stale_after:
+            self.window.clear()
+
+    def condition(self, now, latest, firing):
+        if not self.window:
+            # The metric stopped arriving (e.g. the server was stopped)
+            return (False if firing else None), None
+        if len(self.window) < self.min_samples:
+            return None, None
+        value = self.window.aggregate(self.aggregate)
+        limit = self._resolve(self.clear if firing else self.threshold, latest)
+        if value is None or limit is None:
+            return None, value
+        return self.compare(value, limit), value
+
+    def describe(self, value):
+        label = self.metric if self.aggregate == "last" else f"{self.aggregate}({self.metric})"
+        return f"{self.name}: {label} = {_format(value)} {self.op} {self.threshold}"
+
+    @staticmethod
+    def _resolve(limit, latest):
+        if isinstance(limit, str):
+            sample = latest.get(limit)
+            return sample[1] if sample else None
+        return limit
+
+
+class RateRule(ThresholdRule):
+    """Fires when a metric changes faster than ``threshold`` per second"""
+
+    kind = "rate"
+
+    def __init__(self, name, metric, op, threshold, window=60, **options):
+        options.setdefault("min_samples", 2)
+        super().__init__(name, metric, op, threshold, window=window, aggregate="rate", **options)
+
+    def describe(self, value):
+        return f"{self.name}: {self.metric} changing {_format(value)}/s {self.op} {self.threshold}/s"
+
+
+class AbsenceRule(Rule):
+    """Fires when no sample of ``metric`` arrived for ``timeout`` seconds"""
+
+    kind = "absence"
+
+    def __init__(self, name, metric, timeout, **options):
+        super().__init__(name, metric, **options)
+        self.timeout = timeout
+        self.last_seen = None
+
+    def observe(self, timestamp, value):
+        self.last_seen = timestamp
+
+    def condition(self, now, latest, firing):
+        if self.last_seen is None:
+            # Count from the first evaluation, so a metric never seen still alerts
+            self.last_seen = now
+        silence = now - self.last_seen
+        return silence >= self.timeout, silence
+
+    def describe(self, value):
+        return f"{self.name}: no {self.metric} for {value:.0f}s"
+
+
+RULE_TYPES = {rule.kind: rule for rule in (ThresholdRule, RateRule, AbsenceRule)}
+
+
+def build_rules(entries):
+    """Create rules from config dicts such as those in ALERT_RULES
+
+    Each dict has "type" (threshold, rate or absence), "name", "metric"
+    and the keyword arguments of that rule class; "for" is accepted for
+    ``for_seconds``.
+    """
+    rules = []
+    for entry in entries:
+        options = dict(entry)
+        rule_type = RULE_TYPES[options.pop("type")]
+        if "for" in options:
+            options["for_seconds"] = options.pop("for")
+        rules.append(rule_type(**options))
+    return rules
+
+
+class Alert:
+    """One notification: a rule that started firing or resolved"""
+
+    def __init__(self, rule, state, value, timestamp, since):
+        self.rule = rule.name
+        self.severity = rule.severity
+        self.state = state
+        self.value = value
+        self.time = timestamp
+        self.since = since
+        self.message = rule.describe(value) if state == FIRING else f"{rule.name}: resolved"
+
+    def as_dict(self):
+        return {
+            "rule": self.rule,
+            "severity": self.severity,
+            "state": self.state,
+            "value": self.value,
+            "time": self.time,
+            "since": self.since,
+            "message": self.message,
+        }
+
+
+class _RuleState:
+    def __init__(self):
+        self.pending_since = None
+        self.firing_since = None
+        self.notified = None
+        self.value = None
+
+
+class AlertEngine:
+    """Evaluate alert rules as samples arrive.
+
+    observe() hands each sample only to the rules watching its metric,
+    and each rule updates its own sliding window in O(1). check() runs
+    every rule's state machine after expiring samples older than its
+    window, so a metric that stops arriving cannot keep an alert firing.
+    A breach must last ``for_seconds`` before the alert fires, and a
+    firing alert notifies once (or every ``repeat`` seconds) until its
+    condition clears. ThresholdRule's
+    ``clear`` value adds hysteresis so a value hovering at the threshold
+    does not flap.
+
+    Notifiers are called on a background thread, so a slow webhook never
+    holds up polling.
+    """
+
+    def __init__(self, rules, notifiers=()):
+        self.rules = list(rules)
+        self.notifiers = list(notifiers)
+        self._by_metric = {}
+        for rule in self.rules:
+            self._by_metric.setdefault(rule.metric, []).append(rule)
+        self._states = {rule.name: _RuleState() for rule in self.rules}
+        self._latest = {}
+        self.lifecycle = None
+        self._lock = threading.Lock()
+        self._outbox = queue.Queue()
+        self._thread = threading.Thread(target=self._deliver, name="AlertNotifier", daemon=True)
+        self._thread.start()
+
+    def observe(self, metric, value, timestamp=None):
+        """Feed one sample"""
+        timestamp = time.time() if timestamp is None else timestamp
+        with self._lock:
+            self._latest[metric] = (timestamp, value)
+            for rule in self._by_metric.get(metric, ()):
+                rule.observe(timestamp, value)
+
+    def observe_snapshot(self, snapshot, prefix=""):
+        """Feed the metrics of a poller snapshot, then evaluate every rule"""
+        with self._lock:
+            self.lifecycle = snapshot.get("lifecycle")
+        for name, value in snapshot_values(snapshot, prefix):
+            self.observe(name, value, snapshot["time"])
+        self.check(snapshot["time"])
+
+    def check(self, now=None):
+        """Evaluate every rule and send notifications for state changes"""
+        now = time.time() if now is None else now
+        alerts = []
+        with self._lock:
+            for rule in self.rules:
+                rule.expire(now)
+                alert = self._evaluate(rule, self._states[rule.name], now)
+                if alert:
+                    alerts.append(alert)
+        for alert in alerts:
+            logger.warning("Alert %s: %s", alert.state.lower(), alert.message)
+            self._outbox.put(alert)
+
+    def active(self):
+        """Return the firing alerts as dicts"""
+        with self._lock:
+            return [
+                {"rule": rule.name, "severity": rule.severity, "since": state.firing_since,
+                 "value": state.value, "message": rule.describe(state.value)}
+                for rule in self.rules
+                for state in (self._states[rule.name],)
+                if state.firing_since is not None
+            ]
+
+    def close(self):
+        """Stop the notifier thread once queued alerts are delivered"""
+        self._outbox.put(None)
+
+    def _evaluate(self, rule, state, now):
+        firing = state.firing_since is not None
+        breached, value = rule.condition(now, self._latest, firing)
+        if breached and self.lifecycle in rule.quiet_during:
+            # Expected while the server is being stopped or started on purpose
+            breached = False
+        if breached is None:
+            return None
+        state.value = value
+
+        if not breached:
+            state.pending_since = None
+            if firing:
+                since, state.firing_since = state.firing_since, None
+                return Alert(rule, RESOLVED, value, now, since)
+            return None
+
+        if state.pending_since is None:
+            state.pending_since = now
+        if not firing:
+            if now - state.pending_since < rule.for_seconds:
+                return None
+            state.firing_since = state.notified = now
+            return Alert(rule, FIRING, value, now, state.pending_since)
+        if rule.repeat and now - state.notified >= rule.repeat:
+            state.notified = now
+            return Alert(rule, FIRING, value, now, state.firing_since)
+        return None
+
+    def _deliver(self):
+        while True:
+            alert = self._outbox.get()
+            if alert is None:
+                return
+            for notifier in self.notifiers:
+                try:
+                    notifier.notify(alert)
+                except Exception as e:
+                    logger.warning("%s failed: %s", type(notifier).__name__, e)
+
+
+class FileNotifier:
+    """Append every alert as a JSON line to a local file"""
+
+    def __init__(self, path):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+
+    def notify(self, alert):
+        with open(self.path, "a") as output:
+            output.write(json.dumps(alert.as_dict()) + "\n")
+
+
+class WebhookNotifier:
+    """POST every alert as JSON to a URL (Slack/Discord-style ``text`` included)"""
+
+    def __init__(self, url, timeout=5):
+        self.url = url
+        self.timeout = timeout
+
+    def notify(self, alert):
+        import urllib.request
+        body = dict(alert.as_dict(), text=f"[{alert.state}] {alert.message}")
+        request = urllib.request.Request(
+            self.url,
+            data=json.dumps(body).encode("utf-8"),
+            headers={"Content-Type": "application/json"},
+            method="POST"
+        )
+        with urllib.request.urlopen(request, timeout=self.timeout) as response:
+            response.read()
+
+
+class DesktopNotifier:
+    """Show alerts as desktop notifications.
+
+    Uses plyer when installed, otherwise notify-send on Linux or
+    osascript on macOS.
+    """
+
+    def __init__(self, title="Minecraft Monitor"):
+        self.title = title
+
+    @staticmethod
+    def available():
+        """True if plyer, osascript or notify-send can show notifications"""
+        if importlib.util.find_spec("plyer"):
+            return True
+        return sys.platform == "darwin" or shutil.which("notify-send") is not None
+
+    def notify(self, alert):
+        heading = f"{self.title}: {alert.rule} {alert.state.lower()}"
+        try:
+            from plyer import notification
+        except ImportError:
+            # Optional: fall back to notify-send or osascript
+            notification = None
+        if notification is not None:
+            notification.notify(title=heading, message=alert.message, app_name=self.title)
+        elif sys.platform == "darwin":
+            script = f"display notification {json.dumps(alert.message)} with title {json.dumps(heading)}"
+            subprocess.run(["osascript", "-e", script], check=True, timeout=10)
+        elif shutil.which("notify-send"):
+            subprocess.run(["notify-send", heading, alert.message], check=True, timeout=10)
+        else:
+            raise RuntimeError("no desktop notification tool (install plyer)")
+
+
+class CallbackNotifier:
+    """Pass every alert to a function, e.g. to post it to the GUI queue"""
+
+    def __init__(self, callback):
+        self.callback = callback
+
+    def notify(self, alert):
+        self.callback(alert)
+
+
+def build_notifiers(desktop=False, webhook_url=None, file_path=None):
+    """Create the notifiers enabled in the config"""
+    notifiers = []
+    if desktop:
+        if DesktopNotifier.available():
+            notifiers.append(DesktopNotifier())
+        else:
+            logger.warning("Desktop alerts disabled: install plyer to enable them")
+    if webhook_url:
+        notifiers.append(WebhookNotifier(webhook_url))
+    if file_path:
+        notifiers.append(FileNotifier(file_path))
+    return notifiers
+
+
+def _format(value):
+    return "--" if value is None else f"{value:.4g}"
@@ -0,0 +1,351 @@
+import json
+import logging
+import os
+import posixpath
+import shlex
+import tarfile
+import threading
+import time
+from src.telemetry import span
+from src.config import (BACKUP_DIR, BACKUP_PATHS, BACKUP_STAGING, BACKUP_FULL_EVERY,
+                        BACKUP_KEEP_FULL, BACKUP_COMPRESS_LEVEL)
+
+logger = logging.getLogger(__name__)
+
+FULL = "full"
+INCREMENTAL = "incremental"
+
+
+class BackupError(Exception):
+    pass
+
+
+class BackupManager:
+    """Full and incremental world backups pulled over SSH.
+
+    A backup runs in three steps:
+
+    1. Stage: rsync the world folders into a staging copy on the host
+       while the server keeps running, then ``save-off``, a confirmed
+       ``save-all flush`` and a second rsync that only copies what
+       changed in between, then ``save-on``. Saving is paused for
+       seconds, not for the transfer.
+    2. Compare: list the staged files (size and mtime) and compare them
+       with the last backup's manifest. Files whose mtime changed are
+       hashed on the host, and those with unchanged content are skipped.
+    3. Stream: tar and gzip the changed files on the host and write the
+       archive here chunk by chunk, so memory use does not grow with the
+       world.
+
+    Every ``full_every``-th backup is full. The ``keep_full`` newest full
+    backups are kept, with the incrementals built on them. A transfer
+    that fails leaves no manifest, so the next backup sends its changes
+    again.
+    """
+
+    def __init__(self, server_manager, directory=BACKUP_DIR, paths=BACKUP_PATHS,
+                 staging=BACKUP_STAGING, full_every=BACKUP_FULL_EVERY, keep_full=BACKUP_KEEP_FULL,
+                 compress_level=BACKUP_COMPRESS_LEVEL):
+        self.server_manager = server_manager
+        instance = server_manager.instance
+        self.directory = os.path.join(directory, server_manager.host, instance.name)
+        self.paths = list(paths)
+        # Relative paths are inside the server directory
+        self.staging = posixpath.join(instance.directory, staging)
+        self.full_every = full_every
+        self.keep_full = keep_full
+        self.compress_level = compress_level
+        self._lock = threading.Lock()
+
+    def backup(self, full=False):
+        """Run one backup (blocking); returns (stdout, stderr) like the server actions"""
+        if not self._lock.acquire(blocking=False):
+            return "", "A backup is already running"
+        try:
+            with span("backup.run"):
+                return self._backup(full), ""
+        except Exception as e:
+            logger.warning("Backup failed: %s", e)
+            return "", f"Backup failed: {str(e)}"
+        finally:
+            self._lock.release()
+
+    def history(self):
+        """Return the manifests of completed backups, oldest first"""
+        if not os.path.isdir(self.directory):
+            return []
+        manifests = []
+        for name in sorted(os.listdir(self.directory)):
+            if name.endswith(".json"):
+                with open(os.path.join(self.directory, name)) as source:
+                    manifests.append(json.load(source))
+        return manifests
+
+    def restore(self, target, backup_id=None):
+        """Rebuild the worlds of a backup (default: the latest) under target
+
+        Extracts the full backup and every incremental after it up to
+        backup_id, removing the files they record as deleted. Returns the
+        number of archives applied.
+        """
+        manifests = self.history()
+        if backup_id is not None:
+            manifests = [manifest for manifest in manifests if manifest["id"] <= backup_id]
+        fulls = [index for index, manifest in enumerate(manifests) if manifest["type"] == FULL]
+        if not fulls:
+            raise BackupError("No full backup to restore from")
+        chain = manifests[fulls[-1]:]
+
+        os.makedirs(target, exist_ok=True)
+        for manifest in chain:
+            if manifest["archive"]:
+                with tarfile.open(os.path.join(self.directory, manifest["archive"]), "r|gz") as archive:
+                    if hasattr(tarfile, "data_filter"):
+                        archive.extractall(target, filter="data")
+                    else:
+                        archive.extractall(target)
+            for path in manifest["deleted"]:
+                try:
+                    os.remove(os.path.join(target, path))
+                except FileNotFoundError:
+                    pass
+        return len(chain)
+
+    def _backup(self, full):
+        started = time.monotonic()
+        history = self.history()
+        base = None if full or self._full_due(history) else history[-1]
+        tools = self._tools()
+
+        paused = self._stage(tools)
+        files = self._list_files()
+        changed, deleted, entries = self._compare(files, base, tools)
+
+        backup_id = time.strftime("%Y%m%d-%H%M%S")
+        kind = INCREMENTAL if base else FULL
+        archive, size = None, 0
+        if changed:
+            archive = f"{backup_id}-{kind}.tar.gz"
+            size = self._stream(changed, os.path.join(self.directory, archive), tools)
+
+        manifest = {
+            "id": backup_id,
+            "time": time.time(),
+            "type": kind,
+            "base": base["id"] if base else None,
+            "archive": archive,
+            "bytes": size,
+            "changed": len(changed),
+            "deleted": deleted,
+            "paused_s": round(paused, 2),
+            "files": entries,
+        }
+        path = os.path.join(self.directory, f"{backup_id}.json")
+        with open(path + ".part", "w") as output:
+            json.dump(manifest, output)
+        os.replace(path + ".part", path)
+        self._apply_retention()
+
+        message = (f"{kind.capitalize()} backup {backup_id}: {len(changed)} changed files, "
+                   f"{size / 1048576:.1f} MiB in {time.monotonic() - started:.1f}s "
+                   f"(saving paused {paused:.1f}s)")
+        logger.info(message)
+        return message
+
+    def _full_due(self, history):
+        if not history:
+            return True
+        since_full = 0
+        for manifest in reversed(history):
+            if manifest["type"] == FULL:
+                break
+            since_full += 1
+        return since_full + 1 >= self.full_every
+
+    def _tools(self):
+        _, stdout, _ = self._run("command -v rsync pigz sha256sum || true")
+        return {os.path.basename(line.strip()) for line in stdout.splitlines() if line.strip()}
+
+    def _stage(self, tools):
+        """Copy the worlds to the staging folder; returns seconds saving was paused"""
+        # First pass while the server runs; errors from files changing
+        # under rsync do not matter, the second pass fixes them up
+        with span("backup.stage_live"):
+            self._run(self._stage_command(tools) + " || true")
+
+        manager = self.server_manager
+        running = manager.is_server_running(fresh=True)
+        if running is None:
+            raise BackupError("Server state is unknown")
+
+        paused_at = time.monotonic()
+        try:
+            with span("backup.stage_paused"):
+                if running:
+                    manager.send_console_command("save-off")
+                    if not manager.lifecycle.save():
+                        # Without confirmation, give the save a moment to land
+                        logger.warning("Backup: save not confirmed")
+                        time.sleep(5)
+                status, _, stderr = self._run(self._stage_command(tools))
+        finally:
+            if running:
+                manager.send_console_command("save-on")
+        paused = time.monotonic() - paused_at
+        if status != 0:
+            raise BackupError(f"Staging failed: {stderr.strip()}")
+        return paused
+
+    def _stage_command(self, tools):
+        staging = shlex.quote(self.staging)
+        script = [f"mkdir -p {staging}", f"cd {shlex.quote(self.server_manager.instance.directory)}"]
+        for path in self.paths:
+            source = shlex.quote(path)
+            target = shlex.quote(f"{self.staging}/{path}")
+            if "rsync" in tools:
+                copy = f"rsync -a --delete {source}/ {target}/"
+            else:
+                # Reflinks make this instant on btrfs and XFS, a full copy elsewhere
+                copy = f"rm -rf {target} && cp -a --reflink=auto {source} {target}"
+            script.append(f"if [ -d {source} ]; then {copy}; else rm -rf {target}; fi")
+        return " && ".join(script)
+
+    def _list_files(self):
+        """Return {path: (size, mtime)} for every staged file"""
+        paths = " ".join(shlex.quote(path) for path in self.paths)
+        status, stdout, stderr = self._run(
+            f"cd {shlex.quote(self.staging)} && for p in {paths}; do "
+            f"if [ -d \"$p\" ]; then find \"$p\" -type f -printf '%p\\t%s\\t%T@\\n'; fi; done"
+        )
+        if status != 0:
+            raise BackupError(f"Listing staged files failed: {stderr.strip()}")
+        files = {}
+        for line in stdout.splitlines():
+            path, size, mtime = line.rsplit("\t", 2)
+            files[path] = (int(size), round(float(mtime), 3))
+        return files
+
+    def _compare(self, files, base, tools):
+        """Return (changed paths, deleted paths, manifest entries)"""
+        previous = base["files"] if base else {}
+        entries = {}
+        candidates = []
+        for path, (size, mtime) in files.items():
+            old = previous.get(path)
+            if old and old[0] == size and old[1] == mtime:
+                entries[path] = old
+            else:
+                candidates.append(path)
+                entries[path] = [size, mtime, None]
+
+        changed = candidates
+        if base and candidates and "sha256sum" in tools:
+            # Region files are rewritten on every save; skip those whose
+            # content did not actually change
+            hashes = self._hash(candidates)
+            changed = []
+            for path in candidates:
+                entries[path][2] = hashes.get(path)
+                old = previous.get(path)
+                if not (old and old[2] and old[2] == hashes.get(path)):
+                    changed.append(path)
+        if not base:
+            changed = sorted(files)
+        deleted = sorted(set(previous) - set(files))
+        return changed, deleted, entries
+
+    def _hash(self, paths):
+        with span("backup.hash"):
+            status, stdout, stderr = self._run(
+                f"cd {shlex.quote(self.staging)} && xargs -0 sha256sum --",
+                stdin=b"\0".join(path.encode() for path in paths)
+            )
+        if status != 0:
+            raise BackupError(f"Hashing failed: {stderr.strip()}")
+        hashes = {}
+        for line in stdout.splitlines():
+            digest, path = line.split("  ", 1)
+            hashes[path] = digest
+        return hashes
+
+    def _stream(self, paths, destination, tools):
+        """Write a .tar.gz of paths to destination; returns its size"""
+        compressor = "pigz" if "pigz" in tools else "gzip"
+        # tar runs the compressor itself, so a failure of either shows in its exit status
+        command = (f"cd {shlex.quote(self.staging)} && "
+                   f"tar --null -T - -I '{compressor} -{self.compress_level}' -cf -")
+        os.makedirs(self.directory, exist_ok=True)
+        partial = destination + ".part"
+        written = 0
+        try:
+            with span("backup.stream"), open(partial, "wb") as output:
+                def sink(data):
+                    nonlocal written
+                    output.write(data)
+                    written += len(data)
+                status, stderr = self.server_manager.stream_command(
+                    command, sink, stdin=b"\0".join(path.encode() for path in paths), timeout=300
+                )
+            if status != 0:
+                raise BackupError(f"Archive transfer failed: {stderr.strip()}")
+            os.replace(partial, destination)
+            return written
+        finally:
+            if os.path.exists(partial):
+                os.remove(partial)
+
+    def _apply_retention(self):
+        history = self.history()
+        fulls = [index for index, manifest in enumerate(history) if manifest["type"] == FULL]
+        if len(fulls) <= self.keep_full:
+            return
+        for manifest in history[:fulls[-self.keep_full]]:
+            for name in (manifest["archive"], f"{manifest['id']}.json"):
+                if name:
+                    try:
+                        os.remove(os.path.join(self.directory, name))
+                    except FileNotFoundError:
+                        pass
+            logger.info("Removed old backup %s", manifest["id"])
+
+    def _run(self, command, stdin=None):
+        """Run a command without the short exec timeout; returns (status, stdout, stderr)"""
+        chunks = []
+        status, stderr = self.server_manager.stream_command(command, chunks.append, stdin=stdin,
+                                                            timeout=300)
+        return status, b"".join(chunks).decode(errors="replace"), stderr
+
+
+class BackupScheduler:
+    """Run a backup every ``interval`` seconds on a background thread.
+
+    ``on_result`` is called with the (stdout, stderr) of each backup.
+    """
+
+    def __init__(self, backups, interval, on_result=None):
+        self.backups = backups
+        self.interval = interval
+        self.on_result = on_result
+        self._stopped = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """Start the schedule; the first backup runs one interval from now"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._run, name="BackupScheduler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop scheduling; a backup already running finishes"""
+        self._stopped.set()
+
+    def _run(self):
+        while not self._stopped.wait(self.interval):
+            result = self.backups.backup()
+            if self.on_result:
+                try:
+                    self.on_result(result)
+                except Exception as e:
+                    logger.warning("Backup result callback error: %s", e)
@@ -0,0 +1,72 @@
+import threading
+import time
+
+
+class TTLCache:
+    """Short-lived results with single-flight loading.
+
+    get() returns a cached value while it is younger than its TTL. When
+    several threads miss the same key at once, only the first runs the
+    loader and the others wait for its result. invalidate() drops cached
+    values and detaches loads already running, so nobody is handed state
+    from before a start or stop.
+    """
+
+    def __init__(self):
+        self._values = {}
+        self._inflight = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, loader, ttl):
+        """Return the cached value for key, calling loader() when it is stale"""
+        with self._lock:
+            entry = self._values.get(key)
+            if entry and time.monotonic() - entry[0] < ttl:
+                self.hits += 1
+                return entry[1]
+            flight = self._inflight.get(key)
+            if flight is None:
+                self.misses += 1
+                flight = self._inflight[key] = {
+                    "done": threading.Event(),
+                    "value": None,
+                    "error": None,
+                    "stale": False,
+                }
+                leader = True
+            else:
+                self.hits += 1
+                leader = False
+
+        if not leader:
+            flight["done"].wait()
+            if flight["error"]:
+                raise flight["error"]
+            return flight["value"]
+
+        try:
+            flight["value"] = loader()
+        except Exception as e:
+            flight["error"] = e
+            raise
+        finally:
+            with self._lock:
+                if self._inflight.get(key) is flight:
+                    del self._inflight[key]
+                if flight["error"] is None and not flight["stale"]:
+                    self._values[key] = (time.monotonic(), flight["value"])
+            flight["done"].set()
+        return flight["value"]
+
+    def invalidate(self, key=None):
+        """Forget one key, or everything when key is None"""
+        with self._lock:
+            keys = list(self._values.keys() | self._inflight.keys()) if key is None else [key]
+            for name in keys:
+                self._values.pop(name, None)
+                flight = self._inflight.pop(name, None)
+                if flight:
+                    # Its waiters still get the result, but it is not cached
+                    flight["stale"] = True
@@ -0,0 +1,76 @@
+import logging
+
+logger = logging.getLogger(__name__)
+
+SERVICE_NAME = "minecraft_monitor"
+
+_keyring = False
+
+
+def _backend():
+    # keyring scans its backends on import, so load it on first use.
+    # Optional: without keyring, passwords are simply not remembered.
+    global _keyring
+    if _keyring is False:
+        try:
+            import keyring
+            _keyring = keyring
+        except ImportError:
+            _keyring = None
+    return _keyring
+
+
+def _account(host, user, ssh_port):
+    return f"{user}@{host}:{ssh_port}"
+
+
+def get_password(host, user, ssh_port=22):
+    """Return the password saved in the OS keyring, or None"""
+    keyring = _backend()
+    if keyring is None:
+        return None
+    try:
+        return keyring.get_password(SERVICE_NAME, _account(host, user, ssh_port))
+    except Exception as e:
+        logger.warning("Keyring unavailable: %s", e)
+        return None
+
+
+def save_password(host, user, password, ssh_port=22):
+    """Remember a password that worked; returns True if it was saved"""
+    keyring = _backend()
+    if keyring is None or not password:
+        return False
+    try:
+        keyring.set_password(SERVICE_NAME, _account(host, user, ssh_port), password)
+        return True
+    except Exception as e:
+        logger.warning("Could not save password to keyring: %s", e)
+        return False
+
+
+def connect_saved(manager):
+    """Connect a ServerManager without prompting; returns success
+
+    Tries keys, the SSH agent and the password saved in the keyring. A
+    saved password the server refuses is forgotten, so the caller's
+    prompt is not followed by the same failure next time.
+    """
+    password = get_password(manager.host, manager.user, manager.ssh_port)
+    if manager.connect(password):
+        return True
+    if password and manager.auth_failed:
+        logger.info("Saved password for %s@%s was refused; forgetting it", manager.user, manager.host)
+        forget_password(manager.host, manager.user, manager.ssh_port)
+    return False
+
+
+def forget_password(host, user, ssh_port=22):
+    """Remove a saved password, e.g. after it stopped working"""
+    keyring = _backend()
+    if keyring is None:
+        return
+    try:
+        keyring.delete_password(SERVICE_NAME, _account(host, user, ssh_port))
+    except Exception:
+        pass
@@ -0,0 +1,42 @@
+import contextlib
+import logging
+import os
+import sqlite3
+
+logger = logging.getLogger(__name__)
+
+
+@contextlib.contextmanager
+def connect(path):
+    """Open a short-lived connection to path and commit on success
+
+    A short-lived connection per flush keeps sqlite3 happy across threads.
+    """
+    db = sqlite3.connect(path, timeout=5)
+    try:
+        with db:
+            yield db
+    finally:
+        db.close()
+
+
+def open_database(path, schema, name, setup=None):
+    """Create the SQLite file at path and apply schema
+
+    setup, if given, is called with the open connection afterwards.
+    Returns path, or None (with a warning naming the ``name`` history)
+    when the file cannot be used.
+    """
+    try:
+        directory = os.path.dirname(path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+        with connect(path) as db:
+            for statement in schema:
+                db.execute(statement)
+            if setup:
+                setup(db)
+        return path
+    except (OSError, sqlite3.Error) as e:
+        logger.warning("%s history disabled: %s", name, e)
+        return None
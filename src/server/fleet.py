@@ -0,0 +1,195 @@
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from src.server.manager import ServerManager
+from src.server.stats import ServerStats
+from src.server.pool import ConnectionPool
+from src.server.instances import Instance
+from src.server.poller import poll_server
+from src.server.credentials import connect_saved
+from src.config import SERVER_USER, SERVER_PORT, SSH_PORT, RCON_PORT, RCON_PASSWORD
+
+logger = logging.getLogger(__name__)
+
+class FleetServer:
+    """One server registry entry with its manager and stats client
+
+    Entries on the same host are separate instances there (see Instance)
+    and share the host's pooled SSH connection.
+    """
+
+    def __init__(self, entry, pool):
+        self.host = entry["host"]
+        self.name = entry.get("name") or self.host
+        self.user = entry.get("user", SERVER_USER)
+        self.port = entry.get("port", SERVER_PORT)
+        self.ssh_port = entry.get("ssh_port", SSH_PORT)
+        self.password = entry.get("password")
+        self.manager = ServerManager(
+            self.host,
+            self.user,
+            ssh_port=self.ssh_port,
+            pool=pool,
+            rcon_port=entry.get("rcon_port", RCON_PORT),
+            rcon_password=entry.get("rcon_password", RCON_PASSWORD),
+            server_port=self.port,
+            instance=Instance.from_entry(entry)
+        )
+        self.stats = ServerStats(self.host, self.port)
+        self.connected = False
+
+    @property
+    def ssh_key(self):
+        """Servers with the same key share one SSH connection"""
+        return (self.host, self.user, self.ssh_port)
+
+
+class FleetPoller:
+    """Poll every server in the registry concurrently.
+
+    Each refresh fans out over a bounded thread pool, so it takes about as
+    long as the slowest server rather than the sum of all of them. The
+    connection pool supervises each host and reconnects it after a drop.
+    Results are posted to ``results`` for the GUI to drain with
+    ``root.after``:
+
+    - ``("connected", name, ok)`` after each connection attempt
+    - ``("status", name, snapshot)`` as each server answers
+    - ``("refresh", seconds)`` when a full refresh has finished
+    - ``("action", callback, result, error)`` for submitted tasks
+    """
+
+    def __init__(self, entries, max_workers=8, interval=5, metrics=None):
+        self.pool = ConnectionPool()
+        self.metrics = metrics
+        self.servers = [FleetServer(entry, self.pool) for entry in entries]
+        self.interval = interval
+        self.results = queue.Queue()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="FleetWorker")
+        self._wake = threading.Event()
+        self._stopped = threading.Event()
+        self._thread = None
+
+    def get(self, name):
+        """Return the server with the given name"""
+        for server in self.servers:
+            if server.name == name:
+                return server
+        raise KeyError(name)
+
+    def connect_all(self, passwords=None):
+        """Connect every server in the background.
+
+        passwords maps ``FleetServer.ssh_key`` to a password for servers
+        whose registry entry does not carry one. Servers with neither try
+        keys, the SSH agent and the keyring.
+        """
+        for server in self.servers:
+            self.connect(server, (passwords or {}).get(server.ssh_key))
+
+    def connect(self, server, password=None):
+        """Connect one server in the background; posts ("connected", name, ok)"""
+        password = password or server.password
+        if password:
+            connect = lambda: server.manager.connect(password)
+        else:
+            connect = lambda: connect_saved(server.manager)
+        future = self._executor.submit(connect)
+        future.add_done_callback(lambda f: self._on_connected(server, f))
+
+    def start(self):
+        """Start the refresh loop"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._run, name="FleetPoller", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop polling and close pooled connections"""
+        self._stopped.set()
+        self._wake.set()
+        self._executor.shutdown(wait=False)
+        self.pool.close_all()
+        if self.metrics:
+            self.metrics.flush()
+
+    def request_refresh(self):
+        """Refresh all servers right away"""
+        self._wake.set()
+
+    def submit(self, func, *args, callback=None):
+        """Run func(*args) on the worker pool and post the result"""
+        future = self._executor.submit(func, *args)
+        if callback:
+            future.add_done_callback(lambda f: self._post_action(callback, f))
+
+    def submit_long(self, func, *args, callback=None):
+        """Run a long task (such as a graceful stop) on its own thread.
+
+        A stop can block for minutes, so it never takes a worker the
+        periodic polls need. The result is posted back as for submit().
+        """
+        def run():
+            result, error = None, None
+            try:
+                result = func(*args)
+            except Exception as e:
+                logger.warning("Background task error: %s", e)
+                error = e
+            if callback:
+                self.results.put(("action", callback, result, error))
+
+        threading.Thread(target=run, name="FleetTask", daemon=True).start()
+
+    def refresh(self):
+        """Poll all connected servers concurrently and return elapsed seconds"""
+        started = time.monotonic()
+        futures = {
+            self._executor.submit(poll_server, server.manager, server.stats): server
+            for server in self.servers
+            if server.connected
+        }
+        for future in as_completed(futures):
+            server = futures[future]
+            try:
+                snapshot = future.result()
+                if self.metrics:
+                    self.metrics.record_snapshot(snapshot, prefix=f"{server.name}.")
+                self.results.put(("status", server.name, snapshot))
+            except Exception as e:
+                logger.warning("Poll failed for %s: %s", server.name, e)
+                self.results.put(("status", server.name, None))
+        return time.monotonic() - started
+
+    def _on_connected(self, server, future):
+        try:
+            server.connected = bool(future.result())
+        except Exception as e:
+            logger.warning("Connection to %s failed: %s", server.name, e)
+            server.connected = False
+        self.results.put(("connected", server.name, server.connected))
+        self._wake.set()
+
+    def _post_action(self, callback, future):
+        error = future.exception()
+        result = None if error else future.result()
+        self.results.put(("action", callback, result, error))
+
+    def _run(self):
+        if self.metrics:
+            # Open the SQLite history off the GUI thread
+            self.metrics.open()
+        while not self._stopped.is_set():
+            try:
+                elapsed = self.refresh()
+                self.results.put(("refresh", elapsed))
+                if self.metrics:
+                    self.metrics.maybe_flush()
+            except RuntimeError:
+                # Executor shut down while stopping
+                break
+            self._wake.wait(max(0, self.interval - elapsed))
+            self._wake.clear()
@@ -0,0 +1,160 @@
+import posixpath
+import shlex
+from src.config import (SERVER_DIR, SERVER_JAR, SERVER_PORT, SCREEN_NAME, SERVER_HEAP, JVM_PROFILE,
+                        JVM_PROFILES, JAVA)
+
+
+def owns_process(directory, jar, proc_jar, jar_dir, cwd):
+    """True if a Java process is the server in directory running jar
+
+    directory, jar_dir and cwd are resolved on the host, so a server
+    directory reached through a symlink still matches. A jar given as
+    an absolute path is matched by the directory holding it, otherwise
+    by the working directory of the process.
+    """
+    if proc_jar and proc_jar.rsplit("/", 1)[-1] != jar.rsplit("/", 1)[-1]:
+        return False
+    if proc_jar and proc_jar.startswith("/"):
+        return jar_dir == directory
+    return cwd is not None and cwd == directory
+
+
+# owns_process as embedded in the remote agent, so both sides match
+# processes the same way. It is a copy rather than inspect.getsource()
+# because the frozen build ships no source; tests/test_instances.py
+# checks the two stay identical. Like the rest of the agent it avoids
+# syntax newer than the host's python may support.
+OWNS_PROCESS_SOURCE = r'''
+def owns_process(directory, jar, proc_jar, jar_dir, cwd):
+    """True if a Java process is the server in directory running jar
+
+    directory, jar_dir and cwd are resolved on the host, so a server
+    directory reached through a symlink still matches. A jar given as
+    an absolute path is matched by the directory holding it, otherwise
+    by the working directory of the process.
+    """
+    if proc_jar and proc_jar.rsplit("/", 1)[-1] != jar.rsplit("/", 1)[-1]:
+        return False
+    if proc_jar and proc_jar.startswith("/"):
+        return jar_dir == directory
+    return cwd is not None and cwd == directory
+'''
+
+# One remote command that lists every Java process without the agent:
+# pid, working directory, server-port from its server.properties, the
+# resolved directory of an absolute -jar path and the command line, with
+# arguments separated by \x1f
+JAVA_SCAN_COMMAND = (
+    "for pid in $(pgrep -x java); do "
+    "cwd=$(readlink /proc/$pid/cwd); "
+    "jar=$(tr '\\0' '\\n' < /proc/$pid/cmdline | sed -n '/^-jar$/{n;p;q;}'); "
+    "case $jar in /*) jar_dir=$(readlink -f \"$(dirname \"$jar\")\");; *) jar_dir=;; esac; "
+    "printf '%s\\t%s\\t%s\\t%s\\t' \"$pid\" \"$cwd\" "
+    "\"$(sed -n 's/^server-port=//p' \"$cwd/server.properties\" 2>/dev/null)\" \"$jar_dir\"; "
+    "tr '\\0' '\\037' < /proc/$pid/cmdline; echo; "
+    "done 2>/dev/null || true"
+)
+
+
+def parse_java_scan(output):
+    """Parse the output of JAVA_SCAN_COMMAND into describe_process() dicts"""
+    procs = []
+    for line in output.splitlines():
+        fields = line.split("\t", 4)
+        if len(fields) < 5 or not fields[0].isdigit() or not fields[4]:
+            # The process exited during the scan
+            continue
+        pid, cwd, port, jar_dir, args = fields
+        procs.append(describe_process(int(pid), cwd or None, args.rstrip("\x1f").split("\x1f"), port,
+                                      jar_dir or None))
+    return procs
+
+
+def describe_process(pid, cwd, args, properties_port=None, jar_dir=None):
+    """Summarise a Java process: jar, game port and heap flags
+
+    The port comes from --port on the command line, else from the
+    server-port of the server.properties in its working directory.
+    """
+    jar = port = xms = xmx = None
+    for index, arg in enumerate(args):
+        following = args[index + 1] if index + 1 < len(args) else None
+        if jar is None:
+            if arg == "-jar":
+                jar = following
+            elif arg.startswith("-Xms"):
+                xms = arg[4:]
+            elif arg.startswith("-Xmx"):
+                xmx = arg[4:]
+        elif arg in ("--port", "-p") and following:
+            port = _int(following)
+        elif arg.startswith("--port="):
+            port = _int(arg.split("=", 1)[1])
+    if port is None:
+        port = _int(properties_port)
+    return {"pid": pid, "cwd": cwd, "jar": jar, "jar_dir": jar_dir, "port": port,
+            "xms": xms, "xmx": xmx, "args": args}
+
+
+def _int(value):
+    try:
+        return int(str(value).strip())
+    except (TypeError, ValueError):
+        return None
+
+
+class Instance:
+    """One Minecraft server on a host: where it lives and how it starts.
+
+    Instances are told apart by their working directory, so several can
+    run side by side on one host as long as each has its own directory,
+    screen session and game port. Paths are on the host and handled as
+    POSIX paths whatever the OS here. The java command line is built
+    from ``heap`` (both -Xms and -Xmx, as Paper recommends), the flags of
+    the JVM profile named by ``profile`` (see JVM_PROFILES) and
+    ``jvm_args``. ``name`` defaults to the screen name and ``log`` to
+    logs/latest.log in the directory.
+    """
+
+    def __init__(self, name=None, directory=SERVER_DIR, jar=SERVER_JAR, screen=SCREEN_NAME,
+                 port=SERVER_PORT, heap=SERVER_HEAP, profile=JVM_PROFILE, jvm_args=(), java=JAVA, log=None):
+        if profile not in JVM_PROFILES:
+            raise ValueError(f"Unknown JVM profile {profile!r}; add it to JVM_PROFILES")
+        self.name = name or screen
+        self.directory = posixpath.normpath(directory)
+        self.jar = jar
+        self.screen = screen
+        self.port = port
+        self.heap = heap
+        self.profile = profile
+        self.jvm_args = list(jvm_args)
+        self.java = java
+        self.log = log or f"{self.directory}/logs/latest.log"
+
+    @classmethod
+    def from_entry(cls, entry):
+        """Create an instance from a SERVERS entry; missing keys use the defaults"""
+        keys = ("name", "directory", "jar", "screen", "port", "heap", "profile", "jvm_args", "java", "log")
+        return cls(**{key: entry[key] for key in keys if key in entry})
+
+    def java_command(self):
+        """argv of the server JVM"""
+        heap = [f"-Xms{self.heap}", f"-Xmx{self.heap}"] if self.heap else []
+        return [self.java] + heap + JVM_PROFILES[self.profile] + self.jvm_args + ["-jar", self.jar, "--nogui"]
+
+    def start_command(self):
+        """Shell command that launches the instance in a new screen session"""
+        return (f"cd {shlex.quote(self.directory)} && screen -dmS {shlex.quote(self.screen)} "
+                + " ".join(shlex.quote(arg) for arg in self.java_command()))
+
+    def resolve_command(self):
+        """Shell command printing the directory with symlinks resolved on the host"""
+        return f"readlink -f {shlex.quote(self.directory)}"
+
+    def owns(self, proc, directory=None):
+        """True if a describe_process() dict is this instance's JVM
+
+        directory: the instance directory as resolved on the host (see
+        resolve_command); process paths are always resolved there.
+        """
+        return owns_process(directory or self.directory, self.jar, proc["jar"], proc["jar_dir"], proc["cwd"])
@@ -0,0 +1,224 @@
+import logging
+import re
+import time
+
+logger = logging.getLogger(__name__)
+
+STOPPED = "STOPPED"
+STARTING = "STARTING"
+RUNNING = "RUNNING"
+SAVING = "SAVING"
+STOPPING = "STOPPING"
+TERMINATING = "TERMINATING"
+KILLING = "KILLING"
+
+# Console output that shows the server has begun shutting down
+STOP_ACK_PATTERN = r"Stopping (the )?server"
+SAVED_PATTERN = r"Saved the game"
+# Console output once the server has finished loading and accepts players
+READY_PATTERN = r"Done \([\d.]+s\)!"
+
+
+class LifecycleController:
+    """Graceful start/stop orchestration for one server.
+
+    stop() saves the world, asks the server to stop and waits for real
+    completion signals: the save message in the log, the shutdown
+    message or the game port closing, then the process exiting. Only
+    when those time out does it escalate to SIGTERM and then SIGKILL.
+    Without the remote agent only the exit can be seen, so the process
+    gets the whole ``stop_timeout`` to exit before SIGTERM.
+
+    start() launches the server and waits up to ``ready_timeout`` for the
+    "Done (...)!" line that shows it accepts players. Without the agent
+    it can only wait for the process to appear.
+
+    ``state`` follows each step. If ``on_state`` is set, it is called with
+    every change from the thread running stop() or start().
+    """
+
+    def __init__(self, server_manager, save_timeout=30, ack_timeout=15, stop_timeout=90,
+                 term_timeout=30, start_timeout=15, ready_timeout=300, on_state=None):
+        self.server_manager = server_manager
+        self.save_timeout = save_timeout
+        self.ack_timeout = ack_timeout
+        self.stop_timeout = stop_timeout
+        self.term_timeout = term_timeout
+        self.start_timeout = start_timeout
+        self.ready_timeout = ready_timeout
+        self.on_state = on_state
+        self.state = None
+
+    def stop(self):
+        """Stop the server, escalating only after timeouts; returns (stdout, stderr)"""
+        started = time.monotonic()
+        try:
+            pids = self.server_manager.server_pids(fresh=True)
+        except Exception as e:
+            return "", f"Server state is unknown: {str(e)}"
+        pid = pids[0] if pids else None
+        if pid is None:
+            self._set_state(STOPPED)
+            return "Server is not running", ""
+
+        notes = []
+
+        # Flush chunks first so a forced stop later loses nothing
+        self._set_state(SAVING)
+        if not self.save():
+            notes.append("save not confirmed")
+
+        self._set_state(STOPPING)
+        offset = self._log_offset()
+        self.server_manager.send_console_command("stop")
+        if offset is None:
+            # The acknowledgement cannot be seen without the log, so give
+            # a slow save the whole stop_timeout before escalating
+            met = self._wait(pid=pid, timeout=self.stop_timeout)
+            if met is None:
+                notes.append("stop not confirmed")
+        else:
+            met = self._wait(
+                pid=pid,
+                log_pattern=STOP_ACK_PATTERN,
+                log_offset=offset,
+                port_closed=self.server_manager.server_port,
+                timeout=self.ack_timeout
+            )
+            if met is None:
+                notes.append("stop not acknowledged")
+        if met is not None and met != "exit":
+            # Shutdown is under way; give it time to finish saving
+            met = self._wait(pid=pid, timeout=self.stop_timeout)
+
+        if met != "exit":
+            self._set_state(TERMINATING)
+            notes.append("sent SIGTERM")
+            self.server_manager.execute_command(f"kill -TERM {pid}")
+            met = self._wait(pid=pid, timeout=self.term_timeout)
+
+        if met != "exit":
+            self._set_state(KILLING)
+            notes.append("sent SIGKILL")
+            self.server_manager.execute_command(f"kill -KILL {pid}")
+            met = self._wait(pid=pid, timeout=10)
+
+        # Only removes dead sessions; the live one ended with the JVM
+        self.server_manager.execute_command("screen -wipe")
+
+        if met != "exit":
+            self._set_state(RUNNING)
+            return "", f"Server process {pid} is still running"
+
+        self._set_state(STOPPED)
+        message = f"Server stopped in {time.monotonic() - started:.1f}s"
+        if notes:
+            message += f" ({'; '.join(notes)})"
+        return message, ""
+
+    def start(self):
+        """Launch the server and wait until it is ready; returns (stdout, stderr)"""
+        running = self.server_manager.is_server_running(fresh=True)
+        if running is None:
+            # Never risk a second server on a host we cannot see
+            return "", "Server state is unknown; not starting"
+        if running:
+            return "Server is already running", ""
+        # Another instance on the host may already hold the game port
+        conflict = self.server_manager.port_conflict()
+        if conflict:
+            return "", f"{conflict}; not starting"
+
+        started = time.monotonic()
+        offset = self._log_offset()
+        self._set_state(STARTING)
+        stdout, stderr = self.server_manager.execute_command(
+            f"screen -wipe >/dev/null 2>&1; {self.server_manager.start_command()}"
+        )
+        if stderr and stderr.strip():
+            self._set_state(STOPPED)
+            return stdout, stderr
+
+        pid = None
+        deadline = time.monotonic() + self.start_timeout
+        while pid is None and time.monotonic() < deadline:
+            pid = self.server_manager.find_server_pid(fresh=True)
+            if pid is None:
+                time.sleep(0.5)
+        if pid is None:
+            self._set_state(STOPPED)
+            return stdout, "Server process did not start"
+        if offset is None:
+            # Without the log the running process is all there is to see
+            return stdout, ""
+
+        met = self._wait(pid=pid, log_pattern=READY_PATTERN, log_offset=offset, timeout=self.ready_timeout)
+        if met == "exit":
+            self._set_state(STOPPED)
+            return stdout, "Server exited while starting"
+        if met is None:
+            return f"Server still starting after {time.monotonic() - started:.0f}s", ""
+        self._set_state(RUNNING)
+        return f"Server started in {time.monotonic() - started:.1f}s", ""
+
+    def save(self):
+        """Flush every chunk to disk; returns True once the server confirms it
+
+        Without the remote agent there is no way to see the confirmation,
+        so this returns False after sending the command.
+        """
+        offset = self._log_offset()
+        response, _ = self.server_manager.send_console_command("save-all flush")
+        if response and re.search(SAVED_PATTERN, response):
+            # RCON answers once the save has finished
+            return True
+        return self._wait(log_pattern=SAVED_PATTERN, log_offset=offset, timeout=self.save_timeout) is not None
+
+    def _set_state(self, state):
+        self.state = state
+        if self.on_state:
+            try:
+                self.on_state(state)
+            except Exception as e:
+                logger.warning("Lifecycle state callback error: %s", e)
+
+    def _log_offset(self):
+        agent = self.server_manager.agent
+        if not (agent and agent.alive):
+            return None
+        try:
+            return agent.call("logpos", log=self.server_manager.server_log)["size"]
+        except Exception as e:
+            logger.warning("Log position unavailable: %s", e)
+            return None
+
+    def _wait(self, pid=None, log_pattern=None, log_offset=None, port_closed=None, timeout=30):
+        """Wait for the first completion signal; returns its name or None on timeout"""
+        agent = self.server_manager.agent
+        if agent and agent.alive:
+            # "wait", not "timeout": call() takes its own timeout argument
+            params = {"wait": timeout}
+            if pid is not None:
+                params["pid"] = pid
+            if log_pattern and log_offset is not None:
+                params.update(
+                    log=self.server_manager.server_log,
+                    log_pattern=log_pattern,
+                    log_offset=log_offset
+                )
+            if port_closed:
+                params["port_closed"] = port_closed
+            try:
+                return agent.call("wait", timeout=timeout + 10, **params)["met"]
+            except Exception as e:
+                logger.warning("Wait failed, polling instead: %s", e)
+
+        # Without the agent only process exit can be observed
+        if pid is None:
+            return None
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if self.server_manager.is_server_running(fresh=True) is False:
+                return "exit"
+            time.sleep(1)
+        return None
@@ -0,0 +1,68 @@
+import logging
+import threading
+from collections import deque
+
+logger = logging.getLogger(__name__)
+
+class LogStream:
+    """Buffer console lines streamed from the server for the GUI.
+
+    Lines arrive on the agent reader thread and wait in a bounded deque
+    until the GUI drains them, so a burst of output can never grow memory
+    beyond ``max_pending`` lines; older pending lines are dropped and
+    counted instead.
+    """
+
+    def __init__(self, server_manager, backlog=200, max_pending=5000):
+        self.server_manager = server_manager
+        self.backlog = backlog
+        self.subscription = None
+        self._started = False
+        self._pending = deque(maxlen=max_pending)
+        self._dropped = 0
+        self._lock = threading.Lock()
+
+    @property
+    def active(self):
+        """True while the remote log stream is running"""
+        return self.subscription is not None
+
+    def start(self):
+        """Subscribe to the remote log (blocking; run off the Tk thread)
+
+        Only the first subscription replays the backlog; restarting after
+        a reconnect picks up new lines without repeating old ones.
+        """
+        if self.subscription is None:
+            backlog = 0 if self._started else self.backlog
+            self.subscription = self.server_manager.stream_log(self._on_message, backlog)
+            self._started = self._started or self.active
+        return self.active
+
+    def stop(self):
+        """Cancel the remote log stream"""
+        subscription, self.subscription = self.subscription, None
+        if subscription is not None and self.server_manager.agent:
+            try:
+                self.server_manager.agent.unsubscribe(subscription)
+            except Exception as e:
+                logger.warning("Failed to stop log stream: %s", e)
+
+    def drain(self):
+        """Return (lines, dropped) received since the last drain"""
+        with self._lock:
+            lines = list(self._pending)
+            self._pending.clear()
+            dropped, self._dropped = self._dropped, 0
+        return lines, dropped
+
+    def _on_message(self, message):
+        # Runs on the agent reader thread
+        if message is None:
+            self.subscription = None
+            return
+        lines = message.get("lines") or []
+        with self._lock:
+            overflow = max(0, len(self._pending) + len(lines) - self._pending.maxlen)
+            self._dropped += message.get("dropped", 0) + overflow
+            self._pending.extend(lines)
@@ -1,13 +1,104 @@
 # src/server/manager.py
-import paramiko
-from paramiko import SSHClient, AutoAddPolicy
+import logging
 import os
+import re
+import select
+import shlex
+import socket
+import subprocess
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from src.server.agent import RemoteAgent
+from src.server.openssh import ProcessChannel, master_running, run_command, ssh_command
+from src.server.rcon import RconError, get_client, strip_colors
+from src.server.lifecycle import LifecycleController
+from src.server.backup import BackupManager
+from src.server.instances import Instance, JAVA_SCAN_COMMAND, describe_process, parse_java_scan
+from src.server.cache import TTLCache
+from src.telemetry import count, span
+from src.config import (RCON_PORT, RCON_PASSWORD,
+                        PROCESS_CACHE_TTL, SSH_CONNECT_TIMEOUT, SSH_KEEPALIVE_INTERVAL,
+                        USE_CONTROL_MASTER, SSH_CONTROL_PATH, STREAM_CHUNK_SIZE, EXEC_TIMEOUT,
+                        EXEC_MAX_CHANNELS)
+
+PLAYER_LIST_RE = re.compile(r"There are (\d+) of a max(?: of)? (\d+) players online:?(.*)")
+
+logger = logging.getLogger(__name__)
+
+
+def parse_tps(tps_text, mspt_text=""):
+    """Parse the output of Paper's tps and mspt commands"""
+    result = {}
+    match = re.search(r"TPS from last 1m, 5m, 15m: (.*)", tps_text)
+    if match:
+        values = [float(v) for v in re.findall(r"\d+(?:\.\d+)?", match.group(1))]
+        result.update(zip(("tps_1m", "tps_5m", "tps_15m"), values))
+    match = re.search(r"from last 5s, 10s, 1m:\s*\S*\s*([\d.]+)/", mspt_text)
+    if match:
+        result["mspt"] = float(match.group(1))
+    return result or None
+
+# Host stats without the agent: load, online CPUs and the two memory lines
+HOST_STATS_COMMAND = ("cat /proc/loadavg; getconf _NPROCESSORS_ONLN; "
+                      "grep -E '^Mem(Total|Available):' /proc/meminfo")
+
+
+def parse_host_stats(text):
+    """Parse HOST_STATS_COMMAND output into the agent's "host" dict"""
+    lines = text.splitlines()
+    memory = {}
+    for line in lines[2:]:
+        key, _, value = line.partition(":")
+        memory[key] = int(value.split()[0])
+    return {
+        "load": [float(value) for value in lines[0].split()[:3]],
+        "cpus": int(lines[1]),
+        "mem_total_kb": memory.get("MemTotal"),
+        "mem_available_kb": memory.get("MemAvailable"),
+    }
+
+
+def parse_jstat(text):
+    """Parse ``jstat -gc`` output into the agent's "jvm" dict"""
+    lines = text.strip().split("\n")
+    if len(lines) < 2:
+        raise ValueError("jstat returned no data")
+    gc = dict(zip(lines[0].split(), [float(value) for value in lines[1].split()]))
+    return {
+        "heap_used_kb": sum(gc.get(key, 0) for key in ("S0U", "S1U", "EU", "OU")),
+        "heap_capacity_kb": sum(gc.get(key, 0) for key in ("S0C", "S1C", "EC", "OC")),
+        "young_gc_count": int(gc.get("YGC", 0)),
+        "full_gc_count": int(gc.get("FGC", 0)),
+        "gc_time_s": gc.get("GCT"),
+    }
 
 class ServerManager:
-    def __init__(self, host, user):
+    def __init__(self, host, user, ssh_port=22, pool=None,
+                 rcon_port=RCON_PORT, rcon_password=RCON_PASSWORD, server_port=None, instance=None):
         self.host = host
         self.user = user
+        self.ssh_port = ssh_port
+        # The server instance on the host this manager controls
+        self.instance = instance or Instance()
+        self.server_port = server_port or self.instance.port
+        self.server_log = self.instance.log
+        self.rcon_port = rcon_port
+        self.rcon_password = rcon_password
+        self.pool = pool
+        self.shared = False
         self.ssh = None
+        self.master = None
+        self.agent = None
+        self.password = None
+        # True when the last connect() was refused for its credentials
+        self.auth_failed = False
+        self.cache = TTLCache()
+        self._server_directory = None
+        self.process_cache_ttl = PROCESS_CACHE_TTL
+        self._cpu_sample = None
+        self.lifecycle = LifecycleController(self)
+        self.backups = BackupManager(self)
         
         # Create .ssh directory if it doesn't exist
         ssh_dir = os.path.expanduser('~/.ssh')
@@ -19,127 +110,608 @@ class ServerManager:
         if not os.path.exists(known_hosts):
             open(known_hosts, 'a').close()
 
-    def connect(self, password):
-        """Establish SSH connection to the server"""
+    def connect(self, password=None):
+        """Establish SSH connection to the server
+
+        Reuses an open OpenSSH ControlMaster connection when there is one.
+        Otherwise authenticates with the SSH agent and keys from ~/.ssh,
+        then with password if given. Pass password=None to find out
+        whether the server can be reached without prompting.
+        """
+        if self.pool:
+            # Reuse the pooled connection for this host
+            connection = self.pool.acquire(self.host, self.user, password, self.ssh_port, member=self)
+            self.auth_failed = False
+            if not connection:
+                return False
+            self.attach(connection)
+            return True
+
+        if USE_CONTROL_MASTER and master_running(self.host, self.user, self.ssh_port, SSH_CONTROL_PATH):
+            logger.info("Using the OpenSSH master connection to %s", self.host)
+            self.master = ssh_command(self.host, self.user, self.ssh_port, SSH_CONTROL_PATH)
+            self.password = password
+            self.start_agent()
+            return True
+
+        # Imported here, off the Tk thread: paramiko takes ~150ms to load
+        from paramiko import SSHClient, AutoAddPolicy, AuthenticationException
+        self.auth_failed = False
         try:
             self.ssh = SSHClient()
             self.ssh.set_missing_host_key_policy(AutoAddPolicy())
             
-            print(f"Attempting to connect to {self.host}...")
+            logger.info("Attempting to connect to %s...", self.host)
             self.ssh.connect(
                 hostname=self.host,
+                port=self.ssh_port,
                 username=self.user,
                 password=password,
-                timeout=30,
-                allow_agent=False,
-                look_for_keys=False
+                timeout=SSH_CONNECT_TIMEOUT,
+                allow_agent=True,
+                look_for_keys=True
             )
-            print("Successfully connected to server")
+            logger.info("Successfully connected to server")
+            # Keepalives stop NAT and firewalls from dropping an idle session
+            transport = self.ssh.get_transport()
+            transport.set_keepalive(SSH_KEEPALIVE_INTERVAL)
+            # Every channel open and exec is a small request waiting on its
+            # reply; Nagle would hold each back for the previous one's ACK
+            transport.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            self.password = password
+            self.start_agent()
+            return True
+        except Exception as e:
+            logger.warning("Connection error: %s", e)
+            self.ssh = None
+            self.auth_failed = isinstance(e, AuthenticationException)
+            return False
+
+    def reconnect(self):
+        """Drop the current connection and connect again with the same credentials"""
+        self.close()
+        self.invalidate_cache()
+        return self.connect(self.password)
+
+    def attach(self, connection):
+        """Use a pooled connection's transport and agent"""
+        self.ssh = connection.ssh
+        self.master = connection.master
+        self.agent = connection.agent
+        self.shared = True
+        self._server_directory = None
+        self.invalidate_cache()
+
+    def close(self):
+        """Close the agent and SSH connection"""
+        agent, ssh = self.agent, self.ssh
+        self.agent = self.ssh = self.master = None
+        self._server_directory = None
+        if self.shared:
+            # The pool owns shared connections
+            self.shared = False
+            self.pool.release(self)
+            return
+        if agent:
+            agent.close()
+        if ssh:
+            ssh.close()
+
+    def probe(self, timeout=5):
+        """Check the connection with a real round trip; returns True if it answered"""
+        try:
+            if self.agent and self.agent.alive:
+                self.agent.call("ping", timeout=timeout)
+                return True
+            if self.master:
+                return master_running(self.host, self.user, self.ssh_port, SSH_CONTROL_PATH, timeout)
+            transport = self.ssh.get_transport() if self.ssh else None
+            if not (transport and transport.is_active()):
+                return False
+            transport.open_session(timeout=timeout).close()
             return True
         except Exception as e:
-            print(f"Connection error: {str(e)}")
+            logger.warning("Connection probe failed: %s", e)
             return False
 
-    def execute_command(self, command):
-        """Execute a command on the remote server"""
+    @property
+    def connected(self):
+        """True while a connection to the server is open"""
+        if self.agent and self.agent.alive:
+            return True
+        if self.master:
+            return True
+        transport = self.ssh.get_transport() if self.ssh else None
+        return bool(transport and transport.is_active())
+
+    def start_agent(self):
+        """Start the persistent remote agent, falling back to exec_command"""
+        agent = RemoteAgent(self.ssh)
         try:
-            if not self.ssh:
+            if self.master:
+                agent.start(channel=ProcessChannel(self.master, agent.command()))
+            else:
+                agent.start()
+            self.agent = agent
+            logger.info("Remote agent started")
+        except Exception as e:
+            logger.warning("Remote agent unavailable, using exec_command: %s", e)
+            agent.close()
+            self.agent = None
+
+    def execute_command(self, command, timeout=EXEC_TIMEOUT):
+        """Execute a command on the remote server
+
+        Returns (stdout, stderr), or (None, error) if the command could
+        not be run or took longer than timeout seconds.
+        """
+        transport = self._exec_transport()
+        with span("ssh.exec", transport=transport) as attributes:
+            logger.debug("Executing command: %s", command)
+            if transport == "agent":
+                result = self._exec_agent([command], timeout)[0]
+            else:
+                result = self._exec_one(command, timeout)
+            if result[0] is None:
+                count("ssh.exec.failures")
+                attributes["error"] = result[1]
+            else:
+                logger.debug("stdout: %s", result[0])
+                logger.debug("stderr: %s", result[1])
+            return result
+
+    def execute_many(self, commands, timeout=EXEC_TIMEOUT, overall_timeout=None):
+        """Run independent commands side by side; returns a (stdout, stderr) per command
+
+        Over the agent the whole batch is one round trip. Otherwise each
+        command gets its own channel on the SSH transport (or its own ssh
+        process on the master), EXEC_MAX_CHANNELS at a time, so a batch
+        takes about as long as its slowest command. timeout limits each
+        command and overall_timeout the whole batch. A command that fails
+        gives (None, error) like execute_command and does not affect the
+        others.
+        """
+        commands = list(commands)
+        if not commands:
+            return []
+        deadline = time.monotonic() + overall_timeout if overall_timeout else None
+        transport = self._exec_transport()
+        with span("ssh.exec_many", transport=transport, commands=len(commands)) as attributes:
+            logger.debug("Executing %d commands: %s", len(commands), commands)
+            if transport == "agent":
+                results = self._exec_agent(commands, timeout, deadline)
+            else:
+                workers = min(len(commands), EXEC_MAX_CHANNELS)
+                with ThreadPoolExecutor(workers, thread_name_prefix="Exec") as pool:
+                    results = list(pool.map(
+                        lambda command: self._exec_one(command, timeout, deadline), commands
+                    ))
+            failures = sum(1 for stdout, _ in results if stdout is None)
+            if failures:
+                count("ssh.exec.failures", failures)
+                attributes["error"] = f"{failures} of {len(commands)} commands failed"
+            return results
+
+    def _exec_transport(self):
+        if self.agent and self.agent.alive:
+            return "agent"
+        return "master" if self.master else "exec"
+
+    def _exec_agent(self, commands, timeout, deadline=None):
+        # The agent runs every command on its own thread and kills any
+        # that overrun, so the batch needs one round trip
+        limit = self._time_left(timeout, deadline)
+        try:
+            responses = self.agent.call_many(
+                [("exec", {"cmd": command, "timeout": limit}) for command in commands],
+                # Leave time for the answer of a command killed at the limit
+                timeout=limit + 2
+            )
+        except Exception as e:
+            responses = [e] * len(commands)
+        results = []
+        for response in responses:
+            if isinstance(response, Exception):
+                logger.warning("Command execution error: %s", response)
+                results.append((None, str(response)))
+            elif response.get("timed_out"):
+                logger.warning("Command execution error: timed out after %.1fs", limit)
+                results.append((None, f"Timed out after {limit:.1f}s"))
+            else:
+                results.append((response["stdout"], response["stderr"]))
+        return results
+
+    def _exec_one(self, command, timeout, deadline=None):
+        # One command over the master or its own paramiko channel
+        try:
+            if not (self.ssh or self.master):
                 raise Exception("No SSH connection")
-            print(f"Executing command: {command}")
-            stdin, stdout, stderr = self.ssh.exec_command(command, timeout=10)
-            stdout_str = stdout.read().decode()
-            stderr_str = stderr.read().decode()
-            print(f"stdout: {stdout_str}")
-            print(f"stderr: {stderr_str}")
-            return stdout_str, stderr_str
+            limit = self._time_left(timeout, deadline)
+            if limit <= 0:
+                raise TimeoutError("Batch timed out before the command started")
+            if self.master:
+                return run_command(self.master, command, timeout=limit)
+            return self._exec_channel(command, limit)
         except Exception as e:
-            print(f"Command execution error: {str(e)}")
-            return None, str(e)
+            logger.warning("Command execution error: %s", e)
+            return None, str(e) or type(e).__name__
 
-    def cleanup_screens(self):
-        """Clean up multiple screen sessions"""
+    def _exec_channel(self, command, timeout):
+        # Drains stdout and stderr together: reading one to the end first
+        # stalls the command once the other fills its channel window
+        deadline = time.monotonic() + timeout
+        channel = self.ssh.get_transport().open_session(timeout=timeout)
         try:
-            # First, try to detach from any attached screens
-            self.execute_command("screen -d minecraft")
-            
-            # Get list of minecraft screens
-            stdout, _ = self.execute_command("screen -list | grep minecraft")
-            if stdout:
-                # Kill all minecraft screen sessions
-                self.execute_command("pkill -f 'SCREEN.*minecraft'")
-                # Clean up dead screens
-                self.execute_command("screen -wipe")
+            channel.exec_command(command)
+            stdout, stderr = [], []
+            while True:
+                # Checked every pass: a command that never stops writing
+                # must time out too
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise TimeoutError(f"Timed out after {timeout:.1f}s")
+                if channel.recv_ready():
+                    stdout.append(channel.recv(STREAM_CHUNK_SIZE))
+                elif channel.recv_stderr_ready():
+                    stderr.append(channel.recv_stderr(STREAM_CHUNK_SIZE))
+                elif channel.eof_received or channel.closed:
+                    # Output that raced the EOF is read on the next pass
+                    if not (channel.recv_ready() or channel.recv_stderr_ready()):
+                        break
+                else:
+                    # The channel is readable on output to either stream and at EOF
+                    select.select([channel], [], [], remaining)
+            return (b"".join(stdout).decode(errors="replace"),
+                    b"".join(stderr).decode(errors="replace"))
+        finally:
+            channel.close()
+
+    @staticmethod
+    def _time_left(timeout, deadline):
+        if deadline is None:
+            return timeout
+        return min(timeout, deadline - time.monotonic())
+
+    def stream_command(self, command, sink, stdin=None, timeout=None, chunk_size=STREAM_CHUNK_SIZE):
+        """Run a long command, passing its stdout to sink(bytes) chunk by chunk
+
+        Memory stays at one chunk however much the command writes, so it
+        suits archives of any size. stdin (bytes) is fed from another
+        thread while output is read. timeout limits each read, not the
+        whole command. Returns (exit status, stderr text).
+        """
+        if self.master:
+            return self._stream_process(command, sink, stdin, timeout, chunk_size)
+        if not self.ssh:
+            raise Exception("No SSH connection")
+        with span("ssh.stream"):
+            channel = self.ssh.get_transport().open_session()
+            try:
+                channel.settimeout(timeout)
+                channel.exec_command(command)
+                if stdin is not None:
+                    def feed():
+                        channel.sendall(stdin)
+                        channel.shutdown_write()
+                    threading.Thread(target=feed, name="StreamStdin", daemon=True).start()
+                else:
+                    channel.shutdown_write()
+                while True:
+                    data = channel.recv(chunk_size)
+                    if not data:
+                        break
+                    sink(data)
+                stderr = channel.makefile_stderr("rb").read().decode(errors="replace")
+                return channel.recv_exit_status(), stderr
+            finally:
+                channel.close()
+
+    def _stream_process(self, command, sink, stdin, timeout, chunk_size):
+        # stream_command over the OpenSSH master; stderr and stdin get their
+        # own threads so neither pipe can fill up and stall the other
+        with span("ssh.stream"):
+            process = subprocess.Popen(
+                self.master + [command],
+                stdin=subprocess.PIPE if stdin is not None else subprocess.DEVNULL,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE
+            )
+            errors = []
+            reader = threading.Thread(target=lambda: errors.append(process.stderr.read()),
+                                      name="StreamStderr", daemon=True)
+            reader.start()
+            if stdin is not None:
+                def feed():
+                    try:
+                        process.stdin.write(stdin)
+                    finally:
+                        process.stdin.close()
+                threading.Thread(target=feed, name="StreamStdin", daemon=True).start()
+            try:
+                while True:
+                    data = process.stdout.read1(chunk_size)
+                    if not data:
+                        break
+                    sink(data)
+                status = process.wait(timeout=timeout)
+            except BaseException:
+                process.kill()
+                raise
+            reader.join()
+            return status, b"".join(errors).decode(errors="replace")
+
+    def rcon_command(self, command):
+        """Run a console command over RCON and return its response"""
+        if not self.rcon_password:
+            raise RconError("RCON is not configured")
+        client = get_client(self.host, self.rcon_port, self.rcon_password)
+        return strip_colors(client.command(command))
+
+    def send_console_command(self, command):
+        """Run a console command over RCON, falling back to the screen session"""
+        if self.rcon_password:
+            try:
+                return self.rcon_command(command), ""
+            except Exception as e:
+                logger.warning("RCON command failed, using screen: %s", e)
+        return self.execute_command(
+            f"screen -S {shlex.quote(self.instance.screen)} -X stuff {shlex.quote(command + chr(10))}"
+        )
+
+    def save_all(self):
+        """Flush the world to disk"""
+        return self.send_console_command("save-all")
+
+    def list_players(self):
+        """Return the names of online players over RCON, or None if unavailable"""
+        try:
+            response = self.rcon_command("list")
         except Exception as e:
-            print(f"Screen cleanup error: {str(e)}")
+            logger.warning("Player list unavailable: %s", e)
+            return None
+        match = PLAYER_LIST_RE.search(response)
+        if not match:
+            return None
+        return [name.strip() for name in match.group(3).split(",") if name.strip()]
 
     def stop_server(self):
-        """Stop the Minecraft server"""
+        """Stop the Minecraft server gracefully"""
         try:
-            print("Attempting to stop server...")
-            
-            if not self.is_server_running():
-                return "Server is not running", ""
-            
-            # Send stop command to all possible screen sessions
-            commands = [
-                "screen -S minecraft -X stuff 'stop\n'",
-                "screen -r minecraft -X stuff 'stop\n'",
-                "screen -d minecraft",  # Detach from screen if attached
-                f"pkill -f 'java.*paper.jar'"  # Fallback: kill Java process directly
-            ]
-            
-            output = []
-            errors = []
-            
-            for cmd in commands:
-                stdout, stderr = self.execute_command(cmd)
-                if stdout:
-                    output.append(stdout)
-                if stderr:
-                    errors.append(stderr)
-            
-            # Clean up screens after stopping
-            self.cleanup_screens()
-            
-            return "\n".join(output), "\n".join(errors)
-            
+            logger.info("Attempting to stop server...")
+            return self.lifecycle.stop()
         except Exception as e:
-            print(f"Stop server error: {str(e)}")
+            logger.warning("Stop server error: %s", e)
             return None, str(e)
+        finally:
+            self.invalidate_cache()
+
+    def start_command(self):
+        """Shell command that launches the server in a new screen session"""
+        return self.instance.start_command()
 
     def start_server(self):
         """Start the Minecraft server"""
         try:
-            print("Attempting to start server...")
-            
-            # Clean up any existing screens first
-            self.cleanup_screens()
-            
-            if self.is_server_running():
-                return "Server is already running", ""
-            
-            # Start the server in a new screen session
-            cmd = "cd /home/minecraft/minecraft && screen -dmS minecraft java -Xms4G -Xmx4G -jar paper.jar --nogui"
-            stdout, stderr = self.execute_command(cmd)
-            
-            return stdout, stderr
-            
+            logger.info("Attempting to start server...")
+            return self.lifecycle.start()
         except Exception as e:
-            print(f"Start server error: {str(e)}")
+            logger.warning("Start server error: %s", e)
             return None, str(e)
+        finally:
+            self.invalidate_cache()
+
+    def backup(self, full=False):
+        """Back up the worlds (blocking; see BackupManager); returns (stdout, stderr)"""
+        logger.info("Starting backup...")
+        return self.backups.backup(full)
+
+    def server_pids(self, fresh=False):
+        """Return the PIDs of this instance's Java processes.
+
+        Both find_server_pid() and is_server_running() read the host scan
+        of discover(), cached for process_cache_ttl seconds. Concurrent
+        callers share a scan already in progress. fresh=True always
+        rescans.
+        """
+        directory = self.server_directory()
+        return [proc["pid"] for proc in self.discover(fresh) if self.instance.owns(proc, directory)]
+
+    def server_directory(self):
+        """The instance directory with symlinks resolved on the host
+
+        Process working directories and jar paths come back resolved, so
+        they are compared with this rather than the configured path.
+        Resolved once per connection.
+        """
+        if self._server_directory is None:
+            stdout, stderr = self.execute_command(self.instance.resolve_command())
+            if stdout is None:
+                raise Exception(stderr)
+            # Empty when the directory does not exist yet
+            self._server_directory = stdout.strip() or self.instance.directory
+        return self._server_directory
+
+    def discover(self, fresh=False):
+        """Find every Java server on the host in one remote scan.
+
+        Returns describe_process() dicts with "pid", "cwd", "jar", "jar_dir",
+        "port", "xms", "xmx" and "args", whichever instance they belong to. Java
+        processes with neither a jar nor a server.properties are left out.
+        """
+        if fresh:
+            self.cache.invalidate("java")
+        return self.cache.get("java", self._scan_java, self.process_cache_ttl)
+
+    def _scan_java(self):
+        if self.agent and self.agent.alive:
+            # Scan /proc in the agent instead of spawning a shell loop
+            procs = [
+                describe_process(proc["pid"], proc["cwd"], proc["args"], proc["properties_port"],
+                                 proc["jar_dir"])
+                for proc in self.agent.call("java")["procs"]
+            ]
+        else:
+            stdout, stderr = self.execute_command(JAVA_SCAN_COMMAND)
+            if stdout is None:
+                raise Exception(stderr)
+            procs = parse_java_scan(stdout)
+        return [proc for proc in procs if proc["jar"] or proc["port"]]
+
+    def port_conflict(self):
+        """Describe another Java server bound to this instance's game port, or None"""
+        for proc in self.discover():
+            if proc["port"] == self.server_port and not self.instance.owns(proc, self.server_directory()):
+                return (f"Port {self.server_port} is used by {proc['jar'] or 'java'} "
+                        f"in {proc['cwd']} (pid {proc['pid']})")
+        return None
 
-    def is_server_running(self):
-        """Check if server is running"""
+    def find_server_pid(self, fresh=False):
+        """Return the PID of the server's Java process, or None"""
         try:
-            # Use a more reliable command combination
-            cmd = "ps aux | grep -v grep | grep 'java.*paper.jar' || true"
-            stdout, _ = self.execute_command(cmd)
-            return bool(stdout and 'paper.jar' in stdout)
+            pids = self.server_pids(fresh)
+            return pids[0] if pids else None
         except Exception as e:
-            print(f"Server status check error: {str(e)}")
-            return False
+            logger.warning("Server PID lookup error: %s", e)
+            return None
+
+    def is_server_running(self, fresh=False):
+        """Check if server is running
+
+        Returns None when the server cannot be reached, so a lost
+        connection is never mistaken for a stopped server.
+        """
+        try:
+            return bool(self.server_pids(fresh))
+        except Exception as e:
+            logger.warning("Server status check error: %s", e)
+            return None
+
+    def invalidate_cache(self):
+        """Forget cached process state, e.g. after a lifecycle event"""
+        self.cache.invalidate()
+
+    def watch_events(self, callback):
+        """Stream server lifecycle events from the remote agent.
+
+        callback receives messages whose "event" is one of "state",
+        "launched", "ready", "stopping" or "exited", and None if the
+        stream ends. Returns the subscription id, or None when events are
+        unavailable and the caller should keep polling.
+        """
+        if not (self.agent and self.agent.alive):
+            return None
+        try:
+            return self.agent.subscribe(
+                "watch",
+                callback,
+                directory=self.instance.directory,
+                jar=self.instance.jar,
+                log=self.server_log
+            )
+        except Exception as e:
+            logger.warning("Event watch unavailable: %s", e)
+            return None
+
+    def get_resources(self, include_tps=True):
+        """Collect host, process, JVM and TPS stats.
+
+        Returns a dict with "host" (load, cpus, memory), "process" (pid,
+        cpu_percent, rss_kb, threads), "jvm" (heap and GC stats from
+        jstat), "tps" (tps_1m/5m/15m and mspt) and "errors" for any part
+        that could not be collected, or None if nothing could be.
+
+        The agent collects everything in one round trip. Without it the
+        host, process and jstat commands run side by side through
+        execute_many, and TPS is only read over RCON.
+        """
+        agent = self.agent and self.agent.alive
+        rcon = None
+        if include_tps and self.rcon_password:
+            # Ask RCON while the rest is collected
+            rcon = ThreadPoolExecutor(2, thread_name_prefix="Tps")
+            tps = rcon.submit(self.rcon_command, "tps")
+            mspt = rcon.submit(self.rcon_command, "mspt")
+            rcon.shutdown(wait=False)
+        try:
+            if agent:
+                params = {"directory": self.instance.directory, "jar": self.instance.jar}
+                if include_tps and not self.rcon_password:
+                    # Without RCON the agent reads TPS back from the console log
+                    params.update(screen=self.instance.screen, log=self.server_log)
+                resources = self.agent.call("resources", timeout=15, **params)
+            else:
+                resources = self._shell_resources()
+        except Exception as e:
+            logger.warning("Resource check error: %s", e)
+            return None
+
+        if rcon:
+            try:
+                resources["tps"] = parse_tps(tps.result(), mspt.result())
+            except Exception as e:
+                resources["errors"]["tps"] = str(e)
+        return resources
+
+    def _shell_resources(self):
+        # The agent's resources op as one execute_many batch; jstat starts
+        # a JVM, so running it alongside the rest saves most of a second
+        resources = {"host": None, "process": None, "jvm": None, "tps": None, "errors": {}}
+        pids = self.server_pids()
+        commands = [HOST_STATS_COMMAND]
+        if pids:
+            pid = pids[0]
+            commands += [
+                f"getconf CLK_TCK; cat /proc/{pid}/stat; grep '^VmRSS:' /proc/{pid}/status",
+                f"jstat -gc {pid}",
+            ]
+        parsers = [
+            ("host", parse_host_stats),
+            ("process", lambda text: self._parse_process_stats(pids[0], text)),
+            ("jvm", parse_jstat),
+        ]
+        results = self.execute_many(commands, timeout=10, overall_timeout=15)
+        for (key, parse), (stdout, stderr) in zip(parsers, results):
+            if stdout is None:
+                resources["errors"][key] = stderr
+                continue
+            try:
+                resources[key] = parse(stdout)
+            except (ValueError, IndexError) as e:
+                resources["errors"][key] = stderr.strip() or str(e)
+        return resources
+
+    def _parse_process_stats(self, pid, text):
+        lines = text.splitlines()
+        clock_ticks = int(lines[0])
+        # Skip "pid (comm)"; comm may contain spaces
+        fields = lines[1].rsplit(")", 1)[1].split()
+        ticks = int(fields[11]) + int(fields[12])  # utime + stime
+        now = time.monotonic()
+        cpu_percent = None
+        previous = self._cpu_sample
+        if previous and previous[0] == pid and now > previous[2]:
+            seconds = (ticks - previous[1]) / clock_ticks
+            cpu_percent = round(100.0 * seconds / (now - previous[2]), 1)
+        self._cpu_sample = (pid, ticks, now)
+        rss_kb = int(lines[2].split()[1]) if len(lines) > 2 else None
+        return {"pid": pid, "cpu_percent": cpu_percent, "rss_kb": rss_kb, "threads": int(fields[17])}
+
+    def stream_log(self, callback, backlog=0):
+        """Stream lines appended to the server console log.
+
+        callback receives messages with "lines" (a list of new lines) and
+        "dropped" (lines skipped to keep the message bounded), and None
+        if the stream ends. Returns the subscription id, or None when the
+        remote agent is unavailable.
+        """
+        if not (self.agent and self.agent.alive):
+            return None
+        try:
+            return self.agent.subscribe("tail", callback, log=self.server_log, backlog=backlog)
+        except Exception as e:
+            logger.warning("Log streaming unavailable: %s", e)
+            return None
 
     def __del__(self):
         """Cleanup when object is destroyed"""
-        if self.ssh:
-            self.ssh.close()
+        self.close()
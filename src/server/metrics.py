@@ -0,0 +1,193 @@
+import array
+import logging
+import sqlite3
+import threading
+import time
+from collections import deque
+from src.server.database import connect, open_database
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS samples "
+    "(ts REAL NOT NULL, metric TEXT NOT NULL, value REAL NOT NULL)",
+    "CREATE INDEX IF NOT EXISTS samples_metric_ts ON samples (metric, ts)",
+)
+
+
+def snapshot_values(snapshot, prefix=""):
+    """Yield (metric, value) pairs for a poller snapshot"""
+    if snapshot["running"] is not None:
+        yield prefix + "running", 1 if snapshot["running"] else 0
+    status = snapshot.get("status")
+    if status:
+        yield prefix + "latency_ms", status.latency
+        yield prefix + "players_online", status.players.online
+        yield prefix + "players_max", status.players.max
+    resources = snapshot.get("resources")
+    if resources:
+        yield from resource_values(resources, prefix)
+
+
+def resource_values(resources, prefix=""):
+    """Yield (metric, value) pairs for ServerManager.get_resources output"""
+    host = resources.get("host") or {}
+    process = resources.get("process") or {}
+    jvm = resources.get("jvm") or {}
+    tps = resources.get("tps") or {}
+    if host.get("load"):
+        yield prefix + "host_load1", host["load"][0]
+    yield prefix + "process_cpu_percent", process.get("cpu_percent")
+    if process.get("rss_kb") is not None:
+        yield prefix + "process_rss_mb", process["rss_kb"] / 1024
+    if jvm.get("heap_used_kb") is not None:
+        yield prefix + "heap_used_mb", jvm["heap_used_kb"] / 1024
+    yield prefix + "gc_time_s", jvm.get("gc_time_s")
+    yield prefix + "tps_1m", tps.get("tps_1m")
+    yield prefix + "mspt", tps.get("mspt")
+
+
+class RingBuffer:
+    """Fixed-capacity series of (timestamp, value) samples.
+
+    Backed by two preallocated ``array('d')`` buffers, so memory stays at
+    16 bytes per slot no matter how long the monitor runs.
+    """
+
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.times = array.array("d", bytes(8 * capacity))
+        self.values = array.array("d", bytes(8 * capacity))
+        self.start = 0
+        self.size = 0
+
+    def __len__(self):
+        return self.size
+
+    def append(self, timestamp, value):
+        """Add a sample, overwriting the oldest one when full"""
+        index = (self.start + self.size) % self.capacity
+        self.times[index] = timestamp
+        self.values[index] = value
+        if self.size < self.capacity:
+            self.size += 1
+        else:
+            self.start = (self.start + 1) % self.capacity
+
+    def latest(self):
+        """Return the newest (timestamp, value), or None if empty"""
+        if not self.size:
+            return None
+        index = (self.start + self.size - 1) % self.capacity
+        return self.times[index], self.values[index]
+
+    def samples(self, since=None):
+        """Return samples in time order, optionally only those at or after since"""
+        first = self._bisect(since) if since is not None else 0
+        result = []
+        for offset in range(first, self.size):
+            index = (self.start + offset) % self.capacity
+            result.append((self.times[index], self.values[index]))
+        return result
+
+    def _bisect(self, timestamp):
+        # Samples are appended in time order, so binary search the ring
+        low, high = 0, self.size
+        while low < high:
+            middle = (low + high) // 2
+            if self.times[(self.start + middle) % self.capacity] < timestamp:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+
+class MetricsStore:
+    """In-memory time series for poll results, flushed to SQLite.
+
+    Every metric gets its own RingBuffer. Samples recorded since the last
+    flush are queued and appended to the ``samples`` table of the SQLite
+    file at ``path`` every ``flush_interval`` seconds.
+    """
+
+    def __init__(self, path=None, capacity=86400, flush_interval=60):
+        self.path = path
+        self.capacity = capacity
+        self.flush_interval = flush_interval
+        self._series = {}
+        self._pending = deque(maxlen=capacity)
+        self._lock = threading.Lock()
+        self._last_flush = time.monotonic()
+        self._database_lock = threading.Lock()
+        self._opened = False
+
+    def open(self):
+        """Create the SQLite file if needed; later calls do nothing
+
+        The constructor does not touch the disk, so a GUI can open the
+        file from its worker thread. Flushes and queries open it first.
+        """
+        with self._database_lock:
+            if not self._opened:
+                self._opened = True
+                if self.path:
+                    self.path = open_database(self.path, SCHEMA, "Metrics")
+
+    def record(self, name, value, timestamp=None):
+        """Add one sample to a metric"""
+        if value is None:
+            return
+        timestamp = time.time() if timestamp is None else timestamp
+        with self._lock:
+            series = self._series.get(name)
+            if series is None:
+                series = self._series[name] = RingBuffer(self.capacity)
+            series.append(timestamp, float(value))
+            if self.path:
+                self._pending.append((timestamp, name, float(value)))
+
+    def record_snapshot(self, snapshot, prefix=""):
+        """Record the metrics carried by a poller snapshot"""
+        for name, value in snapshot_values(snapshot, prefix):
+            self.record(name, value, snapshot["time"])
+
+    def names(self):
+        """Return the names of all recorded metrics"""
+        with self._lock:
+            return sorted(self._series)
+
+    def latest(self, name):
+        """Return the newest (timestamp, value) of a metric, or None"""
+        with self._lock:
+            series = self._series.get(name)
+            return series.latest() if series else None
+
+    def samples(self, name, since=None):
+        """Return in-memory samples of a metric in time order"""
+        with self._lock:
+            series = self._series.get(name)
+            return series.samples(since) if series else []
+
+    def maybe_flush(self):
+        """Flush if flush_interval has passed since the last flush"""
+        if time.monotonic() - self._last_flush >= self.flush_interval:
+            self.flush()
+
+    def flush(self):
+        """Append queued samples to the SQLite file"""
+        self._last_flush = time.monotonic()
+        self.open()
+        if not self.path:
+            return
+        with self._lock:
+            rows = list(self._pending)
+            self._pending.clear()
+        if not rows:
+            return
+        try:
+            with connect(self.path) as db:
+                db.executemany("INSERT INTO samples (ts, metric, value) VALUES (?, ?, ?)", rows)
+        except sqlite3.Error as e:
+            logger.warning("Metrics flush failed: %s", e)
+            with self._lock:
+                self._pending.extendleft(reversed(rows))
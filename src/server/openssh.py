@@ -0,0 +1,78 @@
+import shutil
+import subprocess
+import threading
+
+
+def ssh_command(host, user, ssh_port=22, control_path=None):
+    """Return the argv prefix for running a command over an OpenSSH master"""
+    argv = ["ssh", "-p", str(ssh_port), "-o", "BatchMode=yes", "-o", "ControlMaster=no"]
+    if control_path:
+        argv += ["-S", control_path]
+    return argv + [f"{user}@{host}"]
+
+
+def master_running(host, user, ssh_port=22, control_path=None, timeout=2):
+    """True if an OpenSSH ControlMaster connection to the host is open.
+
+    Without control_path the ControlPath from ~/.ssh/config is used.
+    """
+    if not shutil.which("ssh"):
+        return False
+    argv = ssh_command(host, user, ssh_port, control_path)
+    argv[1:1] = ["-O", "check"]
+    try:
+        result = subprocess.run(argv, stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL,
+                                stderr=subprocess.DEVNULL, timeout=timeout)
+    except (OSError, subprocess.TimeoutExpired):
+        return False
+    return result.returncode == 0
+
+
+def run_command(argv, command, timeout=10):
+    """Run one remote command over the master; returns (stdout, stderr)"""
+    result = subprocess.run(argv + [command], stdin=subprocess.DEVNULL, capture_output=True,
+                            timeout=timeout)
+    return result.stdout.decode(errors="replace"), result.stderr.decode(errors="replace")
+
+
+class ProcessChannel:
+    """An ``ssh`` subprocess that quacks like a paramiko Channel.
+
+    RemoteAgent only needs sendall(), makefile(), close(), ``closed`` and
+    exit_status_ready(), so the agent can run over an existing OpenSSH
+    master connection instead of a paramiko transport.
+    """
+
+    def __init__(self, argv, command):
+        self.process = subprocess.Popen(
+            argv + [command],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL
+        )
+        self.closed = False
+        self._lock = threading.Lock()
+
+    def sendall(self, data):
+        with self._lock:
+            self.process.stdin.write(data)
+            self.process.stdin.flush()
+
+    def makefile(self, mode="rb"):
+        return self.process.stdout
+
+    def exit_status_ready(self):
+        return self.process.poll() is not None
+
+    def close(self):
+        if self.closed:
+            return
+        self.closed = True
+        try:
+            self.process.stdin.close()
+        except OSError:
+            pass
+        try:
+            self.process.wait(timeout=2)
+        except subprocess.TimeoutExpired:
+            self.process.kill()
@@ -0,0 +1,297 @@
+import logging
+import sqlite3
+import threading
+import time
+from src.server.database import connect, open_database
+
+logger = logging.getLogger(__name__)
+
+# Placeholder entries some servers put in the status sample ("...and 5 more")
+NULL_UUID = "00000000-0000-0000-0000-000000000000"
+
+SCHEMA = (
+    # One row per visit; leave_ts stays NULL while the player is online
+    "CREATE TABLE IF NOT EXISTS sessions ("
+    "player TEXT NOT NULL, join_ts REAL NOT NULL, leave_ts REAL, last_seen REAL NOT NULL, "
+    "PRIMARY KEY (player, join_ts))",
+    "CREATE INDEX IF NOT EXISTS sessions_join_ts ON sessions (join_ts)",
+    "CREATE INDEX IF NOT EXISTS sessions_open ON sessions (player) WHERE leave_ts IS NULL",
+    # Running totals so all-time questions are single index lookups
+    "CREATE TABLE IF NOT EXISTS player_totals ("
+    "player TEXT PRIMARY KEY, seconds REAL NOT NULL, sessions INTEGER NOT NULL, "
+    "first_seen REAL NOT NULL, last_seen REAL NOT NULL)",
+    "CREATE INDEX IF NOT EXISTS player_totals_seconds ON player_totals (seconds)",
+    # hour is the UNIX time of the start of the hour
+    "CREATE TABLE IF NOT EXISTS player_hours ("
+    "hour INTEGER PRIMARY KEY, player_seconds REAL NOT NULL, peak INTEGER NOT NULL)",
+)
+
+
+def status_names(status):
+    """Return (names, complete) from the player sample of a status response
+
+    complete is True when the sample lists everybody who is online, so a
+    name missing from it means that player has left.
+    """
+    sample = getattr(status.players, "sample", None) or []
+    names = {player.name for player in sample if getattr(player, "id", None) != NULL_UUID}
+    return names, len(names) >= status.players.online
+
+
+class PlayerTracker:
+    """Player sessions built from status samples and full player lists.
+
+    observe() is fed every poll. A player joins the first time they are
+    seen, and leaves at their last sighting once a complete list no longer
+    contains them. Status samples are capped at a handful of names, so
+    they only end sessions when they cover everyone online; full lists
+    from RCON or Query always do.
+
+    Sessions, per-player totals and hourly concurrency are appended to
+    SQLite every ``flush_interval`` seconds. Every query is an index
+    lookup or range scan, so months of history stay fast.
+    """
+
+    def __init__(self, path, flush_interval=60, max_gap=120):
+        self.path = path
+        self.flush_interval = flush_interval
+        self.max_gap = max_gap
+        self._open = {}
+        self._last_seen = {}
+        self._last_observed = None
+        self._joined = []
+        self._left = []
+        self._hours = {}
+        self._lock = threading.Lock()
+        self._last_flush = time.monotonic()
+        self._database_lock = threading.Lock()
+        self._opened = False
+
+    def open(self):
+        """Create the SQLite file if needed; later calls do nothing
+
+        The constructor does not touch the disk, so a GUI can open the
+        file from its worker thread. Flushes and queries open it first.
+        """
+        with self._database_lock:
+            if not self._opened:
+                self._opened = True
+                if self.path:
+                    self.path = open_database(self.path, SCHEMA, "Player", setup=self._close_dangling)
+
+    def observe(self, timestamp, names, online, complete):
+        """Record one sighting of the players online
+
+        names: players known to be online
+        online: player count reported by the server
+        complete: True if names lists every online player
+        """
+        names = set(names)
+        with self._lock:
+            for name in names - self._open.keys():
+                self._open[name] = timestamp
+                self._joined.append((name, timestamp))
+            if complete:
+                for name in self._open.keys() - names:
+                    self._close(name, self._last_seen.get(name, timestamp))
+            for name in names:
+                self._last_seen[name] = timestamp
+
+            hour = int(timestamp // 3600 * 3600)
+            seconds, peak = self._hours.get(hour, (0.0, 0))
+            if self._last_observed is not None:
+                # Player-seconds since the last poll, ignoring long outages
+                gap = min(max(0.0, timestamp - self._last_observed), self.max_gap)
+                seconds += online * gap
+            self._hours[hour] = (seconds, max(peak, online))
+            self._last_observed = timestamp
+
+    def observe_status(self, timestamp, status, full_names=None):
+        """Record a status response, preferring a full player list when given"""
+        # An empty list while the status counts players online is a failed
+        # lookup, not a roster; trusting it would close every session
+        if full_names is not None and (full_names or not status.players.online):
+            names, complete = full_names, True
+        else:
+            names, complete = status_names(status)
+        self.observe(timestamp, names, max(status.players.online, len(names)), complete)
+
+    def server_stopped(self, timestamp):
+        """End every open session at its last sighting"""
+        self.observe(timestamp, (), 0, True)
+
+    def online(self):
+        """Return {player: join time} for players online now"""
+        with self._lock:
+            return dict(self._open)
+
+    def playtime(self, player, since=None, until=None):
+        """Seconds played by one player, optionally clipped to [since, until)"""
+        now = time.time()
+        with self._lock:
+            joined = self._open.get(player)
+            seen = self._last_seen.get(player, now)
+        self.flush()
+
+        if since is None and until is None:
+            row = self._fetchone("SELECT seconds FROM player_totals WHERE player = ?", (player,))
+            total = row[0] if row else 0.0
+            if joined is not None:
+                total += seen - joined
+            return total
+
+        since = 0.0 if since is None else since
+        until = now if until is None else until
+        row = self._fetchone(
+            "SELECT SUM(MIN(leave_ts, ?) - MAX(join_ts, ?)) FROM sessions "
+            "WHERE player = ? AND join_ts < ? AND leave_ts > ?",
+            (until, since, player, until, since)
+        )
+        total = (row[0] if row else None) or 0.0
+        if joined is not None and joined < until and seen > since:
+            total += min(seen, until) - max(joined, since)
+        return total
+
+    def top_players(self, limit=10):
+        """Return [(player, seconds, sessions)] by all-time playtime"""
+        self.flush()
+        return self._fetchall(
+            "SELECT player, seconds, sessions FROM player_totals ORDER BY seconds DESC LIMIT ?",
+            (limit,)
+        )
+
+    def sessions(self, player, since=None, until=None):
+        """Return [(join_ts, leave_ts)] for one player; leave_ts is None while online"""
+        self.flush()
+        return self._fetchall(
+            "SELECT join_ts, leave_ts FROM sessions WHERE player = ? AND join_ts >= ? AND join_ts < ? "
+            "ORDER BY join_ts",
+            (player, since or 0.0, until or time.time() + 1)
+        )
+
+    def peak_concurrency(self, since=None, until=None):
+        """Return (peak players, hour it happened) within [since, until), or None"""
+        self.flush()
+        row = self._fetchone(
+            "SELECT peak, hour FROM player_hours WHERE hour >= ? AND hour < ? "
+            "ORDER BY peak DESC, hour DESC LIMIT 1",
+            self._hour_range(since, until)
+        )
+        return tuple(row) if row else None
+
+    def heatmap(self, since=None, until=None):
+        """Average players online by local weekday (Monday = 0) and hour of day
+
+        Returns a 7 x 24 list of lists; hours without data count as 0.
+        """
+        self.flush()
+        rows = self._fetchall(
+            "SELECT hour, player_seconds FROM player_hours WHERE hour >= ? AND hour < ?",
+            self._hour_range(since, until)
+        )
+        totals = [[0.0] * 24 for _ in range(7)]
+        counts = [[0] * 24 for _ in range(7)]
+        for hour, player_seconds in rows:
+            local = time.localtime(hour)
+            totals[local.tm_wday][local.tm_hour] += player_seconds / 3600
+            counts[local.tm_wday][local.tm_hour] += 1
+        return [
+            [round(total / count, 2) if count else 0.0 for total, count in zip(day_totals, day_counts)]
+            for day_totals, day_counts in zip(totals, counts)
+        ]
+
+    def maybe_flush(self):
+        """Flush if flush_interval has passed since the last flush"""
+        if time.monotonic() - self._last_flush >= self.flush_interval:
+            self.flush()
+
+    def flush(self):
+        """Write joins, leaves, totals and hourly aggregates to SQLite"""
+        self._last_flush = time.monotonic()
+        self.open()
+        if not self.path:
+            return
+        with self._lock:
+            joined, self._joined = self._joined, []
+            left, self._left = self._left, []
+            # Hourly values are deltas since the last flush, added to the stored rows
+            hours, self._hours = self._hours, {}
+            open_seen = [(self._last_seen.get(name, joined_at), name, joined_at)
+                         for name, joined_at in self._open.items()]
+        try:
+            with connect(self.path) as db:
+                db.executemany(
+                    "INSERT OR IGNORE INTO sessions (player, join_ts, leave_ts, last_seen) "
+                    "VALUES (?, ?, NULL, ?)",
+                    [(name, joined_at, joined_at) for name, joined_at in joined]
+                )
+                db.executemany(
+                    "UPDATE sessions SET last_seen = ? WHERE player = ? AND join_ts = ?",
+                    open_seen
+                )
+                for name, joined_at, left_at in left:
+                    self._end_session(db, name, joined_at, left_at)
+                db.executemany(
+                    "INSERT INTO player_hours (hour, player_seconds, peak) VALUES (?, ?, ?) "
+                    "ON CONFLICT (hour) DO UPDATE SET player_seconds = player_seconds + excluded.player_seconds, "
+                    "peak = MAX(peak, excluded.peak)",
+                    [(hour, seconds, peak) for hour, (seconds, peak) in hours.items()]
+                )
+        except sqlite3.Error as e:
+            logger.warning("Player history flush failed: %s", e)
+            with self._lock:
+                self._joined[:0] = joined
+                self._left[:0] = left
+                for hour, (seconds, peak) in hours.items():
+                    newer_seconds, newer_peak = self._hours.get(hour, (0.0, 0))
+                    self._hours[hour] = (seconds + newer_seconds, max(peak, newer_peak))
+
+    def _close(self, name, left_at):
+        # Callers hold self._lock
+        joined_at = self._open.pop(name)
+        self._last_seen.pop(name, None)
+        self._left.append((name, joined_at, max(left_at, joined_at)))
+
+    def _end_session(self, db, name, joined_at, left_at):
+        db.execute(
+            "INSERT OR IGNORE INTO sessions (player, join_ts, leave_ts, last_seen) VALUES (?, ?, ?, ?)",
+            (name, joined_at, left_at, left_at)
+        )
+        db.execute(
+            "UPDATE sessions SET leave_ts = ?, last_seen = ? WHERE player = ? AND join_ts = ?",
+            (left_at, left_at, name, joined_at)
+        )
+        db.execute(
+            "INSERT INTO player_totals (player, seconds, sessions, first_seen, last_seen) "
+            "VALUES (?, ?, 1, ?, ?) "
+            "ON CONFLICT (player) DO UPDATE SET seconds = seconds + excluded.seconds, "
+            "sessions = sessions + 1, last_seen = MAX(last_seen, excluded.last_seen)",
+            (name, left_at - joined_at, joined_at, left_at)
+        )
+
+    def _close_dangling(self, db):
+        # Sessions left open by a crash end at their last recorded sighting
+        rows = db.execute(
+            "SELECT player, join_ts, last_seen FROM sessions WHERE leave_ts IS NULL"
+        ).fetchall()
+        for name, joined_at, seen in rows:
+            self._end_session(db, name, joined_at, seen)
+
+    def _hour_range(self, since, until):
+        since = 0 if since is None else int(since // 3600 * 3600)
+        until = time.time() + 3600 if until is None else until
+        return since, until
+
+    def _fetchone(self, query, params):
+        self.open()
+        if not self.path:
+            return None
+        with connect(self.path) as db:
+            return db.execute(query, params).fetchone()
+
+    def _fetchall(self, query, params):
+        self.open()
+        if not self.path:
+            return []
+        with connect(self.path) as db:
+            return [tuple(row) for row in db.execute(query, params).fetchall()]
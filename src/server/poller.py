@@ -0,0 +1,299 @@
+import logging
+import queue
+import threading
+import time
+from src.telemetry import span
+
+logger = logging.getLogger(__name__)
+
+_CHECK = object()
+
+# Lifecycle phase implied by each event from ServerManager.watch_events
+EVENT_PHASES = {
+    "launched": "STARTING",
+    "ready": "RUNNING",
+    "stopping": "STOPPING",
+    "exited": "STOPPED",
+}
+
+
+def poll_server(server_manager, server_stats, running=None, startup_mode=False):
+    """Collect one status snapshot for a server (blocking)
+
+    running: known process state; when None the process table is checked
+    startup_mode: the server is booting, so keep pinging for longer
+
+    "running" is None in the result when the process table could not be
+    read and the server did not answer a ping either.
+    """
+    if running is None:
+        running = server_manager.is_server_running()
+    status = None
+    if running is not False:
+        status = server_stats.get_status(startup_mode)
+        if running is None and status is not None:
+            # Unreachable over SSH, but the game port answers
+            running = True
+    return {
+        "time": time.time(),
+        "running": running,
+        "status": status,
+    }
+
+
+class StatusPoller:
+    """Run SSH and status checks on a background thread.
+
+    Results are posted to ``results`` (a thread-safe queue) and the GUI
+    drains it with ``root.after``, so the Tk event loop never waits on
+    the network.
+
+    When the server manager can stream lifecycle events, the poller
+    tracks the server's phase from them and posts ``("event", name,
+    phase)``. Process scans then only run every ``fallback_interval``
+    seconds as a safety net, and a stopped server is not pinged at all.
+
+    With ``instance_interval`` set, every Java server on the host is also
+    listed in the snapshot's "instances" at most that often.
+    """
+
+    def __init__(self, server_manager, server_stats, interval=5, startup_interval=2,
+                 metrics=None, fallback_interval=60, resource_interval=15, collect_tps=True,
+                 players=None, player_list_interval=30, use_query=False, alerts=None,
+                 instance_interval=None):
+        self.server_manager = server_manager
+        self.server_stats = server_stats
+        self.metrics = metrics
+        self.alerts = alerts
+        self.players = players
+        self.player_list_interval = player_list_interval
+        self.use_query = use_query
+        self._last_player_list = 0
+        self.fallback_interval = fallback_interval
+        self.resource_interval = resource_interval
+        self.collect_tps = collect_tps
+        self._last_resources = 0
+        self.instance_interval = instance_interval
+        self._last_instances = 0
+        self.phase = None
+        self._watch_id = None
+        self._last_scan = 0
+        self.interval = interval
+        self.startup_interval = startup_interval
+        self.results = queue.Queue()
+        self._tasks = queue.Queue()
+        self._polling = threading.Event()
+        self._startup_mode = threading.Event()
+        self._stopped = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """Start the worker thread (polling stays paused until enabled)"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._run, name="StatusPoller", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Ask the worker thread to exit after its current task"""
+        self._stopped.set()
+        self._tasks.put(None)
+
+    def enable_polling(self):
+        """Begin periodic status checks, starting with one right away"""
+        self._polling.set()
+        self.submit(self._start_watch)
+        self.request_check()
+
+    def resume(self):
+        """Restart the event stream and check right away, e.g. after a reconnect"""
+        self.submit(self._start_watch)
+        self.request_check(fresh=True)
+
+    def set_startup_mode(self, enabled):
+        """Poll more often while the server is booting"""
+        if enabled:
+            self._startup_mode.set()
+        else:
+            self._startup_mode.clear()
+
+    def request_check(self, fresh=False):
+        """Queue an immediate status check
+
+        fresh: drop cached process and ping results first, so the check
+        cannot report state from before a start or stop
+        """
+        if fresh:
+            self.invalidate()
+        self._tasks.put(_CHECK)
+
+    def invalidate(self):
+        """Forget cached process and ping results"""
+        self.server_manager.invalidate_cache()
+        self.server_stats.invalidate()
+
+    def submit(self, func, *args, callback=None):
+        """Run func(*args) on the worker thread.
+
+        When a callback is given it is posted back as
+        ``("action", callback, result, error)`` for the GUI to invoke.
+        """
+        self._tasks.put((func, args, callback))
+
+    def submit_long(self, func, *args, callback=None):
+        """Run a long task (such as a graceful stop) on its own thread.
+
+        Status checks keep running on the worker thread meanwhile. The
+        result is posted back the same way as for submit().
+        """
+        threading.Thread(
+            target=self._execute,
+            args=(func, args, callback),
+            name="StatusPollerTask",
+            daemon=True
+        ).start()
+
+    def poll_once(self):
+        """Collect one status snapshot (runs on the worker thread)"""
+        with span("poller.tick"):
+            return self._poll()
+
+    def _poll(self):
+        running = None
+        if self.phase and time.monotonic() - self._last_scan < self.fallback_interval:
+            running = self.phase != "STOPPED"
+        else:
+            self._last_scan = time.monotonic()
+
+        snapshot = poll_server(self.server_manager, self.server_stats, running,
+                               self._startup_mode.is_set())
+        snapshot["phase"] = self.phase
+        snapshot["lifecycle"] = self.server_manager.lifecycle.state
+        if snapshot["running"] and time.monotonic() - self._last_resources >= self.resource_interval:
+            self._last_resources = time.monotonic()
+            # Only ask for TPS once the server answers pings
+            include_tps = self.collect_tps and snapshot["status"] is not None
+            snapshot["resources"] = self.server_manager.get_resources(include_tps)
+        if self.instance_interval and time.monotonic() - self._last_instances >= self.instance_interval:
+            self._last_instances = time.monotonic()
+            snapshot["instances"] = self._discover_instances()
+        if self.metrics:
+            self.metrics.record_snapshot(snapshot)
+            self.metrics.maybe_flush()
+        if self.alerts:
+            self.alerts.observe_snapshot(snapshot)
+        if self.players:
+            self._track_players(snapshot)
+        return snapshot
+
+    def _discover_instances(self):
+        # Every Java server on the host, flagged when it is the monitored one
+        manager = self.server_manager
+        try:
+            directory = manager.server_directory()
+            return [dict(proc, monitored=manager.instance.owns(proc, directory))
+                    for proc in manager.discover()]
+        except Exception as e:
+            logger.warning("Instance discovery failed: %s", e)
+            return None
+
+    def _track_players(self, snapshot):
+        if snapshot["running"] is False:
+            self.players.server_stopped(snapshot["time"])
+        elif snapshot["status"] is not None:
+            full_names = None
+            if time.monotonic() - self._last_player_list >= self.player_list_interval:
+                self._last_player_list = time.monotonic()
+                full_names = self._full_player_list()
+            self.players.observe_status(snapshot["time"], snapshot["status"], full_names)
+        self.players.maybe_flush()
+
+    def _full_player_list(self):
+        # The status sample is capped; RCON and Query list everybody
+        if self.server_manager.rcon_password:
+            names = self.server_manager.list_players()
+            if names is not None:
+                return names
+        if self.use_query:
+            try:
+                players = self.server_stats.get_query().players
+                # mcstatus 11 renamed players.names to players.list
+                names = getattr(players, "list", None)
+                if names is None:
+                    names = getattr(players, "names", None)
+                if names is not None:
+                    return list(names)
+            except Exception as e:
+                logger.warning("Player query failed: %s", e)
+        return None
+
+    def _start_watch(self):
+        if self._watch_id is None:
+            self._watch_id = self.server_manager.watch_events(self._on_event)
+
+    def _on_event(self, message):
+        # Runs on the agent reader thread
+        if message is None:
+            # Stream ended; fall back to polling until it is restarted
+            self.phase = None
+            self._watch_id = None
+            self.request_check()
+            return
+
+        event = message.get("event")
+        if event == "state":
+            self.phase = "RUNNING" if message.get("running") else "STOPPED"
+        elif event in EVENT_PHASES:
+            self.phase = EVENT_PHASES[event]
+        else:
+            return
+        self.results.put(("event", event, self.phase))
+        self.request_check(fresh=True)
+
+    def _current_interval(self):
+        if self._startup_mode.is_set():
+            return self.startup_interval
+        return self.interval
+
+    def _run(self):
+        # Open the SQLite history here, not on the (Tk) thread that built us
+        for store in (self.metrics, self.players):
+            if store:
+                store.open()
+        next_check = None
+        while not self._stopped.is_set():
+            timeout = None
+            if self._polling.is_set():
+                if next_check is None:
+                    next_check = time.monotonic()
+                timeout = max(0, next_check - time.monotonic())
+
+            try:
+                task = self._tasks.get(timeout=timeout)
+            except queue.Empty:
+                task = _CHECK
+
+            if task is None:
+                break
+
+            if task is _CHECK:
+                try:
+                    self.results.put(("status", self.poll_once()))
+                except Exception as e:
+                    logger.warning("Status poll error: %s", e)
+                    self.results.put(("error", e))
+                next_check = time.monotonic() + self._current_interval()
+                continue
+
+            self._execute(*task)
+
+    def _execute(self, func, args, callback):
+        result, error = None, None
+        try:
+            result = func(*args)
+        except Exception as e:
+            logger.warning("Background task error: %s", e)
+            error = e
+        if callback:
+            self.results.put(("action", callback, result, error))
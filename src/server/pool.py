@@ -0,0 +1,108 @@
+import logging
+import threading
+from src.server.manager import ServerManager
+from src.server.supervisor import ConnectionSupervisor, CONNECTED
+from src.config import HEALTH_CHECK_INTERVAL, RECONNECT_MAX_DELAY
+
+logger = logging.getLogger(__name__)
+
+class ConnectionPool:
+    """Share one SSH transport and remote agent per host.
+
+    ServerManager instances created with ``pool=`` ask the pool for their
+    connection, so every server on the same host/user/port reuses the
+    transport opened by the first one.
+
+    Each pooled connection has its own ConnectionSupervisor. When it
+    reconnects, every manager sharing the host is pointed at the new
+    transport and agent.
+    """
+
+    def __init__(self, check_interval=HEALTH_CHECK_INTERVAL, max_delay=RECONNECT_MAX_DELAY):
+        self.check_interval = check_interval
+        self.max_delay = max_delay
+        self._connections = {}
+        self._supervisors = {}
+        self._members = {}
+        self._locks = {}
+        self._lock = threading.Lock()
+
+    def acquire(self, host, user, password=None, ssh_port=22, member=None):
+        """Return a connected ServerManager for the host, connecting if needed
+
+        member: the ServerManager sharing the connection; it is re-attached
+        whenever the pooled connection is replaced or reconnects
+        """
+        key = (host, user, ssh_port)
+        with self._lock:
+            key_lock = self._locks.setdefault(key, threading.Lock())
+            if member is not None:
+                members = self._members.setdefault(key, [])
+                if member not in members:
+                    members.append(member)
+
+        # Concurrent callers for the same host wait for a single connect
+        with key_lock:
+            connection = self._connections.get(key)
+            if connection and connection.connected:
+                return connection
+            if connection:
+                # Dead: stop supervising it and free its transport and agent
+                self._retire(key)
+
+            connection = ServerManager(host, user, ssh_port=ssh_port)
+            if not connection.connect(password):
+                if member is not None:
+                    member.auth_failed = connection.auth_failed
+                return None
+            self._connections[key] = connection
+            supervisor = ConnectionSupervisor(
+                connection,
+                check_interval=self.check_interval,
+                max_delay=self.max_delay,
+                on_state=lambda state: self._on_state(key, connection, state)
+            )
+            self._supervisors[key] = supervisor
+            supervisor.start()
+            self._attach_members(key, connection, skip=member)
+            return connection
+
+    def release(self, member):
+        """Stop re-attaching a manager that closed its connection"""
+        with self._lock:
+            for members in self._members.values():
+                if member in members:
+                    members.remove(member)
+
+    def close_all(self):
+        """Close every pooled connection"""
+        with self._lock:
+            keys = list(self._connections)
+        for key in keys:
+            self._retire(key)
+
+    def _retire(self, key):
+        supervisor = self._supervisors.pop(key, None)
+        if supervisor:
+            supervisor.stop()
+        connection = self._connections.pop(key, None)
+        if connection:
+            connection.close()
+
+    def _on_state(self, key, connection, state):
+        # Runs on the supervisor thread
+        if state != CONNECTED:
+            return
+        if self._connections.get(key) is not connection:
+            # Replaced while reconnecting; nothing uses it any more
+            connection.close()
+            return
+        logger.info("Pooled connection to %s restored", key[0])
+        self._attach_members(key, connection)
+
+    def _attach_members(self, key, connection, skip=None):
+        with self._lock:
+            members = list(self._members.get(key, ()))
+        for member in members:
+            if member is not skip:
+                member.attach(connection)
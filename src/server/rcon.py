@@ -0,0 +1,235 @@
+import re
+import socket
+import struct
+import threading
+from src.telemetry import count, span
+
+SERVERDATA_AUTH = 3
+SERVERDATA_AUTH_RESPONSE = 2
+SERVERDATA_EXECCOMMAND = 2
+SERVERDATA_RESPONSE_VALUE = 0
+
+COLOR_CODE_RE = re.compile("§[0-9a-fk-or]", re.IGNORECASE)
+
+
+def strip_colors(text):
+    """Remove Minecraft section-sign formatting codes"""
+    return COLOR_CODE_RE.sub("", text)
+
+
+class RconError(Exception):
+    """Raised when an RCON connection or command fails"""
+
+
+class RconConnectionError(RconError):
+    """Raised when the RCON connection is lost or cannot be opened"""
+
+
+class _NotSentError(RconConnectionError):
+    """The connection failed before the command packet was fully written"""
+
+
+class RconClient:
+    """Persistent, authenticated RCON connection.
+
+    Every command gets a unique request id and a reader thread routes
+    response packets by id, so several threads can share one socket.
+    Each command is followed by an empty RESPONSE_VALUE packet. The
+    server answers packets in order, so the reply to that empty packet
+    marks the end of a response split over several packets. A dropped
+    connection is reopened on the next command. A command is only sent
+    again when the connection failed before it was written, so commands
+    such as ``stop`` or ``give`` never run twice.
+    """
+
+    def __init__(self, host, port, password, timeout=5):
+        self.host = host
+        self.port = port
+        self.password = password
+        self.timeout = timeout
+        self.sock = None
+        self._next_id = 1
+        self._pending = {}
+        self._sentinels = {}
+        self._lock = threading.Lock()
+        self._send_lock = threading.Lock()
+        self._connect_lock = threading.Lock()
+
+    @property
+    def connected(self):
+        """True while the socket is open and authenticated"""
+        return self.sock is not None
+
+    def connect(self):
+        """Open the socket and authenticate"""
+        with self._connect_lock:
+            if self.sock is not None:
+                return
+            sock = socket.create_connection((self.host, self.port), timeout=self.timeout)
+            try:
+                with self._lock:
+                    auth_id = self._new_id()
+                sock.sendall(self._packet(auth_id, SERVERDATA_AUTH, self.password))
+                while True:
+                    response_id, packet_type, _ = self._read_packet(sock)
+                    if packet_type == SERVERDATA_AUTH_RESPONSE:
+                        break
+                if response_id == -1:
+                    raise RconError("RCON authentication failed")
+            except Exception:
+                sock.close()
+                raise
+
+            sock.settimeout(None)
+            self.sock = sock
+            threading.Thread(
+                target=self._read_loop,
+                args=(sock,),
+                name="RconReader",
+                daemon=True
+            ).start()
+
+    def command(self, text, timeout=None):
+        """Run a console command and return its response text"""
+        with span("rcon.command"):
+            try:
+                return self._command(text, timeout)
+            except _NotSentError:
+                # The server never got the command: reconnect once and retry
+                count("rcon.retries")
+                return self._command(text, timeout)
+
+    def close(self):
+        """Close the connection"""
+        self._disconnect(self.sock)
+
+    def _command(self, text, timeout):
+        if self.sock is None:
+            self.connect()
+        sock = self.sock
+        if sock is None:
+            raise _NotSentError("RCON connection lost")
+
+        slot = {"parts": [], "done": threading.Event(), "error": None}
+        with self._lock:
+            request_id = self._new_id()
+            sentinel_id = self._new_id()
+            self._pending[request_id] = slot
+            self._sentinels[sentinel_id] = request_id
+
+        try:
+            with self._send_lock:
+                try:
+                    sock.sendall(self._packet(request_id, SERVERDATA_EXECCOMMAND, text))
+                except OSError as e:
+                    # A truncated packet is never executed, so this is safe to retry
+                    self._disconnect(sock)
+                    raise _NotSentError(f"RCON connection lost: {e}") from e
+                try:
+                    sock.sendall(self._packet(sentinel_id, SERVERDATA_RESPONSE_VALUE, ""))
+                except OSError as e:
+                    self._disconnect(sock)
+                    raise RconConnectionError(f"RCON connection lost: {e}") from e
+            if not slot["done"].wait(timeout or self.timeout):
+                raise RconError(f"RCON command timed out: {text}")
+        finally:
+            with self._lock:
+                self._pending.pop(request_id, None)
+                self._sentinels.pop(sentinel_id, None)
+
+        if slot["error"]:
+            raise slot["error"]
+        return "".join(slot["parts"])
+
+    def _new_id(self):
+        # Callers hold self._lock; ids must stay positive signed 32-bit integers
+        request_id = self._next_id
+        self._next_id = self._next_id % 0x7FFFFFFF + 1
+        return request_id
+
+    def _read_loop(self, sock):
+        try:
+            while True:
+                response_id, _, body = self._read_packet(sock)
+                with self._lock:
+                    slot = self._pending.get(response_id)
+                    sentinel_for = self._sentinels.get(response_id)
+                    if sentinel_for is not None:
+                        slot = self._pending.get(sentinel_for)
+                        if slot:
+                            slot["done"].set()
+                    elif slot:
+                        slot["parts"].append(body)
+        except (OSError, RconError):
+            pass
+        finally:
+            self._disconnect(sock)
+
+    def _disconnect(self, sock):
+        if sock is None:
+            return
+        with self._lock:
+            if self.sock is sock:
+                self.sock = None
+            pending = list(self._pending.values())
+        try:
+            sock.close()
+        except OSError:
+            pass
+        for slot in pending:
+            if not slot["done"].is_set():
+                slot["error"] = RconConnectionError("RCON connection lost")
+                slot["done"].set()
+
+    def _packet(self, request_id, packet_type, body):
+        payload = struct.pack("<ii", request_id, packet_type) + body.encode("utf-8") + b"\x00\x00"
+        return struct.pack("<i", len(payload)) + payload
+
+    def _read_packet(self, sock):
+        (length,) = struct.unpack("<i", self._read_exact(sock, 4))
+        if length < 10:
+            raise RconError(f"Invalid RCON packet length {length}")
+        payload = self._read_exact(sock, length)
+        request_id, packet_type = struct.unpack("<ii", payload[:8])
+        return request_id, packet_type, payload[8:-2].decode("utf-8", "replace")
+
+    def _read_exact(self, sock, size):
+        data = b""
+        while len(data) < size:
+            chunk = sock.recv(size - len(data))
+            if not chunk:
+                raise RconConnectionError("RCON connection closed")
+            data += chunk
+        return data
+
+
+class RconPool:
+    """Share one RconClient per server address"""
+
+    def __init__(self):
+        self._clients = {}
+        self._lock = threading.Lock()
+
+    def get(self, host, port, password):
+        """Return the pooled client for host:port, creating it if needed"""
+        with self._lock:
+            client = self._clients.get((host, port))
+            if client is None or client.password != password:
+                client = RconClient(host, port, password)
+                self._clients[(host, port)] = client
+            return client
+
+    def close_all(self):
+        """Close every pooled connection"""
+        with self._lock:
+            clients = list(self._clients.values())
+            self._clients.clear()
+        for client in clients:
+            client.close()
+
+
+_pool = RconPool()
+
+def get_client(host, port, password):
+    """Return a client from the process-wide RCON pool"""
+    return _pool.get(host, port, password)
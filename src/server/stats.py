@@ -1,43 +1,41 @@
-# src/server/stats.py
-from mcstatus import JavaServer
-import time
-import socket
+from src.server.cache import TTLCache
+from src.config import STATUS_CACHE_TTL
 
 class ServerStats:
     def __init__(self, host, port):
         self.host = host
         self.port = port
-        self.server = JavaServer(host, port)
-        self.startup_retries = 30  # Try for 30 * 2 = 60 seconds during startup
-        self.normal_retries = 3    # Normal operation retries
+        self.startup_deadline = 60  # Keep trying for up to a minute during startup
+        self.normal_deadline = 6    # Normal operation
+        self.cache = TTLCache()
+        self.cache_ttl = STATUS_CACHE_TTL
+
+    @property
+    def engine(self):
+        """The shared StatusEngine, started by the first ping rather than at import"""
+        from src.server.status_engine import get_engine
+        return get_engine()
 
     def get_status(self, startup_mode=False):
         """
-        Get server status with retry logic
-        startup_mode: If True, use more retries and longer delays for server startup
+        Get server status, retrying with backoff until a deadline
+        startup_mode: If True, allow a much longer deadline for server startup
         """
-        max_retries = self.startup_retries if startup_mode else self.normal_retries
-        retry_delay = 2  # seconds between retries
-        
-        for attempt in range(max_retries):
-            try:
-                status = self.server.status()
-                if status:
-                    return status
-            except (socket.timeout, ConnectionRefusedError) as e:
-                print(f"Status check attempt {attempt + 1}/{max_retries} failed: {str(e)}")
-                if attempt < max_retries - 1:
-                    time.sleep(retry_delay)
-            except Exception as e:
-                print(f"Unexpected error in status check: {str(e)}")
-                if attempt < max_retries - 1:
-                    time.sleep(retry_delay)
-        return None
+        deadline = self.startup_deadline if startup_mode else self.normal_deadline
+        return self.cache.get(
+            "status",
+            lambda: self.engine.request(self.host, self.port, "status", deadline),
+            self.cache_ttl
+        )
 
     def get_query(self):
         """Get detailed server query (if enabled)"""
-        try:
-            return self.server.query()
-        except Exception as e:
-            print(f"Query failed: {str(e)}")
-            return None
+        return self.cache.get(
+            "query",
+            lambda: self.engine.request(self.host, self.port, "query", self.normal_deadline),
+            self.cache_ttl
+        )
+
+    def invalidate(self):
+        """Forget cached responses, e.g. after the server starts or stops"""
+        self.cache.invalidate()
@@ -0,0 +1,130 @@
+import asyncio
+import logging
+import random
+import threading
+from src.telemetry import count, span
+
+logger = logging.getLogger(__name__)
+
+class StatusEngine:
+    """Asyncio status pinger shared by every ServerStats.
+
+    The event loop runs on its own daemon thread. Each request retries
+    with exponential backoff and jitter until a single overall deadline,
+    and concurrent requests for the same server share one in-flight ping.
+    """
+
+    def __init__(self, initial_delay=0.25, max_delay=5.0, attempt_timeout=3.0):
+        self.initial_delay = initial_delay
+        self.max_delay = max_delay
+        self.attempt_timeout = attempt_timeout
+        self._servers = {}
+        self._inflight = {}  # (task, loop time it gives up); only touched on the loop thread
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(
+            target=self._loop.run_forever,
+            name="StatusEngine",
+            daemon=True
+        )
+        self._thread.start()
+
+    def request(self, host, port, kind="status", deadline=6.0):
+        """Blocking wrapper around fetch() for use from other threads"""
+        future = asyncio.run_coroutine_threadsafe(
+            self.fetch(host, port, kind, deadline),
+            self._loop
+        )
+        return future.result()
+
+    async def fetch(self, host, port, kind="status", deadline=6.0):
+        """Return a status or query response, or None once the deadline passes.
+
+        kind is "status" (Server List Ping) or "query".
+        """
+        key = (host, port, kind)
+        end = self._loop.time() + deadline
+        task, task_end = self._inflight.get(key, (None, None))
+        if task is None or task_end < end:
+            # A ping that gives up sooner than this caller's deadline (say a
+            # startup check joining a normal one) cannot be shared
+            task = asyncio.ensure_future(self._fetch_with_backoff(host, port, kind, deadline))
+            self._inflight[key] = (task, end)
+            task.add_done_callback(lambda done: self._forget(key, done))
+        # Each caller keeps its own deadline even when it joins a ping
+        # started with a longer one. Shield so one caller giving up does
+        # not cancel the shared ping.
+        try:
+            return await asyncio.wait_for(asyncio.shield(task), deadline)
+        except asyncio.TimeoutError:
+            return None
+
+    def _forget(self, key, task):
+        if self._inflight.get(key, (None, None))[0] is task:
+            del self._inflight[key]
+
+    def _server(self, host, port):
+        server = self._servers.get((host, port))
+        if server is None:
+            # Imported on first use so the window can paint without it
+            from mcstatus import JavaServer
+            server = JavaServer(host, port, timeout=self.attempt_timeout)
+            self._servers[(host, port)] = server
+        return server
+
+    async def _fetch_with_backoff(self, host, port, kind, deadline):
+        name = "status.query" if kind == "query" else "status.ping"
+        with span(name, host=host, port=port) as attributes:
+            response, attempts, last_error = await self._attempt(host, port, kind, deadline)
+            attributes["attempts"] = attempts
+            count("status.retries", attempts - 1)
+            if response is None:
+                count("status.failures")
+                attributes["error"] = str(last_error)
+                logger.warning("%s check for %s:%s gave up after %d attempt(s): %s",
+                               kind.capitalize(), host, port, attempts, last_error)
+            return response
+
+    async def _attempt(self, host, port, kind, deadline):
+        # Returns (response or None, attempts made, last error)
+        server = self._server(host, port)
+        method = server.async_query if kind == "query" else server.async_status
+        end = self._loop.time() + deadline
+        delay = self.initial_delay
+        attempt = 0
+        last_error = None
+
+        while True:
+            attempt += 1
+            remaining = end - self._loop.time()
+            try:
+                response = await asyncio.wait_for(
+                    method(),
+                    timeout=max(0.1, min(self.attempt_timeout, remaining))
+                )
+                if response:
+                    return response, attempt, None
+            except (asyncio.TimeoutError, ConnectionError, OSError) as e:
+                last_error = e
+            except Exception as e:
+                logger.warning("Unexpected error in %s check: %s", kind, e)
+                last_error = e
+
+            remaining = end - self._loop.time()
+            if remaining <= 0:
+                return None, attempt, last_error
+            # Equal jitter: half the delay fixed, half random
+            sleep = min(remaining, delay / 2 + random.uniform(0, delay / 2))
+            delay = min(delay * 2, self.max_delay)
+            await asyncio.sleep(sleep)
+
+
+_engine = None
+_engine_lock = threading.Lock()
+
+def get_engine():
+    """Return the process-wide StatusEngine, creating it on first use"""
+    global _engine
+    with _engine_lock:
+        if _engine is None:
+            _engine = StatusEngine()
+        return _engine
@@ -0,0 +1,77 @@
+import logging
+import random
+import threading
+from src.telemetry import count
+
+logger = logging.getLogger(__name__)
+
+CONNECTED = "CONNECTED"
+DISCONNECTED = "DISCONNECTED"
+
+
+class ConnectionSupervisor:
+    """Keep a ServerManager's SSH connection alive.
+
+    A background thread probes the connection every ``check_interval``
+    seconds with a real round trip (an agent ping or a new SSH channel),
+    so a dead session is noticed within seconds, not at the next TCP
+    timeout. A failed probe marks the connection DISCONNECTED and
+    reconnects with exponential backoff and jitter until it succeeds.
+
+    ``on_state`` is called with CONNECTED or DISCONNECTED on every change,
+    from the supervisor thread.
+    """
+
+    def __init__(self, server_manager, check_interval=5, probe_timeout=5,
+                 initial_delay=1, max_delay=60, on_state=None):
+        self.server_manager = server_manager
+        self.check_interval = check_interval
+        self.probe_timeout = probe_timeout
+        self.initial_delay = initial_delay
+        self.max_delay = max_delay
+        self.on_state = on_state
+        self.state = CONNECTED
+        self._stopped = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """Start supervising a connection that is already open"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stopped.clear()
+        self.state = CONNECTED
+        self._thread = threading.Thread(target=self._run, name="ConnectionSupervisor", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop supervising"""
+        self._stopped.set()
+
+    def _run(self):
+        while not self._stopped.wait(self.check_interval):
+            if self.server_manager.probe(self.probe_timeout):
+                continue
+            logger.warning("Connection to %s lost, reconnecting...", self.server_manager.host)
+            count("ssh.connection_lost")
+            self._set_state(DISCONNECTED)
+            self._reconnect()
+
+    def _reconnect(self):
+        delay = self.initial_delay
+        while not self._stopped.is_set():
+            count("ssh.reconnect_attempts")
+            if self.server_manager.reconnect():
+                logger.info("Reconnected to %s", self.server_manager.host)
+                self._set_state(CONNECTED)
+                return
+            # Equal jitter keeps several monitors from retrying in lockstep
+            self._stopped.wait(delay / 2 + random.uniform(0, delay / 2))
+            delay = min(delay * 2, self.max_delay)
+
+    def _set_state(self, state):
+        self.state = state
+        if self.on_state:
+            try:
+                self.on_state(state)
+            except Exception as e:
+                logger.warning("Connection state callback error: %s", e)
@@ -0,0 +1,202 @@
+# src/telemetry.py
+import contextlib
+import functools
+import json
+import logging
+import logging.handlers
+import os
+import sys
+import threading
+import time
+from collections import Counter, deque
+
+logger = logging.getLogger(__name__)
+span_logger = logging.getLogger("minecraft_monitor.spans")
+span_logger.propagate = False
+
+
+class SpanStats:
+    """Count, total and recent durations of one kind of span"""
+
+    def __init__(self, keep=512):
+        self.count = 0
+        self.errors = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.recent = deque(maxlen=keep)
+
+    def add(self, duration, failed):
+        self.count += 1
+        self.errors += 1 if failed else 0
+        self.total += duration
+        self.max = max(self.max, duration)
+        self.recent.append(duration)
+
+    def summary(self):
+        recent = sorted(self.recent)
+        def pick(fraction):
+            return recent[min(len(recent) - 1, int(fraction * len(recent)))] if recent else 0.0
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "total_s": round(self.total, 6),
+            "max_ms": round(self.max * 1000, 3),
+            "p50_ms": round(pick(0.50) * 1000, 3),
+            "p95_ms": round(pick(0.95) * 1000, 3),
+            "p99_ms": round(pick(0.99) * 1000, 3),
+        }
+
+
+class Telemetry:
+    """Process-wide timing spans and counters.
+
+    span() times a block and folds the duration into per-name stats.
+    When span export is enabled, each finished span is also written as
+    one JSON line shaped like an OpenTelemetry span to a rotating file.
+    """
+
+    def __init__(self):
+        self.spans = {}
+        self.counters = Counter()
+        self.export = False
+        self._lock = threading.Lock()
+
+    @contextlib.contextmanager
+    def span(self, name, **attributes):
+        """Time the enclosed block and yield its attributes dict
+
+        The span fails if the block raises or sets attributes["error"].
+        """
+        start_ns = time.time_ns()
+        started = time.perf_counter()
+        failed = False
+        try:
+            yield attributes
+        except BaseException:
+            failed = True
+            raise
+        finally:
+            duration = time.perf_counter() - started
+            failed = failed or "error" in attributes
+            with self._lock:
+                stats = self.spans.get(name)
+                if stats is None:
+                    stats = self.spans[name] = SpanStats()
+                stats.add(duration, failed)
+            if self.export:
+                span_logger.info(json.dumps({
+                    "name": name,
+                    "start_time_unix_nano": start_ns,
+                    "end_time_unix_nano": start_ns + int(duration * 1e9),
+                    "status": "ERROR" if failed else "OK",
+                    "thread": threading.current_thread().name,
+                    "attributes": attributes,
+                }, default=str))
+
+    def count(self, name, value=1):
+        """Add to a counter such as retries or failures"""
+        with self._lock:
+            self.counters[name] += value
+
+    def snapshot(self):
+        """Return {"spans": {name: summary}, "counters": {name: value}}"""
+        with self._lock:
+            return {
+                "spans": {name: stats.summary() for name, stats in sorted(self.spans.items())},
+                "counters": dict(sorted(self.counters.items())),
+            }
+
+
+telemetry = Telemetry()
+span = telemetry.span
+count = telemetry.count
+
+
+def timed(name):
+    """Decorator that runs a function inside span(name)"""
+    def decorate(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with telemetry.span(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+class SamplingProfiler:
+    """Low-overhead stack sampler for every thread in the process.
+
+    Every ``interval`` seconds it records the stack of each other thread.
+    stop() writes the counts as folded stacks ("a;b;c 42" per line), the
+    input format of flamegraph.pl and speedscope.
+    """
+
+    def __init__(self, path, interval=0.01):
+        self.path = path
+        self.interval = interval
+        self.samples = Counter()
+        self._stopped = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._run, name="SamplingProfiler", daemon=True)
+        self._thread.start()
+        logger.info("Sampling profiler started, writing to %s on exit", self.path)
+
+    def stop(self):
+        """Stop sampling and write the folded stacks"""
+        self._stopped.set()
+        if self._thread:
+            self._thread.join()
+        with open(self.path, "w") as output:
+            for stack, hits in self.samples.most_common():
+                output.write(f"{stack} {hits}\n")
+        logger.info("Profile written to %s (%d samples)", self.path, sum(self.samples.values()))
+
+    def _run(self):
+        own = threading.get_ident()
+        names = {}
+        while not self._stopped.wait(self.interval):
+            for thread in threading.enumerate():
+                names[thread.ident] = thread.name
+            for ident, frame in sys._current_frames().items():
+                if ident == own:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})")
+                    frame = frame.f_back
+                stack.append(names.get(ident, str(ident)))
+                self.samples[";".join(reversed(stack))] += 1
+
+
+def setup_logging(level="INFO", log_file=None, trace_file=None, max_bytes=1_000_000, backups=3):
+    """Send log records to the console and an optional rotating file
+
+    trace_file: also export every span as a JSON line to this rotating file
+    """
+    root = logging.getLogger()
+    root.setLevel(level)
+    formatter = logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s")
+    console = logging.StreamHandler()
+    console.setFormatter(formatter)
+    root.addHandler(console)
+
+    for path in (log_file, trace_file):
+        directory = os.path.dirname(path) if path else None
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+
+    if log_file:
+        handler = logging.handlers.RotatingFileHandler(log_file, maxBytes=max_bytes, backupCount=backups)
+        handler.setFormatter(formatter)
+        root.addHandler(handler)
+
+    if trace_file:
+        handler = logging.handlers.RotatingFileHandler(trace_file, maxBytes=max_bytes, backupCount=backups)
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        span_logger.addHandler(handler)
+        span_logger.setLevel(logging.INFO)
+        telemetry.export = True
@@ -0,0 +1,128 @@
+import pytest
+from src.server.alerts import (AlertEngine, CallbackNotifier, SlidingWindow, ThresholdRule,
+                               FIRING, RESOLVED)
+
+
+@pytest.fixture
+def delivered():
+    alerts = []
+    engines = []
+
+    def make(*rules):
+        engine = AlertEngine(rules, [CallbackNotifier(alerts.append)])
+        engines.append(engine)
+        return engine
+
+    yield make, alerts
+    for engine in engines:
+        engine.close()
+        engine._thread.join(2)
+
+
+def test_window_expires_samples_older_than_its_length():
+    window = SlidingWindow(10)
+    for timestamp, value in [(0, 5), (5, 1), (10, 9), (12, 3)]:
+        window.add(timestamp, value)
+    # The sample at 0 is 12s old; the one at 5 still counts
+    assert [value for _, value in window.samples] == [1, 9, 3]
+    assert (window.min(), window.max(), window.mean()) == (1, 9, pytest.approx(13 / 3))
+
+    window.expire(20)
+    assert [value for _, value in window.samples] == [9, 3]
+    assert (window.min(), window.max()) == (3, 9)
+
+
+def test_zero_second_window_keeps_newest_sample():
+    window = SlidingWindow(0)
+    window.add(1, 4)
+    window.add(2, 7)
+    assert window.last() == 7
+    assert len(window) == 1
+
+
+def test_window_rate():
+    window = SlidingWindow(60)
+    window.add(0, 1.0)
+    window.add(10, 3.0)
+    assert window.rate() == pytest.approx(0.2)
+
+
+def test_percentile_tracks_expiry():
+    window = SlidingWindow(100)
+    for timestamp in range(100):
+        window.add(timestamp, 1000 if timestamp < 50 else timestamp - 49)
+    assert window.percentile(0.95) == pytest.approx(1000, rel=0.05)
+
+    window.expire(150)
+    assert max(value for _, value in window.samples) == 50
+    assert window.percentile(0.5) == pytest.approx(25, rel=0.05)
+    assert window._keys == sorted(window._buckets)
+
+
+def test_percentile_of_values_at_or_below_zero():
+    window = SlidingWindow(60)
+    for value in (0, -1, 0, 10):
+        window.add(1, value)
+    assert window.percentile(0.5) == 0.0
+    assert window.percentile(1.0) == pytest.approx(10, rel=0.05)
+
+
+def test_alert_fires_after_for_seconds_and_resolves(delivered):
+    make, alerts = delivered
+    engine = make(ThresholdRule("Slow", "latency_ms", ">", 100, for_seconds=10))
+    for timestamp in (0, 5):
+        engine.observe("latency_ms", 200, timestamp)
+        engine.check(timestamp)
+    assert engine.active() == []
+
+    engine.observe("latency_ms", 200, 10)
+    engine.check(10)
+    assert [alert["rule"] for alert in engine.active()] == ["Slow"]
+
+    engine.observe("latency_ms", 50, 15)
+    engine.check(15)
+    assert engine.active() == []
+    engine.close()
+    engine._thread.join(2)
+    assert [(alert.rule, alert.state) for alert in alerts] == [("Slow", FIRING), ("Slow", RESOLVED)]
+
+
+def test_clear_value_adds_hysteresis(delivered):
+    make, _ = delivered
+    engine = make(ThresholdRule("Slow", "latency_ms", ">", 100, clear=80))
+    for timestamp, value in [(0, 120), (1, 90)]:
+        engine.observe("latency_ms", value, timestamp)
+        engine.check(timestamp)
+    assert engine.active()
+    engine.observe("latency_ms", 70, 2)
+    engine.check(2)
+    assert engine.active() == []
+
+
+def test_firing_alert_resolves_when_metric_stops(delivered):
+    make, _ = delivered
+    engine = make(ThresholdRule("Slow", "latency_ms", ">", 100, stale_after=60))
+    engine.observe("latency_ms", 200, 0)
+    engine.check(0)
+    assert engine.active()
+    engine.check(61)
+    assert engine.active() == []
+
+
+def test_windowed_alert_resolves_when_samples_expire(delivered):
+    make, _ = delivered
+    engine = make(ThresholdRule("Slow", "latency_ms", ">", 100, window=30, aggregate="max"))
+    engine.observe("latency_ms", 200, 0)
+    engine.check(0)
+    assert engine.active()
+    engine.check(31)
+    assert engine.active() == []
+
+
+def test_quiet_during_deliberate_stop(delivered):
+    make, _ = delivered
+    engine = make(ThresholdRule("Server down", "running", "<", 1, quiet_during=["STOPPED"]))
+    engine.observe_snapshot({"time": 0, "running": False, "status": None, "lifecycle": "STOPPED"})
+    assert engine.active() == []
+    engine.observe_snapshot({"time": 5, "running": False, "status": None, "lifecycle": "RUNNING"})
+    assert [alert["rule"] for alert in engine.active()] == ["Server down"]
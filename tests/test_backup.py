@@ -0,0 +1,61 @@
+from types import SimpleNamespace
+import pytest
+from src.server.backup import BackupManager
+from src.server.instances import Instance
+
+
+@pytest.fixture
+def backups(tmp_path):
+    manager = SimpleNamespace(host="mc.example", instance=Instance(directory="/srv/mc"))
+    backups = BackupManager(manager, directory=str(tmp_path))
+    backups.hashed = []
+
+    def fake_hash(paths):
+        # Stands in for sha256sum on the host
+        backups.hashed.append(sorted(paths))
+        return {path: backups.hashes[path] for path in paths}
+
+    backups._hash = fake_hash
+    backups.hashes = {}
+    return backups
+
+
+def test_full_backup_takes_every_file(backups):
+    files = {"world/level.dat": (10, 1.0), "world/region/r.0.0.mca": (4096, 2.0)}
+    changed, deleted, entries = backups._compare(files, None, {"sha256sum"})
+    assert changed == ["world/level.dat", "world/region/r.0.0.mca"]
+    assert deleted == []
+    assert entries == {"world/level.dat": [10, 1.0, None], "world/region/r.0.0.mca": [4096, 2.0, None]}
+    assert backups.hashed == []
+
+
+def test_unchanged_size_and_mtime_are_skipped_without_hashing(backups):
+    base = {"files": {"world/level.dat": [10, 1.0, "aaa"], "world/old.dat": [5, 1.0, None]}}
+    files = {"world/level.dat": (10, 1.0), "world/new.dat": (7, 3.0)}
+    backups.hashes = {"world/new.dat": "ccc"}
+
+    changed, deleted, entries = backups._compare(files, base, {"sha256sum"})
+    assert changed == ["world/new.dat"]
+    assert deleted == ["world/old.dat"]
+    assert entries["world/level.dat"] == [10, 1.0, "aaa"]
+    assert entries["world/new.dat"] == [7, 3.0, "ccc"]
+    assert backups.hashed == [["world/new.dat"]]
+
+
+def test_rewritten_file_with_same_content_is_skipped(backups):
+    base = {"files": {"world/region/r.0.0.mca": [4096, 1.0, "aaa"],
+                      "world/region/r.0.1.mca": [4096, 1.0, "bbb"]}}
+    files = {"world/region/r.0.0.mca": (4096, 2.0), "world/region/r.0.1.mca": (4096, 2.0)}
+    backups.hashes = {"world/region/r.0.0.mca": "aaa", "world/region/r.0.1.mca": "changed"}
+
+    changed, _, entries = backups._compare(files, base, {"sha256sum"})
+    assert changed == ["world/region/r.0.1.mca"]
+    assert entries["world/region/r.0.0.mca"] == [4096, 2.0, "aaa"]
+
+
+def test_without_sha256sum_every_candidate_is_sent(backups):
+    base = {"files": {"world/level.dat": [10, 1.0, "aaa"]}}
+    changed, _, entries = backups._compare({"world/level.dat": (10, 2.0)}, base, set())
+    assert changed == ["world/level.dat"]
+    assert entries["world/level.dat"] == [10, 2.0, None]
+    assert backups.hashed == []
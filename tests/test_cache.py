@@ -0,0 +1,105 @@
+import threading
+import time
+from src.server.cache import TTLCache
+
+
+def test_value_is_reused_until_ttl():
+    cache = TTLCache()
+    calls = []
+    loader = lambda: calls.append(1) or len(calls)
+    assert cache.get("key", loader, ttl=60) == 1
+    assert cache.get("key", loader, ttl=60) == 1
+    assert cache.get("key", loader, ttl=0) == 2
+    assert (cache.hits, cache.misses) == (1, 2)
+
+
+def test_concurrent_misses_share_one_load():
+    cache = TTLCache()
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    def loader():
+        calls.append(1)
+        started.set()
+        release.wait(2)
+        return "value"
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.get("key", loader, 60)))
+               for _ in range(5)]
+    threads[0].start()
+    started.wait(2)
+    for thread in threads[1:]:
+        thread.start()
+    time.sleep(0.05)
+    release.set()
+    for thread in threads:
+        thread.join(2)
+
+    assert results == ["value"] * 5
+    assert len(calls) == 1
+
+
+def test_waiters_get_the_loader_error():
+    cache = TTLCache()
+    started = threading.Event()
+    release = threading.Event()
+
+    def loader():
+        started.set()
+        release.wait(2)
+        raise ValueError("scan failed")
+
+    errors = []
+
+    def get():
+        try:
+            cache.get("key", loader, 60)
+        except ValueError as e:
+            errors.append(str(e))
+
+    leader = threading.Thread(target=get)
+    leader.start()
+    started.wait(2)
+    waiter = threading.Thread(target=get)
+    waiter.start()
+    time.sleep(0.05)
+    release.set()
+    leader.join(2)
+    waiter.join(2)
+
+    assert errors == ["scan failed", "scan failed"]
+    # Failures are not cached
+    assert cache.get("key", lambda: "fresh", 60) == "fresh"
+
+
+def test_invalidate_during_load_is_not_cached():
+    cache = TTLCache()
+    started = threading.Event()
+    release = threading.Event()
+
+    def loader():
+        started.set()
+        release.wait(2)
+        return "before stop"
+
+    results = []
+    thread = threading.Thread(target=lambda: results.append(cache.get("key", loader, 60)))
+    thread.start()
+    started.wait(2)
+    cache.invalidate()
+    release.set()
+    thread.join(2)
+
+    assert results == ["before stop"]
+    assert cache.get("key", lambda: "after stop", 60) == "after stop"
+
+
+def test_invalidate_one_key():
+    cache = TTLCache()
+    cache.get("a", lambda: 1, 60)
+    cache.get("b", lambda: 2, 60)
+    cache.invalidate("a")
+    assert cache.get("a", lambda: 3, 60) == 3
+    assert cache.get("b", lambda: 4, 60) == 2
@@ -0,0 +1,44 @@
+import inspect
+from src.server.instances import OWNS_PROCESS_SOURCE, Instance, owns_process, parse_java_scan
+
+
+def test_agent_copy_of_owns_process_matches():
+    assert OWNS_PROCESS_SOURCE.strip() == inspect.getsource(owns_process).strip()
+
+
+def test_parse_java_scan():
+    output = (
+        "101\t/srv/mc\t25565\t\tjava\x1f-Xms4G\x1f-Xmx4G\x1f-jar\x1fpaper.jar\x1fnogui\x1f\n"
+        "102\t/srv/other\t\t/opt/servers\tjava\x1f-jar\x1f/opt/servers/paper.jar\x1f--port\x1f25570\x1f\n"
+        # Exited while the scan ran
+        "103\t\t\t\t\n"
+        "garbage\n"
+    )
+    first, second = parse_java_scan(output)
+    assert first == {"pid": 101, "cwd": "/srv/mc", "jar": "paper.jar", "jar_dir": None,
+                     "port": 25565, "xms": "4G", "xmx": "4G",
+                     "args": ["java", "-Xms4G", "-Xmx4G", "-jar", "paper.jar", "nogui"]}
+    assert second["jar"] == "/opt/servers/paper.jar"
+    assert second["jar_dir"] == "/opt/servers"
+    assert second["port"] == 25570
+
+
+def test_owns_process_by_working_directory():
+    assert owns_process("/srv/mc", "paper.jar", "paper.jar", None, "/srv/mc")
+    assert not owns_process("/srv/mc", "paper.jar", "paper.jar", None, "/srv/other")
+    assert not owns_process("/srv/mc", "paper.jar", "vanilla.jar", None, "/srv/mc")
+    assert not owns_process("/srv/mc", "paper.jar", None, None, None)
+
+
+def test_owns_process_by_jar_directory():
+    # An absolute jar is matched by its (host-resolved) directory, not the cwd
+    assert owns_process("/srv/mc", "paper.jar", "/srv/mc/paper.jar", "/srv/mc", "/")
+    assert owns_process("/data/mc", "paper.jar", "/srv/mc/paper.jar", "/data/mc", "/")
+    assert not owns_process("/srv/mc", "paper.jar", "/srv/other/paper.jar", "/srv/other", "/srv/mc")
+
+
+def test_instance_owns_uses_resolved_directory():
+    instance = Instance(directory="/srv/mc/", jar="paper.jar")
+    proc = {"jar": "paper.jar", "jar_dir": None, "cwd": "/data/mc"}
+    assert not instance.owns(proc)
+    assert instance.owns(proc, "/data/mc")
@@ -0,0 +1,170 @@
+from src.server.lifecycle import (LifecycleController, READY_PATTERN, SAVED_PATTERN, STOP_ACK_PATTERN,
+                                  RUNNING, SAVING, STARTING, STOPPED, STOPPING, TERMINATING)
+
+
+class FakeAgent:
+    """Answers logpos and replays scripted results for wait"""
+
+    alive = True
+
+    def __init__(self, waits=()):
+        self.waits = list(waits)
+        self.calls = []
+
+    def call(self, op, timeout=None, **params):
+        self.calls.append((op, params))
+        if op == "logpos":
+            return {"size": 100}
+        if op == "wait":
+            return {"met": self.waits.pop(0)}
+        raise ValueError(f"unexpected op {op}")
+
+
+class FakeManager:
+    """The parts of ServerManager that LifecycleController uses"""
+
+    server_log = "/srv/mc/logs/latest.log"
+    server_port = 25565
+
+    def __init__(self, running=False, agent=None, launches=True):
+        self.running = running
+        self.agent = agent
+        self.launches = launches
+        self.commands = []
+        self.console = []
+
+    def is_server_running(self, fresh=False):
+        return self.running
+
+    def server_pids(self, fresh=False):
+        return [4321] if self.running else []
+
+    def find_server_pid(self, fresh=False):
+        return 4321 if self.running else None
+
+    def port_conflict(self):
+        return None
+
+    def start_command(self):
+        return "screen -dmS mc java -jar paper.jar nogui"
+
+    def execute_command(self, command):
+        self.commands.append(command)
+        if "java -jar" in command and self.launches:
+            self.running = True
+        elif command.startswith("kill "):
+            self.running = False
+        return "", ""
+
+    def send_console_command(self, command):
+        self.console.append(command)
+        return "", ""
+
+
+def controller(manager, **options):
+    states = []
+    lifecycle = LifecycleController(manager, on_state=states.append, **options)
+    return lifecycle, states
+
+
+def wait_params(agent):
+    return [params for op, params in agent.calls if op == "wait"]
+
+
+def test_start_waits_for_done_line():
+    agent = FakeAgent(waits=["log"])
+    lifecycle, states = controller(FakeManager(agent=agent))
+    stdout, stderr = lifecycle.start()
+
+    assert stdout.startswith("Server started in")
+    assert stderr == ""
+    assert states == [STARTING, RUNNING]
+    (params,) = wait_params(agent)
+    assert params["pid"] == 4321
+    assert params["log_pattern"] == READY_PATTERN
+    assert params["log_offset"] == 100
+
+
+def test_start_reports_exit_while_starting():
+    lifecycle, states = controller(FakeManager(agent=FakeAgent(waits=["exit"])))
+    assert lifecycle.start() == ("", "Server exited while starting")
+    assert states == [STARTING, STOPPED]
+
+
+def test_start_still_loading_after_ready_timeout():
+    lifecycle, states = controller(FakeManager(agent=FakeAgent(waits=[None])))
+    stdout, stderr = lifecycle.start()
+    assert stdout.startswith("Server still starting after")
+    assert states == [STARTING]
+
+
+def test_start_without_agent_waits_for_the_process():
+    lifecycle, states = controller(FakeManager())
+    assert lifecycle.start() == ("", "")
+    assert states == [STARTING]
+
+
+def test_start_gives_up_when_no_process_appears():
+    lifecycle, states = controller(FakeManager(launches=False), start_timeout=0)
+    assert lifecycle.start() == ("", "Server process did not start")
+    assert states == [STARTING, STOPPED]
+
+
+def test_start_refuses_when_running_or_unknown():
+    lifecycle, states = controller(FakeManager(running=True))
+    assert lifecycle.start() == ("Server is already running", "")
+    lifecycle, states = controller(FakeManager(running=None))
+    assert lifecycle.start() == ("", "Server state is unknown; not starting")
+    assert states == []
+
+
+def test_graceful_stop():
+    agent = FakeAgent(waits=["log", "log", "exit"])
+    manager = FakeManager(running=True, agent=agent)
+    lifecycle, states = controller(manager)
+    stdout, stderr = lifecycle.stop()
+
+    assert stdout.startswith("Server stopped in") and "(" not in stdout
+    assert stderr == ""
+    assert states == [SAVING, STOPPING, STOPPED]
+    assert manager.console == ["save-all flush", "stop"]
+    assert not any(command.startswith("kill") for command in manager.commands)
+    saved, acknowledged, exited = wait_params(agent)
+    assert saved["log_pattern"] == SAVED_PATTERN
+    assert acknowledged["log_pattern"] == STOP_ACK_PATTERN
+    assert acknowledged["port_closed"] == 25565
+    assert "log_pattern" not in exited
+
+
+def test_stop_escalates_to_sigterm_when_not_acknowledged():
+    agent = FakeAgent(waits=["log", None, "exit"])
+    manager = FakeManager(running=True, agent=agent)
+    lifecycle, states = controller(manager)
+    stdout, _ = lifecycle.stop()
+
+    assert "stop not acknowledged; sent SIGTERM" in stdout
+    assert states == [SAVING, STOPPING, TERMINATING, STOPPED]
+    assert "kill -TERM 4321" in manager.commands
+
+
+def test_stop_without_agent_waits_for_exit():
+    manager = FakeManager(running=True)
+    lifecycle, states = controller(manager)
+
+    def stop_on_command(command):
+        manager.console.append(command)
+        if command == "stop":
+            manager.running = False
+        return "", ""
+
+    manager.send_console_command = stop_on_command
+    stdout, _ = lifecycle.stop()
+    assert stdout.startswith("Server stopped in")
+    assert "save not confirmed" in stdout
+    assert states == [SAVING, STOPPING, STOPPED]
+
+
+def test_stop_when_not_running():
+    lifecycle, states = controller(FakeManager())
+    assert lifecycle.stop() == ("Server is not running", "")
+    assert states == [STOPPED]
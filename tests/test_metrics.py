@@ -0,0 +1,62 @@
+import sqlite3
+from src.server.metrics import MetricsStore, RingBuffer
+
+
+def test_ring_buffer_overwrites_oldest():
+    ring = RingBuffer(3)
+    for timestamp in range(5):
+        ring.append(timestamp, timestamp * 10)
+    assert len(ring) == 3
+    assert ring.samples() == [(2, 20), (3, 30), (4, 40)]
+    assert ring.latest() == (4, 40)
+
+
+def test_ring_buffer_samples_since():
+    ring = RingBuffer(4)
+    for timestamp in range(6):
+        ring.append(timestamp, timestamp)
+    assert ring.samples(since=3.5) == [(4, 4), (5, 5)]
+    assert ring.samples(since=3) == [(3, 3), (4, 4), (5, 5)]
+    assert ring.samples(since=10) == []
+
+
+def test_store_keeps_samples_per_metric_in_memory():
+    store = MetricsStore(capacity=10)
+    store.record("latency_ms", 12, timestamp=1)
+    store.record("latency_ms", None, timestamp=2)
+    store.record("players_online", 3, timestamp=2)
+    assert store.names() == ["latency_ms", "players_online"]
+    assert store.samples("latency_ms") == [(1, 12.0)]
+    assert store.latest("players_online") == (2, 3.0)
+
+
+def test_flush_appends_to_sqlite(tmp_path):
+    path = str(tmp_path / "history" / "metrics.db")
+    store = MetricsStore(path, capacity=10)
+    assert not (tmp_path / "history").exists()
+
+    store.record("latency_ms", 12, timestamp=1)
+    store.record("latency_ms", 15, timestamp=2)
+    store.flush()
+    store.record("latency_ms", 20, timestamp=3)
+    store.flush()
+
+    with sqlite3.connect(path) as db:
+        rows = db.execute("SELECT ts, metric, value FROM samples ORDER BY ts").fetchall()
+    assert rows == [(1, "latency_ms", 12.0), (2, "latency_ms", 15.0), (3, "latency_ms", 20.0)]
+
+
+def test_failed_flush_keeps_samples(tmp_path):
+    path = str(tmp_path / "metrics.db")
+    store = MetricsStore(path, capacity=10)
+    store.open()
+    with sqlite3.connect(path) as db:
+        db.execute("DROP TABLE samples")
+    store.record("latency_ms", 12, timestamp=1)
+    store.flush()
+
+    with sqlite3.connect(path) as db:
+        db.execute("CREATE TABLE samples (ts REAL, metric TEXT, value REAL)")
+    store.flush()
+    with sqlite3.connect(path) as db:
+        assert db.execute("SELECT ts, metric, value FROM samples").fetchall() == [(1, "latency_ms", 12.0)]
@@ -0,0 +1,84 @@
+from types import SimpleNamespace
+import pytest
+from src.server.players import NULL_UUID, PlayerTracker, status_names
+
+
+def status(online, names):
+    sample = [SimpleNamespace(name=name, id=f"id-{name}") for name in names]
+    return SimpleNamespace(players=SimpleNamespace(online=online, sample=sample))
+
+
+@pytest.fixture
+def tracker(tmp_path):
+    return PlayerTracker(str(tmp_path / "players.db"), max_gap=120)
+
+
+def test_status_names_skips_placeholders():
+    sample = status(7, ["Alex"]).players.sample + [SimpleNamespace(name="...and 6 more", id=NULL_UUID)]
+    names, complete = status_names(SimpleNamespace(players=SimpleNamespace(online=7, sample=sample)))
+    assert names == {"Alex"}
+    assert not complete
+
+
+def test_session_ends_at_last_sighting(tracker):
+    tracker.observe(1000, ["Alex", "Steve"], 2, True)
+    tracker.observe(1060, ["Alex", "Steve"], 2, True)
+    tracker.observe(1120, ["Alex"], 1, True)
+    tracker.server_stopped(1180)
+
+    assert tracker.online() == {}
+    assert tracker.sessions("Steve") == [(1000, 1060)]
+    assert tracker.sessions("Alex") == [(1000, 1120)]
+    assert tracker.top_players() == [("Alex", 120.0, 1), ("Steve", 60.0, 1)]
+
+
+def test_capped_sample_does_not_end_sessions(tracker):
+    tracker.observe_status(1000, status(3, ["Alex", "Steve", "Herobrine"]))
+    # A sample of two while three are online says nothing about the third
+    tracker.observe_status(1060, status(3, ["Alex", "Steve"]))
+    assert set(tracker.online()) == {"Alex", "Steve", "Herobrine"}
+
+    tracker.observe_status(1120, status(2, ["Alex", "Steve"]), full_names=["Alex", "Steve"])
+    assert set(tracker.online()) == {"Alex", "Steve"}
+
+
+def test_empty_full_list_while_players_online_is_ignored(tracker):
+    tracker.observe_status(1000, status(1, ["Alex"]))
+    tracker.observe_status(1060, status(1, ["Alex"]), full_names=[])
+    assert set(tracker.online()) == {"Alex"}
+
+
+def test_playtime_includes_open_session(tracker):
+    tracker.observe(1000, ["Alex"], 1, True)
+    tracker.observe(1100, ["Alex"], 1, True)
+    tracker.observe(1160, [], 0, True)
+    tracker.observe(2000, ["Alex"], 1, True)
+    tracker.observe(2050, ["Alex"], 1, True)
+
+    assert tracker.playtime("Alex") == 150
+    assert tracker.playtime("Alex", since=1050, until=2025) == 75
+
+
+def test_hourly_aggregates(tracker):
+    hour = 3600 * 1000
+    tracker.observe(hour, ["Alex"], 1, True)
+    tracker.observe(hour + 60, ["Alex", "Steve"], 2, True)
+    # Gaps longer than max_gap count as max_gap
+    tracker.observe(hour + 1060, ["Alex", "Steve"], 2, True)
+
+    assert tracker.peak_concurrency(since=hour) == (2, hour)
+    tracker.flush()
+    rows = tracker._fetchall("SELECT hour, player_seconds FROM player_hours", ())
+    assert rows == [(hour, 60 * 2 + 120 * 2)]
+
+
+def test_sessions_left_open_by_a_crash_are_closed(tmp_path):
+    path = str(tmp_path / "players.db")
+    crashed = PlayerTracker(path)
+    crashed.observe(1000, ["Alex"], 1, True)
+    crashed.observe(1200, ["Alex"], 1, True)
+    crashed.flush()
+
+    restarted = PlayerTracker(path)
+    assert restarted.sessions("Alex") == [(1000, 1200)]
+    assert restarted.top_players() == [("Alex", 200.0, 1)]
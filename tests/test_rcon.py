@@ -0,0 +1,84 @@
+import socket
+import time
+import pytest
+from bench.fake_rcon import FakeRconServer
+from src.server.rcon import (RconClient, RconConnectionError, RconError,
+                             SERVERDATA_EXECCOMMAND)
+
+
+@pytest.fixture
+def server():
+    fake = FakeRconServer(responses={
+        "list": "There are 1 of a max of 20 players online: Alex",
+        "long": "x" * 10000,
+    })
+    fake.start()
+    yield fake
+    fake.stop()
+
+
+@pytest.fixture
+def client(server):
+    rcon = RconClient("127.0.0.1", server.port, server.password, timeout=2)
+    yield rcon
+    rcon.close()
+
+
+def test_packet_round_trip():
+    client = RconClient("127.0.0.1", 0, "")
+    left, right = socket.socketpair()
+    try:
+        left.sendall(client._packet(7, SERVERDATA_EXECCOMMAND, "say héllo"))
+        assert client._read_packet(right) == (7, SERVERDATA_EXECCOMMAND, "say héllo")
+    finally:
+        left.close()
+        right.close()
+
+
+def test_packet_with_bad_length_is_rejected():
+    client = RconClient("127.0.0.1", 0, "")
+    left, right = socket.socketpair()
+    try:
+        left.sendall((4).to_bytes(4, "little", signed=True) + b"\x00" * 4)
+        with pytest.raises(RconError):
+            client._read_packet(right)
+    finally:
+        left.close()
+        right.close()
+
+
+def test_command(server, client):
+    assert client.command("list") == "There are 1 of a max of 20 players online: Alex"
+    assert server.commands == ["list"]
+
+
+def test_multi_packet_response(client):
+    assert client.command("long") == "x" * 10000
+
+
+def test_bad_password(server):
+    client = RconClient("127.0.0.1", server.port, "wrong", timeout=2)
+    with pytest.raises(RconError, match="authentication failed"):
+        client.command("list")
+    assert server.commands == []
+    assert not client.connected
+
+
+def test_reconnects_after_idle_drop(server, client):
+    client.command("list")
+    server.drop_connections()
+    deadline = time.monotonic() + 2
+    while client.connected and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    assert client.command("list").startswith("There are 1")
+    assert server.connections == 2
+    assert server.commands == ["list", "list"]
+
+
+def test_command_is_not_resent_after_it_was_written(server, client):
+    server.drop_after = "stop"
+    with pytest.raises(RconConnectionError):
+        client.command("stop")
+    time.sleep(0.1)
+    assert server.commands == ["stop"]
@@ -0,0 +1,106 @@
+import tkinter as tk
+from src.gui.viewmodel import ViewModel
+
+
+class FakeRoot:
+    def __init__(self):
+        self.idle = []
+
+    def after_idle(self, callback):
+        self.idle.append(callback)
+
+    def run_idle(self):
+        callbacks, self.idle = self.idle, []
+        for callback in callbacks:
+            callback()
+
+
+class FakeLabel:
+    def __init__(self):
+        self.configs = []
+
+    def config(self, **options):
+        self.configs.append(options)
+
+
+class FakeText:
+    """The "line.0" indices of a Tk Text widget over a plain string"""
+
+    def __init__(self):
+        self.text = ""
+        self.edits = 0
+
+    def delete(self, first, last):
+        self.edits += 1
+        self.text = self.text[:self._offset(first)] + self.text[self._offset(last):]
+
+    def insert(self, index, text):
+        self.edits += 1
+        offset = self._offset(index)
+        self.text = self.text[:offset] + text + self.text[offset:]
+
+    def _offset(self, index):
+        if index == tk.END:
+            return len(self.text)
+        line = int(index.split(".")[0])
+        offset = 0
+        for _ in range(line - 1):
+            end = self.text.find("\n", offset)
+            if end < 0:
+                return len(self.text)
+            offset = end + 1
+        return offset
+
+
+def test_changes_are_batched_into_one_idle_pass():
+    root = FakeRoot()
+    view = ViewModel(root)
+    label = FakeLabel()
+    view.set(label, text="Connecting...")
+    view.set(label, text="Connected", fg="black")
+    assert len(root.idle) == 1
+    root.run_idle()
+    assert label.configs == [{"text": "Connected", "fg": "black"}]
+
+
+def test_unchanged_options_never_touch_the_widget():
+    root = FakeRoot()
+    view = ViewModel(root)
+    label = FakeLabel()
+    view.set(label, text="Running", fg="green")
+    root.run_idle()
+    view.set(label, text="Running", fg="green")
+    root.run_idle()
+    view.set(label, text="Running", fg="red")
+    root.run_idle()
+    assert label.configs == [{"text": "Running", "fg": "green"}, {"fg": "red"}]
+
+
+def test_lines_are_diffed():
+    root = FakeRoot()
+    view = ViewModel(root)
+    text = FakeText()
+    view.set_lines(text, ["a", "b", "c"])
+    root.run_idle()
+    assert text.text == "a\nb\nc\n"
+
+    view.set_lines(text, ["b", "c", "d"])
+    root.run_idle()
+    assert text.text == "b\nc\nd\n"
+    # The first render is a delete and insert; dropping "a" and adding "d" two more
+    assert text.edits == 4
+
+    view.set_lines(text, ["b", "c", "d"])
+    root.run_idle()
+    assert text.edits == 4
+
+
+def test_replaced_lines_in_the_middle():
+    root = FakeRoot()
+    view = ViewModel(root)
+    text = FakeText()
+    view.set_lines(text, ["one", "two", "three", "four"])
+    root.run_idle()
+    view.set_lines(text, ["one", "2", "3", "four", "five"])
+    root.run_idle()
+    assert text.text == "one\n2\n3\nfour\nfive\n"